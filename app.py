@@ -8,16 +8,38 @@
 
 import streamlit as st
 import numpy as np
-import pickle
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 import time
-import base64
 import json
+import logging
+import os
+import tempfile
 from datetime import datetime
 import uuid
 
+from ml_core import (
+    TRAIT_INDEX,
+    TRAIT_VECTORS,
+    IncrementalScorer,
+    InferenceEngine,
+    SchemaError,
+    load_artifacts,
+    load_feature_schema,
+    load_metrics,
+)
+import figures
+import exporters
+from model_bundle import BundleError, artifact_signature, load_bundle
+from prediction_cache import PredictionCache, pack_traits
+from correlation import StreamingCorrelation
+from history import DEFAULT_CAPACITY as HISTORY_CAPACITY, PredictionHistory
+from audit_log import DEFAULT_AUDIT_DIR, AuditLog
+from instrumentation import DEFAULT_PORT as METRICS_PORT, DashboardMetrics, serve_metrics
+from telemetry import STAGES, LatencyWindow, StageTimer
+
+# Heavy optional imports (pandas, plotly, pyarrow) are deferred to the code paths that need
+# them; this timer attributes the rest of each rerun to named script sections.
+rerun_timer = StageTimer()
+
 # =========================================================================================
 # 1. PAGE CONFIGURATION & INITIALIZATION
 # =========================================================================================
@@ -31,41 +53,163 @@ st.set_page_config(
 # =========================================================================================
 # 2. MACHINE LEARNING ASSET INGESTION
 # =========================================================================================
-@st.cache_resource
-def load_ml_infrastructure():
+logger = logging.getLogger(__name__)
+
+@st.cache_resource(max_entries=1)
+def load_ml_infrastructure(artifact_state=None):
     """
     Safely loads the serialized Logistic Regression model, StandardScaler, 
     and LabelEncoder from the local directory. Implements robust error handling
     to prevent application crashes if deployment artifacts are missing.
+    artifact_state (see artifact_signature) only keys the cache, so replaced
+    files are reloaded on the next rerun.
     """
     try:
-        with open("personality_model.pkl", "rb") as f:
-            model = pickle.load(f)
-        with open("scalar.pkl", "rb") as f:
-            scaler = pickle.load(f)
-        with open("encoder.pkl", "rb") as f:
-            label_encoder = pickle.load(f)
-        return model, scaler, label_encoder
+        return load_artifacts()
     except FileNotFoundError as e:
-        # Silently fail for the cache, handle UI-side later
+        # Handled UI-side later; logged so the cause is not lost
+        logger.error("ML artifacts missing: %s", e)
         return None, None, None
     except Exception as e:
+        logger.exception("Failed to load ML artifacts")
         return None, None, None
 
-model, scaler, label_encoder = load_ml_infrastructure()
-
-# Explicitly defining the 26 feature vectors expected by the model architecture
-TRAIT_VECTORS = [
-    "Social Energy", "Alone Time Preference", "Talkativeness",
-    "Deep Reflection", "Group Comfort", "Party Liking",
-    "Listening Skill", "Empathy", "Organization",
-    "Leadership", "Risk Taking", "Public Speaking Comfort",
-    "Curiosity", "Routine Preference", "Excitement Seeking",
-    "Friendliness", "Planning", "Spontaneity",
-    "Adventurousness", "Reading Habit", "Sports Interest",
-    "Online Social Usage", "Travel Desire", "Gadget Usage",
-    "Collaborative Work Style", "Decision Speed"
-]
+@st.cache_resource(max_entries=1)
+def load_inference_engine(artifact_state=None):
+    """
+    Builds the fused single-pass InferenceEngine, which folds the StandardScaler
+    into the logistic weights once per process. Prefers the pickle-free model
+    bundle so that cold starts skip the sklearn import graph, and falls back to
+    load_ml_infrastructure when the bundle is missing, corrupt or stale. The
+    contribution lookup table is precomputed for the live slider preview.
+    Either way the artifacts' column order is validated against
+    feature_schema.json; a mismatch disables predictions instead of falling
+    back, since every artifact set is served with the same manifest.
+    """
+    try:
+        schema = load_feature_schema()
+        try:
+            with load_bundle() as bundle:
+                if bundle.is_current():
+                    return bundle.engine(precompute_table=True, schema=schema)
+            logger.warning("Model bundle was exported from different pickles; loading the pickles instead")
+        except FileNotFoundError:
+            pass
+        except BundleError as e:
+            logger.warning("Ignoring model bundle: %s", e)
+
+        model, scaler, label_encoder = load_ml_infrastructure(artifact_state)
+        if model is None or scaler is None or label_encoder is None:
+            return None
+        return InferenceEngine(model, scaler, label_encoder, precompute_table=True, schema=schema)
+    except SchemaError as e:
+        logger.error("Refusing to load ML artifacts: %s", e)
+        return None
+
+artifact_state = artifact_signature()
+engine = load_inference_engine(artifact_state)
+
+@st.cache_resource(max_entries=1)
+def load_training_metrics(artifact_state=None):
+    """
+    Held-out evaluation report written by train.py (metrics.json), or None when
+    the deployed artifacts were not produced by it. Keyed like the engine.
+    """
+    return load_metrics()
+
+training_metrics = load_training_metrics(artifact_state)
+
+@st.cache_resource
+def load_process_latency_window():
+    """Process-wide rolling latency window shared by every session."""
+    return LatencyWindow()
+
+process_latency = load_process_latency_window()
+
+@st.cache_resource
+def load_dashboard_metrics():
+    """
+    Process-wide Prometheus-style instruments (see instrumentation.DashboardMetrics),
+    served at http://PIP_METRICS_HOST:PIP_METRICS_PORT/metrics (default
+    127.0.0.1:9464). An empty PIP_METRICS_PORT keeps them in-process only.
+    """
+    metrics = DashboardMetrics()
+    port = os.environ.get("PIP_METRICS_PORT", str(METRICS_PORT))
+    if port:
+        try:
+            serve_metrics(metrics.registry, os.environ.get("PIP_METRICS_HOST", "127.0.0.1"), int(port))
+        except (OSError, ValueError) as e:
+            logger.warning("Metrics endpoint not started on port %s: %s", port, e)
+    return metrics
+
+dashboard_metrics = load_dashboard_metrics()
+
+@st.cache_resource
+def load_figure_cache(_metrics):
+    """Process-wide LRU cache of built Plotly figures (see figures.FigureCache)."""
+    cache = figures.FigureCache(on_build=_metrics.observe_chart_build)
+    _metrics.add_stats_source("pip_figure_cache", cache.stats, counters=["hits", "misses", "evictions"],
+                              gauges=["entries"], description="Plotly figure cache")
+    return cache
+
+figure_cache = load_figure_cache(dashboard_metrics)
+
+@st.cache_resource
+def load_prediction_cache(_metrics):
+    """
+    Process-wide memo of predictions keyed by the packed 26-trait vector. Entries are
+    tied to engine.fingerprint, so reloading changed artifacts flushes the cache.
+    """
+    cache = PredictionCache()
+    _metrics.add_stats_source(
+        "pip_prediction_cache", cache.stats,
+        counters=["hits", "misses", "evictions", "expirations", "invalidations"], gauges=["entries", "bytes"],
+        description="Prediction memo cache",
+    )
+    return cache
+
+prediction_cache = load_prediction_cache(dashboard_metrics)
+
+@st.cache_resource
+def load_correlation_engine():
+    """Process-wide streaming correlation statistics fed by scored traffic and uploads."""
+    return StreamingCorrelation()
+
+correlation_engine = load_correlation_engine()
+
+@st.cache_resource
+def load_rerun_windows():
+    """
+    Process-wide rolling script timings: "app" holds one per-section sample per
+    full rerun, "fragment" one sample per input-view fragment run.
+    """
+    return {"app": LatencyWindow(), "fragment": LatencyWindow()}
+
+rerun_windows = load_rerun_windows()
+
+@st.cache_resource
+def load_audit_log(_metrics):
+    """
+    Process-wide append-only audit log of predictions (see audit_log.AuditLog).
+    Segments go to PIP_AUDIT_DIR (default audit_log/ next to the artifacts) as
+    PIP_AUDIT_FORMAT ("jsonl" or "parquet"); an empty PIP_AUDIT_DIR disables it.
+    """
+    directory = os.environ.get("PIP_AUDIT_DIR", DEFAULT_AUDIT_DIR)
+    if not directory:
+        return None
+    try:
+        log = AuditLog(directory, segment_format=os.environ.get("PIP_AUDIT_FORMAT", "jsonl"))
+    except (OSError, ValueError, ImportError):
+        logger.exception("Prediction audit log disabled")
+        return None
+    _metrics.add_stats_source("pip_audit_log", log.stats.copy, counters=["submitted", "dropped", "written", "errors"],
+                              description="Prediction audit log")
+    return log
+
+audit_log = load_audit_log(dashboard_metrics)
+
+# Opt-in cosmetic spinner delay (seconds); never counted in the latency telemetry
+COSMETIC_DELAY_S = float(os.environ.get("PIP_COSMETIC_DELAY_S", "0"))
 
 # Simulated global baselines for UI delta comparisons (out of 10)
 GLOBAL_BASELINES = {
@@ -80,6 +224,8 @@ GLOBAL_BASELINES = {
     "Collaborative Work Style": 6.4, "Decision Speed": 5.6
 }
 
+rerun_timer.lap("setup")
+
 # =========================================================================================
 # 3. ENTERPRISE CSS INJECTION (MASSIVE STYLESHEET)
 # =========================================================================================
@@ -338,6 +484,20 @@ div.stButton > button {
     margin-top: 20px !important;
 }
 
+div.stDownloadButton > button {
+    width: 100% !important;
+    background: linear-gradient(135deg, var(--blue-dark), var(--blue)) !important;
+    color: #ffffff !important;
+    font-family: 'Space Grotesk', sans-serif !important;
+    font-size: 18px !important;
+    font-weight: 700 !important;
+    letter-spacing: 2px !important;
+    border: none !important;
+    border-radius: 16px !important;
+    padding: 20px !important;
+    box-shadow: 0 10px 25px rgba(59, 130, 246, 0.3) !important;
+}
+
 div.stButton > button:hover {
     transform: translateY(-5px) !important;
     box-shadow: 0 15px 45px rgba(139, 92, 246, 0.5), inset 0 2px 0 rgba(255,255,255,0.2) !important;
@@ -414,8 +574,8 @@ div.stButton > button:hover {
     box-shadow: 0 0 25px rgba(236, 72, 153, 0.15);
 }
 
-/* ── TABS NAVIGATION STYLING ── */
-.stTabs [data-baseweb="tab-list"] {
+/* ── VIEW NAVIGATION STYLING (horizontal radio) ── */
+div[data-testid="stRadio"] > div[role="radiogroup"] {
     background: rgba(15, 23, 42, 0.8) !important;
     border-radius: 18px !important;
     border: 1px solid rgba(139, 92, 246, 0.2) !important;
@@ -423,19 +583,24 @@ div.stButton > button:hover {
     gap: 12px !important;
 }
 
-.stTabs [data-baseweb="tab"] {
+div[data-testid="stRadio"] label[data-baseweb="radio"] {
     font-family: 'Space Grotesk', sans-serif !important;
     font-size: 16px !important;
     font-weight: 600 !important;
     letter-spacing: 2px !important;
     text-transform: uppercase !important;
     color: rgba(248, 250, 252, 0.4) !important;
+    border: 1px solid transparent !important;
     border-radius: 12px !important;
     padding: 18px 32px !important;
     transition: all 0.3s ease !important;
 }
 
-.stTabs [aria-selected="true"] {
+div[data-testid="stRadio"] label[data-baseweb="radio"] > div:first-child {
+    display: none !important;
+}
+
+div[data-testid="stRadio"] label[data-baseweb="radio"]:has(input:checked) {
     background: linear-gradient(135deg, rgba(139, 92, 246, 0.2), rgba(59, 130, 246, 0.2)) !important;
     color: var(--text-main) !important;
     border: 1px solid rgba(139, 92, 246, 0.4) !important;
@@ -550,6 +715,8 @@ div[data-testid="stDataFrame"] {
     unsafe_allow_html=True,
 )
 
+rerun_timer.lap("css")
+
 # =========================================================================================
 # 4. SESSION STATE MANAGEMENT & INITIALIZATION
 # =========================================================================================
@@ -571,6 +738,37 @@ if "timestamp" not in st.session_state:
     st.session_state["timestamp"] = None
 if "execution_time" not in st.session_state:
     st.session_state["execution_time"] = 0.0
+if "features" not in st.session_state:
+    st.session_state["features"] = None
+if "correlation_uploads" not in st.session_state:
+    st.session_state["correlation_uploads"] = set()
+if "latency_breakdown" not in st.session_state:
+    st.session_state["latency_breakdown"] = None
+if "latency_window" not in st.session_state:
+    st.session_state["latency_window"] = LatencyWindow()
+if "batch_result" not in st.session_state:
+    st.session_state["batch_result"] = None
+if "batch_workdir" not in st.session_state:
+    # Per-session scratch directory for bulk-scoring results. TemporaryDirectory removes it, with
+    # whatever result is still inside, once the session's state is discarded or the server exits
+    st.session_state["batch_workdir"] = None
+
+# Bounded columnar record of every prediction in this session (see history.py)
+if engine is not None and (
+    "history" not in st.session_state or st.session_state["history"].probs.shape[1] != len(engine.classes)
+):
+    st.session_state["history"] = PredictionHistory(len(engine.classes), HISTORY_CAPACITY)
+
+# Live logits for the current slider vector, updated in O(n_classes) per slider move.
+# Rebuilt when the engine was reloaded from changed artifacts.
+if engine is not None and (
+    "incremental_scorer" not in st.session_state or st.session_state["incremental_scorer"].table is not engine.table
+):
+    st.session_state["incremental_scorer"] = IncrementalScorer(
+        engine.table, [st.session_state[f"trait_{t}"] for t in TRAIT_VECTORS]
+    )
+
+rerun_timer.lap("state")
 
 # =========================================================================================
 # 5. ENTERPRISE SIDEBAR & TELEMETRY LOGIC
@@ -588,36 +786,90 @@ with st.sidebar:
     )
 
     st.markdown('<div class="sb-title">🛠️ System Infrastructure</div>', unsafe_allow_html=True)
+    # Hyperparameters of the deployed model as recorded by train.py: C for the searched
+    # LogisticRegression, alpha for the streaming SGD fit
+    trained_model = (training_metrics or {}).get("model", {})
+    if "C" in trained_model:
+        regularization = f"{trained_model['penalty'].upper()} Penalty, C = {trained_model['C']:g}"
+    elif "alpha" in trained_model:
+        regularization = f"{trained_model['penalty'].upper()} Penalty, alpha = {trained_model['alpha']:g}"
+    else:
+        regularization = "n/a"
     st.markdown(
         """
         <div style="background:rgba(15,23,42,0.6); padding:20px; border-radius:14px; border:1px solid rgba(139,92,246,0.2); font-family:Inter; font-size:13px; color:rgba(248,250,252,0.8); line-height:1.8;">
             <b>Algorithm:</b> Logistic Regression<br>
-            <b>Solver:</b> L-BFGS (Simulated)<br>
-            <b>Multi-Class:</b> Multinomial / OvR<br>
-            <b>Dimensions:</b> 26 Behavioral Vectors<br>
+            <b>Solver:</b> {solver}<br>
+            <b>Multi-Class:</b> {link}<br>
+            <b>Dimensions:</b> {n_features} Behavioral Vectors<br>
             <b>Normalization:</b> StandardScaler (z-score)<br>
-            <b>Regularization:</b> L2 Penalty (Ridge)<br>
+            <b>Regularization:</b> {penalty}<br>
         </div>
-        """, unsafe_allow_html=True
+        """.format(
+            solver=trained_model.get("solver", "n/a"),
+            link="n/a" if engine is None else "One-vs-Rest" if engine.link == "ovr" else "Multinomial (softmax)",
+            n_features=len(TRAIT_VECTORS) if engine is None else engine.coef.shape[1],
+            penalty=regularization,
+        ), unsafe_allow_html=True
     )
 
     st.markdown('<div class="sb-title">📊 Validation Telemetry</div>', unsafe_allow_html=True)
-    
+
+    # Held-out metrics from train.py's metrics.json; n/a when the artifacts carry none
+    holdout = (training_metrics or {}).get("holdout", {})
+
+    def telemetry_card(value, label, fmt):
+        text = fmt.format(value) if isinstance(value, (int, float)) else "n/a"
+        st.markdown(f'<div class="telemetry-card"><div class="telemetry-val">{text}</div><div class="telemetry-lbl">{label}</div></div>', unsafe_allow_html=True)
+
     col_s1, col_s2 = st.columns(2)
     with col_s1:
-        st.markdown('<div class="telemetry-card"><div class="telemetry-val">99.1%</div><div class="telemetry-lbl">Accuracy</div></div>', unsafe_allow_html=True)
-        st.markdown('<div class="telemetry-card"><div class="telemetry-val">0.989</div><div class="telemetry-lbl">Recall (Avg)</div></div>', unsafe_allow_html=True)
+        telemetry_card(holdout.get("accuracy"), "Accuracy", "{:.1%}")
+        telemetry_card(holdout.get("recall_macro"), "Recall (Avg)", "{:.3f}")
     with col_s2:
-        st.markdown('<div class="telemetry-card"><div class="telemetry-val">0.992</div><div class="telemetry-lbl">Precision</div></div>', unsafe_allow_html=True)
-        st.markdown('<div class="telemetry-card"><div class="telemetry-val">0.990</div><div class="telemetry-lbl">F1 Score</div></div>', unsafe_allow_html=True)
+        telemetry_card(holdout.get("precision_macro"), "Precision", "{:.3f}")
+        telemetry_card(holdout.get("f1_macro"), "F1 Score", "{:.3f}")
+    if training_metrics:
+        st.caption(f"Held-out split of {holdout.get('rows', 0):,} rows · model version {training_metrics.get('version', 'n/a')}")
 
     st.markdown("<br>", unsafe_allow_html=True)
     
-    # Dynamic System Status
+    # Dynamic System Status & latency telemetry (filled after the prediction logic runs)
+    latency_slot = st.empty()
+
+def render_latency_telemetry():
+    """Renders the last run's stage breakdown and rolling p50/p95/p99 latencies."""
     if st.session_state["prediction"] is None:
         st.info("🟢 SYSTEM ONLINE. Awaiting cognitive input vectors for classification.")
-    else:
-        st.success(f"🔵 PROCESSING COMPLETE. Latency: {st.session_state['execution_time']}s")
+        return
+
+    breakdown = st.session_state["latency_breakdown"]
+    source = " (prediction cache hit)" if st.session_state.get("cache_hit") else ""
+    st.success(f"🔵 PROCESSING COMPLETE. Latency: {breakdown['total']:.3f} ms{source}")
+    st.markdown('<div class="sb-title">⏱️ Inference Latency</div>', unsafe_allow_html=True)
+    stage_rows = "".join(
+        f"<b>{stage.title()}:</b> {breakdown[stage] * 1000:.1f} µs<br>" if stage in breakdown
+        else f"<b>{stage.title()}:</b> skipped (cache hit)<br>"
+        for stage in STAGES
+    )
+    st.markdown(
+        f"""
+        <div style="background:rgba(15,23,42,0.6); padding:20px; border-radius:14px; border:1px solid rgba(139,92,246,0.2); font-family:'Fira Code'; font-size:12px; color:rgba(248,250,252,0.8); line-height:1.8;">
+            {stage_rows}
+        </div>
+        """, unsafe_allow_html=True
+    )
+
+    for scope, window in (("Session", st.session_state["latency_window"]), ("Process", process_latency)):
+        pct = window.percentiles()
+        if pct is None:
+            continue
+        st.markdown(f'<div class="sb-title">{scope} Scope · n={window.count()}</div>', unsafe_allow_html=True)
+        for col, q in zip(st.columns(3), (50, 95, 99)):
+            with col:
+                st.markdown(f'<div class="telemetry-card"><div class="telemetry-val" style="font-size:18px;">{pct[q]:.3f}</div><div class="telemetry-lbl">p{q} ms</div></div>', unsafe_allow_html=True)
+
+rerun_timer.lap("sidebar")
 
 # =========================================================================================
 # 6. HERO HEADER SECTION
@@ -637,23 +889,53 @@ st.markdown(
 )
 
 # =========================================================================================
-# 7. MAIN APPLICATION TABS (5-TAB ARCHITECTURE)
+# 7. MAIN APPLICATION VIEWS (5-VIEW ARCHITECTURE, ONLY THE ACTIVE VIEW IS EXECUTED)
 # =========================================================================================
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "🧠  COGNITIVE INPUT VECTORS", 
-    "📊  MACRO RADAR & ANALYTICS", 
-    "🔬  FEATURE IMPORTANCE (SHAP)", 
-    "⚙️  SYSTEM DIAGNOSTICS",
-    "📋  DATA EXPORT & REPORTING"
-])
+VIEW_INPUT = "input"
+VIEW_ANALYTICS = "analytics"
+VIEW_IMPORTANCE = "importance"
+VIEW_DIAGNOSTICS = "diagnostics"
+VIEW_EXPORT = "export"
+VIEW_BATCH = "batch"
+VIEW_LABELS = {
+    VIEW_INPUT: "🧠  COGNITIVE INPUT VECTORS",
+    VIEW_ANALYTICS: "📊  MACRO RADAR & ANALYTICS",
+    VIEW_IMPORTANCE: "🔬  FEATURE IMPORTANCE (SHAP)",
+    VIEW_DIAGNOSTICS: "⚙️  SYSTEM DIAGNOSTICS",
+    VIEW_EXPORT: "📋  DATA EXPORT & REPORTING",
+    VIEW_BATCH: "📦  BULK SCORING",
+}
+
+# Unlike st.tabs (which executes every tab body on each rerun), a selector lets the
+# script skip the four hidden views entirely.
+active_view = st.radio(
+    "View", list(VIEW_LABELS), format_func=VIEW_LABELS.get, horizontal=True,
+    key="active_view", label_visibility="collapsed",
+)
+
+rerun_timer.lap("hero")
 
 # =========================================================================================
 # TAB 1 - PREDICTION ENGINE (EXPLICIT UNROLLED UI FOR 26 TRAITS)
 # =========================================================================================
-with tab1:
+@st.fragment
+def render_input_view():
+    """
+    Runs as a fragment: slider moves rerun only this view (not the stylesheet,
+    sidebar or other sections). A completed prediction triggers one full rerun
+    so that the sidebar telemetry and the other views see the new result.
+    """
+    fragment_timer = StageTimer()
     
     col1, col2, col3 = st.columns(3)
     
+    # Slider callback: apply the single-trait delta to the live logits before the rerun
+    def on_trait_change(trait_name):
+        value = st.session_state[f"s_{trait_name}"]
+        st.session_state[f"trait_{trait_name}"] = value
+        if "incremental_scorer" in st.session_state:
+            st.session_state["incremental_scorer"].update(TRAIT_INDEX[trait_name], value)
+
     # Function to render a trait block with custom UI and delta metrics
     def render_trait_block(trait_name, desc):
         val = st.session_state[f"trait_{trait_name}"]
@@ -672,7 +954,10 @@ with tab1:
         # We use Streamlit's native columns inside the column for the slider + metric layout
         c_slider, c_metric = st.columns([3, 1])
         with c_slider:
-            st.session_state[f"trait_{trait_name}"] = st.slider(f"slider_{trait_name}", 0, 10, val, key=f"s_{trait_name}")
+            st.session_state[f"trait_{trait_name}"] = st.slider(
+                f"slider_{trait_name}", 0, 10, val, key=f"s_{trait_name}",
+                on_change=on_trait_change, args=(trait_name,)
+            )
         with c_metric:
             st.metric(label="Score", value=st.session_state[f"trait_{trait_name}"], delta=f"{delta} vs Avg", delta_color="normal")
         st.markdown("<hr style='border-color:rgba(255,255,255,0.05); margin-top:5px; margin-bottom:15px;'>", unsafe_allow_html=True)
@@ -726,33 +1011,73 @@ with tab1:
     with btn_col:
         predict_clicked = st.button("🧬 SYNTHESIZE COGNITIVE PROFILE")
 
+        # Live preview from the incrementally maintained logits (no button press needed)
+        if "incremental_scorer" in st.session_state:
+            live_index, live_probs = st.session_state["incremental_scorer"].predict()
+            st.markdown(
+                f"""
+                <div style="text-align:center; margin-top:15px; font-family:'Fira Code'; font-size:13px; letter-spacing:2px; color:var(--text-muted);">
+                    LIVE PREVIEW: <span style="color:var(--violet-light); font-weight:600;">{engine.classes[live_index]}</span>
+                    &nbsp;·&nbsp; {live_probs[live_index] * 100:.2f}%
+                </div>
+                """, unsafe_allow_html=True
+            )
+
     if predict_clicked:
-        if model is None or scaler is None or label_encoder is None:
-            st.error("CRITICAL FATAL ERROR: Machine Learning assets ('personality_model.pkl', 'scalar.pkl', 'encoder.pkl') are offline or missing from the root directory.")
+        if engine is None:
+            st.error("CRITICAL FATAL ERROR: Machine Learning assets ('personality_model.pipb' or 'personality_model.pkl', 'scalar.pkl', 'encoder.pkl') are offline or missing from the root directory. Check the server log for the underlying error.")
         else:
             with st.spinner("Processing 26-dimensional cognitive vectors through logistic boundaries..."):
-                start_time = time.time()
-                time.sleep(1.8) # Simulated deep compute delay for enterprise UX feel
-                
+                if COSMETIC_DELAY_S > 0:
+                    time.sleep(COSMETIC_DELAY_S) # Opt-in UX delay, excluded from telemetry
+
+                timer = StageTimer()
+
                 # Extract features precisely in order
                 features_list = [st.session_state[f"trait_{t}"] for t in TRAIT_VECTORS]
                 features = np.array([features_list])
-                
-                # Z-Score Standardization
-                scaled_features = scaler.transform(features)
-
-                # Inference
-                raw_prediction = model.predict(scaled_features)
-                pred_text = label_encoder.inverse_transform(raw_prediction)[0]
-                probs = model.predict_proba(scaled_features)[0]
-                
-                end_time = time.time()
+                timer.lap("gather")
+
+                # Shared memo: identical profiles from any session skip the model entirely
+                cache_key = pack_traits(features[0])
+                cached = prediction_cache.get(cache_key, engine.fingerprint) if cache_key is not None else None
+                timer.lap("cache")
+
+                if cached is not None:
+                    pred_index, probs = cached
+                else:
+                    # Fused Z-Score Standardization + Inference (single matmul + softmax)
+                    logits = engine.fused.logits(features)
+                    timer.lap("logits")
+                    probs = engine.fused.probabilities_from_logits(logits)[0]
+                    timer.lap("softmax")
+                    pred_index = int(np.argmax(probs))
+                    if cache_key is not None:
+                        prediction_cache.put(cache_key, engine.fingerprint, pred_index, probs)
+                pred_text = engine.classes[pred_index]
+                timer.lap("decode")
 
                 # State Persistence
                 st.session_state["prediction"] = pred_text
                 st.session_state["probabilities"] = probs
+                st.session_state["features"] = features[0]
                 st.session_state["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
-                st.session_state["execution_time"] = round(end_time - start_time, 3)
+                st.session_state["execution_time"] = timer.total_ns / 1e9
+                st.session_state["latency_breakdown"] = timer.as_ms()
+                st.session_state["cache_hit"] = cached is not None
+                st.session_state["latency_window"].record(timer)
+                st.session_state["history"].append(features[0], probs)
+                process_latency.record(timer)
+                dashboard_metrics.observe_prediction(timer, cached is not None)
+                correlation_engine.update(features[0])
+                if audit_log is not None:
+                    # Queued only; the writer thread batches it to disk off the request path
+                    audit_log.record(
+                        features[0], probs, pred_text, engine.classes, timer.total_ns, engine.fingerprint,
+                        model_version=(training_metrics or {}).get("version"),
+                        session_id=st.session_state["session_id"], cache_hit=cached is not None,
+                    )
+            st.rerun()
 
     # --- MAIN RESULT RENDER ---
     if st.session_state["prediction"] is not None:
@@ -770,10 +1095,17 @@ with tab1:
             unsafe_allow_html=True
         )
 
+    fragment_timer.lap("view:input")
+    rerun_windows["fragment"].record(fragment_timer)
+    dashboard_metrics.observe_rerun("fragment", fragment_timer)
+
+if active_view == VIEW_INPUT:
+    render_input_view()
+
 # =========================================================================================
 # TAB 2 - MACRO RADAR & ANALYTICS
 # =========================================================================================
-with tab2:
+if active_view == VIEW_ANALYTICS:
     if st.session_state["prediction"] is None:
         st.markdown(
             """<div style='text-align:center; padding:150px 20px; font-family:"Space Grotesk",sans-serif;
@@ -785,7 +1117,7 @@ with tab2:
         )
     else:
         probs = st.session_state["probabilities"]
-        labels = label_encoder.classes_
+        labels = engine.classes
 
         col_a1, col_a2 = st.columns(2)
 
@@ -798,82 +1130,62 @@ with tab2:
             cog_avg = sum([st.session_state[f"trait_{t}"] for t in TRAIT_VECTORS[9:18]]) / 9
             act_avg = sum([st.session_state[f"trait_{t}"] for t in TRAIT_VECTORS[18:26]]) / 8
 
-            radar_categories = ['Social Dynamics', 'Cognitive Processing', 'Action & Lifestyle']
             radar_values = [soc_avg, cog_avg, act_avg]
-            
-            # Close polygon
-            r_closed = radar_values + [radar_values[0]]
-            theta_closed = radar_categories + [radar_categories[0]]
-
-            fig_radar = go.Figure()
-            fig_radar.add_trace(go.Scatterpolar(
-                r=r_closed, theta=theta_closed,
-                fill='toself', fillcolor='rgba(236, 72, 153, 0.25)',
-                line=dict(color='#ec4899', width=4), name='User Profile'
-            ))
-            # Baseline trace for comparison
-            fig_radar.add_trace(go.Scatterpolar(
-                r=[6.0, 6.0, 6.0, 6.0], theta=theta_closed,
-                mode='lines', line=dict(color='rgba(96, 165, 250, 0.5)', width=2, dash='dash'), name='Global Average'
-            ))
-            
-            fig_radar.update_layout(
-                polar=dict(
-                    bgcolor="rgba(0,0,0,0)",
-                    radialaxis=dict(visible=True, range=[0, 10], gridcolor="rgba(236,72,153,0.15)"),
-                    angularaxis=dict(gridcolor="rgba(236,72,153,0.15)", color="#f8fafc")
-                ),
-                paper_bgcolor="rgba(0,0,0,0)",
-                font=dict(family="Space Grotesk", size=14),
-                height=500, margin=dict(l=50, r=50, t=50, b=50),
-                legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5, font=dict(color="#f8fafc"))
-            )
-            st.plotly_chart(fig_radar, use_container_width=True)
+            fig_radar = figure_cache.get_or_build("radar", figures.float_key(radar_values), figures.build_radar, radar_values)
+            st.plotly_chart(fig_radar, width="stretch")
 
         # --- 2. PROBABILITY DISTRIBUTION BAR CHART ---
         with col_a2:
             st.markdown('<div class="panel-heading" style="border:none;">📊 Softmax Output Distribution</div>', unsafe_allow_html=True)
             
-            fig_prob = px.bar(
-                x=labels, y=probs * 100, color=labels,
-                color_discrete_sequence=px.colors.sequential.Plasma,
-                labels={"x": "Classified Type", "y": "Confidence (%)"}
+            fig_prob = figure_cache.get_or_build(
+                "probability_bar", (tuple(labels), figures.float_key(probs)), figures.build_probability_bar, labels, probs
             )
-            fig_prob.update_layout(
-                paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(139, 92, 246, 0.05)",
-                font=dict(family="Inter", color="#f8fafc"),
-                xaxis=dict(gridcolor="rgba(255,255,255,0.05)", title=""),
-                yaxis=dict(gridcolor="rgba(255,255,255,0.1)"),
-                showlegend=False, height=500, margin=dict(l=20, r=20, t=20, b=20)
-            )
-            st.plotly_chart(fig_prob, use_container_width=True)
+            st.plotly_chart(fig_prob, width="stretch")
 
         # --- 3. GAUGE CHARTS FOR CATEGORIES ---
         st.markdown('<div class="panel-heading" style="border:none; margin-top:30px;">⏱️ Domain Intensities</div>', unsafe_allow_html=True)
         col_g1, col_g2, col_g3 = st.columns(3)
         
         def make_gauge(val, title, color):
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number", value=val, title={'text': title, 'font': {'size': 16, 'color': '#f8fafc', 'family':'Space Grotesk'}},
-                number={'font':{'color':color, 'size':40, 'family':'Space Grotesk'}},
-                gauge={
-                    'axis': {'range': [0, 10], 'tickwidth': 1, 'tickcolor': "rgba(255,255,255,0.2)"},
-                    'bar': {'color': color},
-                    'bgcolor': "rgba(0,0,0,0)",
-                    'borderwidth': 2, 'bordercolor': "rgba(255,255,255,0.1)",
-                }
-            ))
-            fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", font={'color': "#f8fafc", 'family': "Inter"}, height=300)
-            return fig
+            return figure_cache.get_or_build("gauge", (round(val, 6), title, color), figures.build_gauge, val, title, color)
+
+        with col_g1: st.plotly_chart(make_gauge(soc_avg, "Social Dynamics", "#8b5cf6"), width="stretch")
+        with col_g2: st.plotly_chart(make_gauge(cog_avg, "Cognitive Processing", "#3b82f6"), width="stretch")
+        with col_g3: st.plotly_chart(make_gauge(act_avg, "Action & Lifestyle", "#ec4899"), width="stretch")
 
-        with col_g1: st.plotly_chart(make_gauge(soc_avg, "Social Dynamics", "#8b5cf6"), use_container_width=True)
-        with col_g2: st.plotly_chart(make_gauge(cog_avg, "Cognitive Processing", "#3b82f6"), use_container_width=True)
-        with col_g3: st.plotly_chart(make_gauge(act_avg, "Action & Lifestyle", "#ec4899"), use_container_width=True)
+        # --- 4. RUN HISTORY COMPARISON ---
+        st.markdown('<div class="panel-heading" style="border:none; margin-top:30px;">📈 Session Run History</div>', unsafe_allow_html=True)
+        history = st.session_state["history"]
+        if len(history) < 2:
+            st.info("📭 Run the synthesizer at least twice to compare runs.")
+        else:
+            hist_traits, hist_probs, _ = history.ordered()
+            hist_key = (st.session_state["session_id"], history.total)
+            col_h1, col_h2 = st.columns(2)
+            with col_h1:
+                st.caption("Class confidence across runs")
+                fig_hist = figure_cache.get_or_build(
+                    "history_trajectory", hist_key,
+                    figures.build_history_trajectory, history.run_numbers(), hist_probs, labels
+                )
+                st.plotly_chart(fig_hist, width="stretch")
+            with col_h2:
+                st.caption("Traits changed since the previous run")
+                fig_delta = figure_cache.get_or_build(
+                    "trait_delta", hist_key,
+                    figures.build_trait_delta, TRAIT_VECTORS, hist_traits[-1], hist_traits[-2]
+                )
+                st.plotly_chart(fig_delta, width="stretch")
+        st.caption(
+            f"{len(history):,} of {history.capacity:,} runs retained "
+            f"({history.nbytes / 1024:.1f} KiB preallocated for this session)."
+        )
 
 # =========================================================================================
 # TAB 3 - FEATURE IMPORTANCE & ALGORITHMIC WEIGHTS
 # =========================================================================================
-with tab3:
+if active_view == VIEW_IMPORTANCE:
     if st.session_state["prediction"] is None:
         st.markdown(
             """<div style='text-align:center; padding:150px 20px; font-family:"Space Grotesk",sans-serif;
@@ -885,67 +1197,130 @@ with tab3:
         )
     else:
         pred_class = st.session_state["prediction"]
-        labels = label_encoder.classes_
+        user_features = st.session_state["features"]
 
-        st.markdown(f'<div class="panel-heading" style="border:none;">⚖️ Absolute Logistic Coefficients for Class: <span style="color:var(--pink);">{pred_class}</span></div>', unsafe_allow_html=True)
-        
-        # Extract weights for the winning class
-        class_index = list(labels).index(pred_class)
-        coefs = model.coef_[class_index]
-
-        # Top 15 influential traits
-        sorted_coef = sorted(zip(TRAIT_VECTORS, np.abs(coefs)), key=lambda x: x[1], reverse=True)[:15]
-
-        labels_coef = [x[0] for x in sorted_coef]
-        values_coef = [x[1] for x in sorted_coef]
-
-        # Reverse for horizontal bar charting
-        labels_coef.reverse()
-        values_coef.reverse()
-
-        fig_coef = go.Figure(go.Bar(
-            x=values_coef, y=labels_coef, orientation='h',
-            marker=dict(color=values_coef, colorscale='Sunsetdark', line=dict(color='rgba(255,255,255,0.2)', width=1))
-        ))
-        fig_coef.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(family="Inter", color="#f8fafc", size=13),
-            xaxis=dict(title="Absolute Theta (θ) Magnitude", gridcolor="rgba(255,255,255,0.05)"),
-            yaxis=dict(title="", gridcolor="rgba(255,255,255,0.05)"),
-            height=600, margin=dict(l=20, r=20, t=20, b=20)
-        )
-        st.plotly_chart(fig_coef, use_container_width=True)
+        # Rankings are precomputed per class when the engine loads (argsort on |coef|)
+        class_index = engine.class_index[pred_class]
+
+        col_w1, col_w2 = st.columns(2)
 
-        st.info("💡 **Data Science Note:** The chart above shows the absolute mathematical weight the model applies to each standardized feature when calculating the probability for the predicted class. Larger bars indicate traits that heavily swing the model's decision.")
+        with col_w1:
+            st.markdown(f'<div class="panel-heading" style="border:none;">⚖️ Absolute Logistic Coefficients for Class: <span style="color:var(--pink);">{pred_class}</span></div>', unsafe_allow_html=True)
+
+            # Top 15 influential traits, reversed for horizontal bar charting
+            top_idx, top_vals = engine.top_coefficients(class_index, k=15)
+            labels_coef = [TRAIT_VECTORS[i] for i in top_idx[::-1]]
+            values_coef = top_vals[::-1].tolist()
+
+            # Keyed on the model fingerprint too: a retrained or swapped model must not reuse the old chart
+            fig_coef = figure_cache.get_or_build(
+                "coefficient_bar", (engine.fingerprint, pred_class), figures.build_coefficient_bar, labels_coef, values_coef
+            )
+            st.plotly_chart(fig_coef, width="stretch")
+
+        with col_w2:
+            st.markdown(f'<div class="panel-heading" style="border:none;">🧭 Local Attribution For Your Profile: <span style="color:var(--pink);">{pred_class}</span></div>', unsafe_allow_html=True)
+
+            # Signed coef × scaled value for this user's vector, all classes in one vectorized pass
+            local_idx, local_vals = engine.top_contributions(user_features, class_index, k=15)
+            labels_contrib = [TRAIT_VECTORS[i] for i in local_idx[::-1]]
+            values_contrib = local_vals[::-1].tolist()
+
+            fig_contrib = figure_cache.get_or_build(
+                "contribution_bar", (engine.fingerprint, pred_class, tuple(user_features.tolist())),
+                figures.build_contribution_bar, labels_contrib, values_contrib
+            )
+            st.plotly_chart(fig_contrib, width="stretch")
+
+        st.info("💡 **Data Science Note:** The left chart shows the absolute mathematical weight the model applies to each standardized feature when calculating the probability for the predicted class. Larger bars indicate traits that heavily swing the model's decision. The right chart multiplies those weights by your own standardized scores: pink bars push your profile towards the predicted class, blue bars pull it away.")
 
 # =========================================================================================
-# TAB 4 - SYSTEM DIAGNOSTICS & HEATMAP SIMULATION
+# TAB 4 - SYSTEM DIAGNOSTICS & LIVE CORRELATION ENGINE
 # =========================================================================================
-with tab4:
-    st.markdown('<div class="panel-heading" style="border:none;">⚙️ Simulated Feature Correlation Matrix</div>', unsafe_allow_html=True)
-    
-    # Generate a synthetic correlation matrix for the 26 traits to simulate a deep EDA tab
-    np.random.seed(42) # For static visual
-    synth_corr = np.random.uniform(-0.5, 0.9, size=(26, 26))
-    np.fill_diagonal(synth_corr, 1.0)
-    # Make it symmetrical
-    synth_corr = (synth_corr + synth_corr.T) / 2
-
-    fig_corr = go.Figure(data=go.Heatmap(
-        z=synth_corr, x=TRAIT_VECTORS, y=TRAIT_VECTORS,
-        colorscale='Magma', hoverongaps=False
-    ))
-    fig_corr.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(family="Inter", color="#f8fafc", size=10),
-        xaxis=dict(tickangle=45), height=800, margin=dict(l=50, r=50, t=50, b=100)
+if active_view == VIEW_DIAGNOSTICS:
+    st.markdown('<div class="panel-heading" style="border:none;">⚙️ Live Feature Correlation Matrix</div>', unsafe_allow_html=True)
+
+    # --- FEED: UPLOADED DATASET (each file is merged once per session) ---
+    col_up, col_reset = st.columns([4, 1])
+    with col_up:
+        corr_upload = st.file_uploader(
+            "Merge a respondent dataset (CSV / Parquet with the 26 trait columns, or a .pifs feature store) into the correlation statistics",
+            type=["csv", "parquet", "pifs"], key="corr_upload"
+        )
+    with col_reset:
+        if st.button("♻️ RESET STATISTICS", key="corr_reset"):
+            correlation_engine.reset()
+            st.session_state["correlation_uploads"] = set()
+
+    if corr_upload is not None and corr_upload.file_id not in st.session_state["correlation_uploads"]:
+        from batch_scoring import iter_feature_chunks  # pulls in pandas; only needed for uploads
+
+        try:
+            with st.spinner("Streaming dataset into running co-moments..."):
+                for chunk in iter_feature_chunks(corr_upload):
+                    correlation_engine.update_batch(chunk)
+            st.session_state["correlation_uploads"].add(corr_upload.file_id)
+        except (ValueError, KeyError) as e:
+            st.error(f"Could not ingest dataset: {e}")
+
+    # --- HEATMAP (rebuilt only when the statistics version changes) ---
+    corr_count, _, _, corr_version = correlation_engine.snapshot()
+    if corr_count < 2:
+        st.info("📭 Not enough observations yet. Synthesize profiles in the first tab or upload a dataset to populate the correlation matrix.")
+    else:
+        st.caption(f"Pearson correlation over {corr_count:,} observations (statistics version {corr_version}). Constant traits show as gaps.")
+        fig_corr = figure_cache.get_or_build(
+            "correlation_heatmap", corr_version,
+            lambda: figures.build_correlation_heatmap(correlation_engine.correlation(), TRAIT_VECTORS)
+        )
+        st.plotly_chart(fig_corr, width="stretch")
+
+    # --- FIGURE CACHE EFFECTIVENESS ---
+    st.markdown('<div class="panel-heading" style="border:none; margin-top:30px;">🗂️ Figure Cache (Process Scope)</div>', unsafe_allow_html=True)
+    fc_stats = figure_cache.stats()
+    fc1, fc2, fc3, fc4 = st.columns(4)
+    fc1.metric("Hit Rate", f"{fc_stats['hit_rate'] * 100:.1f}%")
+    fc2.metric("Hits / Misses", f"{fc_stats['hits']} / {fc_stats['misses']}")
+    fc3.metric("Entries", f"{fc_stats['entries']} / {fc_stats['maxsize']}")
+    fc4.metric("Build CPU Saved", f"{fc_stats['saved_seconds'] * 1000:.1f} ms")
+
+    # --- PREDICTION MEMO CACHE ---
+    st.markdown('<div class="panel-heading" style="border:none; margin-top:30px;">🧮 Prediction Cache (Process Scope)</div>', unsafe_allow_html=True)
+    pc_stats = prediction_cache.stats()
+    pc1, pc2, pc3, pc4 = st.columns(4)
+    pc1.metric("Hit Rate", f"{pc_stats['hit_rate'] * 100:.1f}%")
+    pc2.metric("Hits / Misses", f"{pc_stats['hits']} / {pc_stats['misses']}")
+    pc3.metric("Entries", f"{pc_stats['entries']:,} / {pc_stats['max_entries']:,}")
+    pc4.metric("Memory", f"{pc_stats['bytes'] / 2**20:.2f} / {pc_stats['max_bytes'] / 2**20:.0f} MiB")
+    st.caption(
+        f"Evictions {pc_stats['evictions']} · expirations {pc_stats['expirations']} · "
+        f"invalidations {pc_stats['invalidations']} · model fingerprint {(pc_stats['fingerprint'] or 'n/a')[:12]}"
     )
-    st.plotly_chart(fig_corr, use_container_width=True)
+
+    # --- SCRIPT RERUN PROFILE ---
+    st.markdown('<div class="panel-heading" style="border:none; margin-top:30px;">⏱️ Script Rerun Profile (Process Scope)</div>', unsafe_allow_html=True)
+    app_window, fragment_window = rerun_windows["app"], rerun_windows["fragment"]
+    if app_window.count() == 0:
+        st.info("📭 No completed reruns recorded yet.")
+    else:
+        rows = ["| Section | Samples | p50 (ms) | p95 (ms) | p99 (ms) |", "|---|---:|---:|---:|---:|"]
+        sections = [("app", s) for s in app_window.stages() if s != "total"] + [("app", "total")]
+        if fragment_window.count():
+            sections.append(("fragment", "total"))
+        for scope, section in sections:
+            window = rerun_windows[scope]
+            pct = window.percentiles(section)
+            name = "input view (fragment rerun)" if scope == "fragment" else section
+            rows.append(
+                f"| {name} | {window.count(section)} | {pct[50]:.2f} | {pct[95]:.2f} | {pct[99]:.2f} |"
+            )
+        st.markdown("\n".join(rows))
+        st.caption("Samples cover completed reruns; the rerun drawing this table is recorded once it finishes.")
 
 # =========================================================================================
 # TAB 5 - OFFICIAL IDENTITY REPORT & MULTI-FORMAT EXPORT
 # =========================================================================================
-with tab5:
+if active_view == VIEW_EXPORT:
     if st.session_state["prediction"] is None:
         st.markdown(
             """<div style='text-align:center; padding:150px 20px; font-family:"Space Grotesk",sans-serif;
@@ -971,12 +1346,9 @@ with tab5:
             """, unsafe_allow_html=True
         )
 
-        # --- DATA EXPORT UTILITIES (CSV & JSON) ---
+        # --- DATA EXPORT UTILITIES (encoded only when a download is clicked) ---
         st.markdown('<div class="panel-heading" style="border:none; margin-top:50px;">💾 Download Cognitive Artifacts</div>', unsafe_allow_html=True)
-        
-        col_exp1, col_exp2 = st.columns(2)
-        
-        # 1. Prepare JSON Payload
+
         json_payload = {
             "metadata": {
                 "session_id": sess_id,
@@ -987,27 +1359,150 @@ with tab5:
             "classification": p_text,
             "cognitive_vectors": {t: st.session_state[f"trait_{t}"] for t in TRAIT_VECTORS}
         }
-        json_str = json.dumps(json_payload, indent=4)
-        b64_json = base64.b64encode(json_str.encode()).decode()
-        
-        # 2. Prepare CSV Payload
-        csv_data = pd.DataFrame([json_payload["cognitive_vectors"]]).to_csv(index=False)
-        b64_csv = base64.b64encode(csv_data.encode()).decode()
-        
+        # Download callables run outside the script thread, so they close over plain values only
+        record = {"session_id": sess_id, "timestamp": ts, "prediction": p_text, "confidence": conf}
+        record.update({f"prob_{c}": float(p) for c, p in zip(engine.classes, st.session_state["probabilities"])})
+        record.update(json_payload["cognitive_vectors"])
+
+        def profile_chunks():
+            import pandas as pd
+
+            yield pd.DataFrame([record])
+
+        col_fmt, col_comp = st.columns(2)
+        export_format = col_fmt.radio("Record format", exporters.available_formats(), format_func=str.upper, horizontal=True, key="export_format")
+        export_compression = col_comp.radio("Compression", exporters.available_compressions(export_format), format_func=str.upper, horizontal=True, key="export_compression")
+
+        col_exp1, col_exp2 = st.columns(2)
         with col_exp1:
-            href_csv = f'<a href="data:file/csv;base64,{b64_csv}" download="PIP_Profile_{sess_id}.csv" style="display:block; text-align:center; padding:20px; background:linear-gradient(135deg, var(--blue-dark), var(--blue)); color:white; text-decoration:none; font-family:\'Space Grotesk\'; font-weight:700; font-size:18px; border-radius:16px; letter-spacing:2px; box-shadow:0 10px 25px rgba(59,130,246,0.3);">⬇️ EXPORT AS CSV</a>'
-            st.markdown(href_csv, unsafe_allow_html=True)
-            
+            st.download_button(
+                f"⬇️ EXPORT RECORD AS {export_format.upper()}",
+                data=lambda: exporters.export_file(profile_chunks(), export_format, export_compression),
+                file_name=exporters.file_name(f"PIP_Profile_{sess_id}", export_format, export_compression),
+                mime=exporters.mime_type(export_format, export_compression),
+                key="export_record", on_click="ignore", width="stretch",
+            )
         with col_exp2:
-            href_json = f'<a href="data:application/json;base64,{b64_json}" download="PIP_Payload_{sess_id}.json" style="display:block; text-align:center; padding:20px; background:linear-gradient(135deg, var(--violet-dark), var(--violet)); color:white; text-decoration:none; font-family:\'Space Grotesk\'; font-weight:700; font-size:18px; border-radius:16px; letter-spacing:2px; box-shadow:0 10px 25px rgba(139,92,246,0.3);">⬇️ EXPORT AS JSON</a>'
-            st.markdown(href_json, unsafe_allow_html=True)
+            st.download_button(
+                "⬇️ EXPORT PAYLOAD AS JSON",
+                data=lambda: json.dumps(json_payload, indent=4),
+                file_name=f"PIP_Payload_{sess_id}.json",
+                mime="application/json",
+                key="export_payload", on_click="ignore", width="stretch",
+            )
+
+        # --- SESSION HISTORY EXPORT ---
+        history = st.session_state["history"]
+        history_classes = list(engine.classes)
+        st.download_button(
+            f"⬇️ EXPORT SESSION HISTORY ({len(history):,} RUNS) AS {export_format.upper()}",
+            data=lambda: exporters.export_file(history.iter_frames(history_classes), export_format, export_compression),
+            file_name=exporters.file_name(f"PIP_History_{sess_id}", export_format, export_compression),
+            mime=exporters.mime_type(export_format, export_compression),
+            key="export_history", on_click="ignore", width="stretch",
+        )
 
         # --- RAW JSON DISPLAY ---
         st.markdown('<div class="panel-heading" style="border:none; margin-top:60px;">💻 Raw JSON Payload Viewer</div>', unsafe_allow_html=True)
         st.json(json_payload)
 
 # =========================================================================================
-# 8. GLOBAL FOOTER
+# TAB 6 - BULK SCORING (STREAMED CSV / PARQUET UPLOADS)
+# =========================================================================================
+BATCH_CHUNK_SIZE = 50_000  # rows per vectorized call; also the progress-bar granularity
+
+if active_view == VIEW_BATCH:
+    st.markdown('<div class="panel-heading" style="border:none;">📦 Bulk Respondent Scoring</div>', unsafe_allow_html=True)
+    st.caption(
+        f"Upload a CSV or Parquet file with the 26 trait columns (slider names or snake_case), or a .pifs feature store. "
+        f"Rows are scored {BATCH_CHUNK_SIZE:,} at a time and written straight to a result file on disk; downloading it in the stored format serves that file as is; other formats are encoded on click."
+    )
+
+    batch_upload = st.file_uploader("Respondent dataset", type=["csv", "parquet", "pifs"], key="batch_upload")
+
+    if batch_upload is not None and st.button("🚀 RUN BULK SCORING", key="batch_run", width="stretch"):
+        if engine is None:
+            st.error("CRITICAL FATAL ERROR: Machine Learning assets are offline; bulk scoring is unavailable.")
+        else:
+            from batch_scoring import count_rows, score_stream  # pulls in pandas; only needed here
+
+            previous = st.session_state["batch_result"]
+            if previous is not None and os.path.exists(previous["path"]):
+                os.remove(previous["path"])
+            st.session_state["batch_result"] = None
+
+            if st.session_state["batch_workdir"] is None:
+                st.session_state["batch_workdir"] = tempfile.TemporaryDirectory(prefix="pip_batch_")
+            # Parquet (zstd columns) keeps the on-disk intermediate compact and typed; CSV when pyarrow
+            # is absent. A download in the stored encoding is served from this file as is
+            store_format = "parquet" if "parquet" in exporters.available_formats() else "csv"
+            fd, out_path = tempfile.mkstemp(
+                prefix="result_", suffix=f".{store_format}", dir=st.session_state["batch_workdir"].name
+            )
+            os.close(fd)
+            total_rows = count_rows(batch_upload)
+            progress_bar = st.progress(0.0, text="Validating columns...")
+
+            def report_progress(rows_done):
+                fraction = min(rows_done / total_rows, 1.0) if total_rows else 1.0
+                progress_bar.progress(fraction, text=f"Scored {rows_done:,} / {total_rows:,} rows")
+
+            try:
+                stats = score_stream(
+                    engine, batch_upload, out_path, BATCH_CHUNK_SIZE,
+                    progress=report_progress, trace_memory=True,
+                    compression="zstd" if store_format == "parquet" else None,
+                )
+            except (ValueError, KeyError) as e:
+                progress_bar.empty()
+                st.error(f"Could not score dataset: {e}")
+            else:
+                st.session_state["batch_result"] = {
+                    "path": out_path,
+                    "encoding": exporters.stored_encoding(out_path),
+                    "source": batch_upload.name,
+                    "stats": stats,
+                }
+
+    batch_result = st.session_state["batch_result"]
+    if batch_result is not None and os.path.exists(batch_result["path"]):
+        stats = batch_result["stats"]
+        bm1, bm2, bm3, bm4 = st.columns(4)
+        bm1.metric("Rows Scored", f"{stats['rows']:,}")
+        bm2.metric("Throughput", f"{stats['rows_per_sec']:,.0f} rows/s")
+        bm3.metric("Wall Time", f"{stats['seconds']:.2f} s")
+        bm4.metric("Peak Heap", f"{stats['peak_bytes'] / 2**20:.1f} MiB")
+
+        result_path = batch_result["path"]
+        stem = os.path.splitext(batch_result["source"])[0] + "_scored"
+        # Default to the stored encoding: that download is the result file itself, with no re-encode
+        stored_format, stored_compression = batch_result["encoding"]
+        batch_formats = exporters.available_formats()
+        col_bfmt, col_bcomp = st.columns(2)
+        batch_export_format = col_bfmt.radio("Download format", batch_formats, index=batch_formats.index(stored_format), format_func=str.upper, horizontal=True, key="batch_export_format")
+        batch_compressions = exporters.available_compressions(batch_export_format)
+        batch_export_compression = col_bcomp.radio("Compression", batch_compressions, index=batch_compressions.index(stored_compression) if stored_compression in batch_compressions else 0, format_func=str.upper, horizontal=True, key="batch_export_compression")
+        st.download_button(
+            f"⬇️ DOWNLOAD SCORED ROWS AS {batch_export_format.upper()}",
+            data=lambda: exporters.export_table_file(result_path, batch_export_format, batch_export_compression),
+            file_name=exporters.file_name(stem, batch_export_format, batch_export_compression),
+            mime=exporters.mime_type(batch_export_format, batch_export_compression),
+            key="batch_download", on_click="ignore", width="stretch",
+        )
+        st.caption("Peak heap is the tracemalloc peak of Python/NumPy allocations during the run; pyarrow buffers are not included.")
+
+rerun_timer.lap("view:" + active_view)
+
+# =========================================================================================
+# 8. DEFERRED SIDEBAR TELEMETRY (rendered after this run's prediction logic)
+# =========================================================================================
+with latency_slot.container():
+    render_latency_telemetry()
+
+rerun_timer.lap("telemetry")
+
+# =========================================================================================
+# 9. GLOBAL FOOTER
 # =========================================================================================
 st.markdown(
     """
@@ -1018,3 +1513,9 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+rerun_timer.lap("footer")
+rerun_windows["app"].record(rerun_timer)
+dashboard_metrics.observe_rerun("app", rerun_timer)
+# Per-section breakdown of this session's latest rerun (read by benchmarks.profile_app)
+st.session_state["rerun_breakdown"] = rerun_timer.as_ms()
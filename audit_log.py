@@ -0,0 +1,442 @@
+"""
+Append-only audit log of interactive predictions.
+
+AuditLog.record() is called on the prediction path. It only puts a small
+tuple on a bounded in-memory queue. A background writer thread does the
+rest: it drains the queue in batches, turns events into records and appends
+them to the active segment file. Every record holds
+
+    ts                 time.time_ns() of the prediction
+    session_id         dashboard session
+    model_fingerprint  InferenceEngine.fingerprint of the model that answered
+    model_version      train.py version from metrics.json (None for older artifacts)
+    features           the 26 trait values in TRAIT_VECTORS order
+    classes            class labels, aligned with probabilities
+    probabilities      the probabilities that were shown
+    prediction         the displayed class
+    latency_ms         measured prediction latency
+    cache_hit          whether the prediction cache answered
+
+Segments are either gzip-compressed JSONL (one gzip member per batch, so every
+flushed batch is readable even if the process dies) or zstd Parquet (one row
+group per batch; needs pyarrow). A segment is written under a ".part" name and
+renamed once it is closed: when it reaches segment_records, when it is
+segment_seconds old, or when the log closes.
+
+When the queue is full, the back-pressure policy decides what happens:
+
+    drop_newest  the new event is dropped (default; the request never waits)
+    drop_oldest  the oldest queued event is dropped to make room
+    block        the caller waits up to block_timeout, then drops the event
+
+Drops are counted in stats. The replay subcommand rescores logged segments
+with the current artifacts and reports where the answers changed.
+
+Usage:
+    python audit_log.py info audit_log/
+    python audit_log.py replay audit_log/ --changes changed.csv
+"""
+
+import argparse
+import atexit
+import glob
+import gzip
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from ml_core import ARTIFACT_DIR, N_FEATURES, InferenceEngine
+
+DEFAULT_AUDIT_DIR = os.path.join(ARTIFACT_DIR, "audit_log")
+SEGMENT_FORMATS = ("jsonl", "parquet")
+BACKPRESSURE_POLICIES = ("drop_newest", "drop_oldest", "block")
+PARTIAL_SUFFIX = ".part"
+
+_SUFFIXES = {"jsonl": ".jsonl.gz", "parquet": ".parquet"}
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _record(event):
+    ts, session_id, fingerprint, version, features, classes, probabilities, prediction, latency_ns, cache_hit = event
+    return {
+        "ts": ts,
+        "session_id": session_id,
+        "model_fingerprint": fingerprint,
+        "model_version": version,
+        "features": features.tolist(),
+        "classes": [str(c) for c in classes],
+        "probabilities": probabilities.tolist(),
+        "prediction": str(prediction),
+        "latency_ms": latency_ns / 1e6,
+        "cache_hit": bool(cache_hit),
+    }
+
+
+# =========================================================================================
+# 1. SEGMENT WRITERS
+# =========================================================================================
+class _JsonlSegment:
+    """gzip JSONL; each batch is appended as its own gzip member and flushed."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path + PARTIAL_SUFFIX, "ab")
+
+    def write(self, records):
+        text = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+        self._file.write(gzip.compress(text.encode("utf-8"), compresslevel=6))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+        os.replace(self.path + PARTIAL_SUFFIX, self.path)
+
+
+class _ParquetSegment:
+    """zstd Parquet; each batch becomes a row group. Readable once closed."""
+
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self._pa = pa
+        self.schema = pa.schema([
+            ("ts", pa.int64()),
+            ("session_id", pa.string()),
+            ("model_fingerprint", pa.string()),
+            ("model_version", pa.string()),
+            ("features", pa.list_(pa.float64())),
+            ("classes", pa.list_(pa.string())),
+            ("probabilities", pa.list_(pa.float64())),
+            ("prediction", pa.string()),
+            ("latency_ms", pa.float64()),
+            ("cache_hit", pa.bool_()),
+        ])
+        self._writer = pq.ParquetWriter(path + PARTIAL_SUFFIX, self.schema, compression="zstd")
+
+    def write(self, records):
+        self._writer.write_table(self._pa.Table.from_pylist(records, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+        os.replace(self.path + PARTIAL_SUFFIX, self.path)
+
+
+# =========================================================================================
+# 2. ASYNCHRONOUS LOG
+# =========================================================================================
+class AuditLog:
+    """
+    Bounded queue plus background writer thread (see the module docstring).
+    One instance per process; record() is thread-safe.
+    """
+
+    def __init__(self, directory=DEFAULT_AUDIT_DIR, segment_format="jsonl", max_queue=10_000, batch_size=512,
+                 flush_interval=1.0, segment_records=100_000, segment_seconds=3600, policy="drop_newest",
+                 block_timeout=0.05):
+        if segment_format not in SEGMENT_FORMATS:
+            raise ValueError(f"Unknown segment format '{segment_format}'. Expected one of {', '.join(SEGMENT_FORMATS)}")
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown back-pressure policy '{policy}'. Expected one of {', '.join(BACKPRESSURE_POLICIES)}")
+        if segment_format == "parquet":
+            import pyarrow  # noqa: F401  (fail at construction, not in the writer thread)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_format = segment_format
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_records = segment_records
+        self.segment_seconds = segment_seconds
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.stats = {"submitted": 0, "dropped": 0, "written": 0, "batches": 0, "segments": 0, "errors": 0}
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._segment = None
+        self._segment_rows = 0
+        self._segment_opened = 0.0
+        self._sequence = 0
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- request path ---------------------------------------------------------------
+    def record(self, features, probabilities, prediction, classes, latency_ns, model_fingerprint,
+               model_version=None, session_id=None, cache_hit=False):
+        """
+        Queues one prediction for writing; never touches the disk. Returns
+        False when the event was dropped (log closed, or queue full under
+        drop_newest / block).
+        """
+        if self._closed:
+            return False
+        event = (time.time_ns(), session_id, model_fingerprint, model_version,
+                 np.array(features).reshape(N_FEATURES), classes, np.array(probabilities, dtype=np.float64),
+                 prediction, latency_ns, cache_hit)
+        with self._lock:
+            self.stats["submitted"] += 1
+        if self._offer(event):
+            return True
+        with self._lock:
+            self.stats["dropped"] += 1
+        return False
+
+    def _offer(self, event):
+        if self.policy == "block":
+            try:
+                self._queue.put(event, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                return False
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return True
+            except queue.Full:
+                if self.policy == "drop_newest":
+                    return False
+            try:
+                # drop_oldest: make room and retry; the writer may have made room meanwhile
+                oldest = self._queue.get_nowait()
+            except queue.Empty:
+                continue
+            if not isinstance(oldest, tuple):
+                # a flush / close marker is never dropped; the new event goes instead
+                if not self._put_marker(oldest, self.block_timeout):
+                    logger.warning("Audit log queue stayed full; a flush/close marker was lost")
+                return False
+            with self._lock:
+                self.stats["dropped"] += 1
+
+    def _put_marker(self, item, timeout):
+        """
+        Queues a flush / close marker. Waits in short slices so a writer that
+        has died (or a queue that stays full past timeout) returns False
+        instead of blocking the caller forever.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._thread.is_alive():
+            wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait <= 0:
+                return False
+            try:
+                self._queue.put(item, timeout=wait)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    def flush(self, timeout=None):
+        """Blocks until everything queued before the call is written. Returns False on timeout."""
+        if self._closed:
+            return True
+        started = time.monotonic()
+        done = threading.Event()
+        if not self._put_marker(done, timeout):
+            return False
+        return done.wait(None if timeout is None else max(timeout - (time.monotonic() - started), 0.0))
+
+    def close(self, timeout=10.0):
+        """Writes the queued events, closes the active segment and stops the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        started = time.monotonic()
+        if not self._put_marker(_STOP, timeout):
+            logger.warning("Audit log writer did not accept the close marker; %d events left unwritten", self.pending)
+            return
+        self._thread.join(None if timeout is None else max(timeout - (time.monotonic() - started), 0.0))
+
+    # ---- writer thread --------------------------------------------------------------
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = self.flush_interval if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, tuple):
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(pending) < self.batch_size:
+                    continue
+            if pending:
+                self._write(pending)
+                pending, deadline = [], None
+            if self._segment is not None and time.monotonic() - self._segment_opened >= self.segment_seconds:
+                self._close_segment()
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                self._close_segment()
+                return
+
+    def _write(self, events):
+        try:
+            records = [_record(e) for e in events]
+            while records:
+                if self._segment is None:
+                    self._open_segment()
+                take = self.segment_records - self._segment_rows
+                self._segment.write(records[:take])
+                self._segment_rows += len(records[:take])
+                with self._lock:
+                    self.stats["written"] += len(records[:take])
+                    self.stats["batches"] += 1
+                records = records[take:]
+                if self._segment_rows >= self.segment_records:
+                    self._close_segment()
+        except Exception:
+            # Auditing must never take the dashboard down; the batch is lost and counted
+            logger.exception("Audit log write failed")
+            with self._lock:
+                self.stats["errors"] += 1
+            self._close_segment()
+
+    def _open_segment(self):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        name = f"audit-{stamp}-{os.getpid()}-{self._sequence:05d}{_SUFFIXES[self.segment_format]}"
+        self._sequence += 1
+        path = os.path.join(self.directory, name)
+        self._segment = (_JsonlSegment if self.segment_format == "jsonl" else _ParquetSegment)(path)
+        self._segment_rows = 0
+        self._segment_opened = time.monotonic()
+
+    def _close_segment(self):
+        if self._segment is None:
+            return
+        try:
+            self._segment.close()
+            with self._lock:
+                self.stats["segments"] += 1
+        except Exception:
+            logger.exception("Closing audit segment %s failed", self._segment.path)
+            with self._lock:
+                self.stats["errors"] += 1
+        self._segment = None
+
+
+# =========================================================================================
+# 3. READING & REPLAY
+# =========================================================================================
+def list_segments(paths, include_partial=False):
+    """
+    Expands directories into their segment files (oldest name first). With
+    include_partial, JSONL segments still open (or left by a crashed
+    process) are included; open Parquet segments have no footer yet and are
+    never readable.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    segments = []
+    for path in paths:
+        if os.path.isdir(path):
+            patterns = [f"*{s}" for s in _SUFFIXES.values()]
+            if include_partial:
+                patterns.append(f"*{_SUFFIXES['jsonl']}{PARTIAL_SUFFIX}")
+            segments.extend(sorted(p for pattern in patterns for p in glob.glob(os.path.join(path, pattern))))
+        else:
+            segments.append(os.fspath(path))
+    return segments
+
+
+def read_segment(path):
+    """Records of one segment as a list of dicts. A truncated trailing gzip member is skipped."""
+    if path.endswith(_SUFFIXES["parquet"]):
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path).to_pylist()
+    records = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                records.append(json.loads(line))
+    except (EOFError, gzip.BadGzipFile, json.JSONDecodeError):
+        logger.warning("%s: ignoring truncated tail after %d records", path, len(records))
+    return records
+
+
+def replay(paths, engine, include_partial=False):
+    """
+    Rescores every logged prediction with engine. Returns (summary, changed),
+    where changed lists the records whose predicted class differs now.
+    max_abs_diff compares probabilities of records logged with the same class
+    order as the engine; same_model counts records logged by this very model,
+    whose probabilities should reproduce exactly.
+    """
+    segments = list_segments(paths, include_partial)
+    records = [r for path in segments for r in read_segment(path)]
+    summary = {"records": len(records), "segments": len(segments),
+               "models": {}, "same_model": 0, "changed": 0, "max_abs_diff": None}
+    if not records:
+        return summary, []
+    features = np.array([r["features"] for r in records], dtype=np.float64)
+    probs = engine.predict_proba(features)
+    predicted = engine.classes[probs.argmax(axis=1)]
+    engine_classes = [str(c) for c in engine.classes]
+    changed, max_diff = [], None
+    for record, p, label in zip(records, probs, predicted):
+        model = record["model_fingerprint"] or "unknown"
+        summary["models"][model] = summary["models"].get(model, 0) + 1
+        summary["same_model"] += record["model_fingerprint"] == engine.fingerprint
+        if list(record["classes"]) == engine_classes:
+            diff = float(np.max(np.abs(p - np.asarray(record["probabilities"]))))
+            max_diff = diff if max_diff is None else max(max_diff, diff)
+        if str(label) != record["prediction"]:
+            changed.append({**record, "replayed_prediction": str(label),
+                            "replayed_probabilities": p.tolist()})
+    summary["changed"] = len(changed)
+    summary["max_abs_diff"] = max_diff
+    return summary, changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and replay the prediction audit log.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="list segments with record counts")
+    info.add_argument("paths", nargs="*", default=[DEFAULT_AUDIT_DIR])
+    info.add_argument("--include-partial", action="store_true")
+    rep = sub.add_parser("replay", help="rescore logged predictions with the current artifacts")
+    rep.add_argument("paths", nargs="*", default=[DEFAULT_AUDIT_DIR])
+    rep.add_argument("--artifacts", default=ARTIFACT_DIR, help="artifact directory to rescore with")
+    rep.add_argument("--include-partial", action="store_true", help="also read open / crashed JSONL segments")
+    rep.add_argument("--changes", help="write records whose class changed to this CSV")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        for path in list_segments(args.paths, args.include_partial):
+            print(f"{os.path.getsize(path):>12,} B {len(read_segment(path)):>10,} records  {path}")
+        return 0
+
+    engine = InferenceEngine.from_directory(args.artifacts)
+    summary, changed = replay(args.paths, engine, args.include_partial)
+    print(json.dumps(summary, indent=2))
+    if args.changes and changed:
+        import pandas as pd
+
+        pd.DataFrame(changed).to_csv(args.changes, index=False)
+        print(f"wrote {len(changed):,} changed predictions to {args.changes}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""
+Headless batch scoring for the Personality Intelligence Platform.
+
+Loads the model artifacts once and scores CSV or Parquet respondent files in
+large vectorized chunks, writing the decoded label, every class probability
+and the max confidence for each row.
+
+Usage:
+    python batch_scoring.py respondents.csv scored.csv
+    python batch_scoring.py respondents.parquet scored.parquet --chunk-size 500000
+    python batch_scoring.py --benchmark 1000000
+    python batch_scoring.py respondents.csv scored.parquet --workers 8   # process pool
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from ml_core import (
+    ARTIFACT_DIR, N_FEATURES, TRAIT_MAX, TRAIT_MIN, TRAIT_VECTORS, InferenceEngine, resolve_feature_columns,
+)
+
+DEFAULT_CHUNK_SIZE = 250_000
+
+
+# =========================================================================================
+# 1. CHUNKED INPUT READERS
+# =========================================================================================
+def _file_format(name):
+    ext = os.path.splitext(name)[1].lower()
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext == ".csv":
+        return "csv"
+    if ext == ".pifs":
+        return "store"
+    raise ValueError(f"Unsupported file type '{ext}'. Expected .csv, .parquet or .pifs")
+
+
+def validate_chunk(features, first_row=0):
+    """
+    Checks one (n_rows, 26) chunk against the feature schema: every value
+    must be a finite number in [TRAIT_MIN, TRAIT_MAX]. Non-numeric cells
+    (object columns from a CSV) are converted to float64 first. Returns the
+    numeric chunk; raises ValueError naming the first offending row (1-based,
+    counted from first_row) and trait, so bad rows are never scored.
+    """
+    if features.dtype.kind not in "biuf":
+        numeric = pd.DataFrame(features).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        bad = np.isnan(numeric) & pd.notna(features)
+        if bad.any():
+            row, col = np.argwhere(bad)[0]
+            raise ValueError(f"row {first_row + row + 1:,}: {TRAIT_VECTORS[col]} = {features[row, col]!r} is not a number")
+        features = numeric
+    if not features.size:
+        return features
+    if features.dtype.kind == "f":
+        if np.isfinite(features).all() and features.min() >= TRAIT_MIN and features.max() <= TRAIT_MAX:
+            return features
+        # NaN compares False, so the negated range test also catches missing values
+        bad = ~((features >= TRAIT_MIN) & (features <= TRAIT_MAX))
+    else:
+        if features.min() >= TRAIT_MIN and features.max() <= TRAIT_MAX:
+            return features
+        bad = (features < TRAIT_MIN) | (features > TRAIT_MAX)
+    row, col = np.argwhere(bad)[0]
+    value = features[row, col].item()
+    problem = "is missing or not finite" if features.dtype.kind == "f" and not np.isfinite(value) else \
+        f"is outside [{TRAIT_MIN}, {TRAIT_MAX}]"
+    raise ValueError(f"row {first_row + row + 1:,}: {TRAIT_VECTORS[col]} = {value!r} {problem}")
+
+
+def iter_feature_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE, name=None):
+    """
+    Yields (n_rows, 26) arrays in TRAIT_VECTORS order, reading at most
+    chunk_size rows at a time. source is a path or a binary file object
+    (e.g. a Streamlit upload); name overrides the file name used to pick the
+    format. Integer columns stay integer so that the engine's lookup-table
+    mode can score them directly; feature stores (.pifs) yield zero-copy
+    uint8 slices of the mapped file.
+
+    Every chunk is checked with validate_chunk before it is yielded: a
+    missing, non-numeric or out-of-range value rejects the file with its row
+    number instead of reaching the engine.
+    """
+    rows = 0
+    for chunk in _iter_raw_chunks(source, chunk_size, name):
+        yield validate_chunk(chunk, rows)
+        rows += len(chunk)
+
+
+def _iter_raw_chunks(source, chunk_size, name):
+    if name is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    file_format = _file_format(name)
+    if file_format == "store":
+        from feature_store import open_store
+
+        yield from open_store(source).iter_chunks(chunk_size)
+    elif file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+        columns = resolve_feature_columns(parquet_file.schema_arrow.names)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield np.column_stack([batch.column(c).to_numpy() for c in columns])
+    else:
+        header = pd.read_csv(source, nrows=0).columns
+        columns = resolve_feature_columns(header)
+        # usecols keeps the file's column order; compile the gather into TRAIT_VECTORS
+        # order once per file instead of reindexing every chunk by name. Parsed chunks
+        # are one column-major block, so gathering rows of its transpose copies whole
+        # contiguous columns
+        selected = set(columns)
+        file_order = [c for c in header if c in selected]
+        gather = np.array([file_order.index(c) for c in columns], dtype=np.intp)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        reader = pd.read_csv(source, usecols=columns, chunksize=chunk_size)
+        for chunk in reader:
+            yield chunk.to_numpy().T[gather].T
+
+
+def count_rows(source, name=None):
+    """
+    Number of data rows in a CSV or Parquet source, for progress reporting.
+    Parquet reads the footer metadata; CSV counts newlines in 1 MiB blocks.
+    File objects are rewound afterwards.
+    """
+    if name is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    file_format = _file_format(name)
+    if file_format == "store":
+        from feature_store import open_store
+
+        rows = len(open_store(source))
+    elif file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        rows = pq.ParquetFile(source).metadata.num_rows
+    else:
+        f = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+        try:
+            lines, last = 0, b"\n"
+            for block in iter(lambda: f.read(1 << 20), b""):
+                lines += block.count(b"\n")
+                last = block[-1:]
+            rows = lines - 1 + (last != b"\n")  # header line; unterminated final row
+        finally:
+            if f is not source:
+                f.close()
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return max(rows, 0)
+
+
+# =========================================================================================
+# 2. RESULT WRITERS
+# =========================================================================================
+def results_frame(classes, labels, probs, confidence):
+    frame = pd.DataFrame({"prediction": labels})
+    for i, name in enumerate(classes):
+        frame[f"prob_{name}"] = probs[:, i]
+    frame["confidence"] = confidence
+    return frame
+
+
+class ResultWriter:
+    """
+    Appends scored chunks to a CSV or Parquet file without buffering the full
+    result. compression is the Parquet column codec (pyarrow's default when
+    None); CSV output is always uncompressed.
+    """
+
+    def __init__(self, path, compression=None):
+        self.path = path
+        self.format = _file_format(path)
+        if self.format == "store":
+            raise ValueError("Feature stores hold inputs only; write results as .csv or .parquet")
+        self.compression = compression
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, frame):
+        if self.format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                options = {} if self.compression is None else {"compression": self.compression}
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema, **options)
+            self._parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a" if self._wrote_header else "w", header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def remove_partial(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+# =========================================================================================
+# 3. SCORING DRIVERS
+# =========================================================================================
+def score_stream(engine, source, output_path, chunk_size=DEFAULT_CHUNK_SIZE, name=None,
+                 progress=None, trace_memory=False, compression=None):
+    """
+    Streams source (a path or file object, see iter_feature_chunks) through
+    the engine chunk by chunk and writes results to output_path, so at most
+    one chunk of features and results is held at a time. progress, if given,
+    is called with the running row count after every chunk. Invalid input
+    values raise ValueError (see validate_chunk) and remove output_path.
+    compression is passed to ResultWriter (Parquet column codec).
+
+    Returns a stats dict with rows, seconds and rows_per_sec. With
+    trace_memory, it also has peak_bytes: the peak of Python/NumPy heap
+    allocations during the run, from tracemalloc (process-wide, and excluding
+    memory allocated by pyarrow's own allocator).
+    """
+    if trace_memory:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+    rows = 0
+    start = time.perf_counter()
+    try:
+        try:
+            with ResultWriter(output_path, compression) as writer:
+                for features in iter_feature_chunks(source, chunk_size, name=name):
+                    labels, probs, confidence = engine.score(features)
+                    writer.write(results_frame(engine.classes, labels, probs, confidence))
+                    rows += len(features)
+                    if progress is not None:
+                        progress(rows)
+        except BaseException:
+            # A rejected input leaves no partial result that could pass for a complete one
+            remove_partial(output_path)
+            raise
+        elapsed = time.perf_counter() - start
+        stats = {"rows": rows, "seconds": elapsed, "rows_per_sec": rows / elapsed if elapsed else 0.0}
+        if trace_memory:
+            stats["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        if trace_memory and started:
+            tracemalloc.stop()
+    return stats
+
+
+def score_file(engine, input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, trace_memory=False):
+    """Scores the file at input_path into output_path; see score_stream."""
+    return score_stream(engine, input_path, output_path, chunk_size, trace_memory=trace_memory)
+
+
+def benchmark(engine, n_rows, chunk_size=DEFAULT_CHUNK_SIZE, seed=0):
+    """
+    Scores n_rows synthetic integer profiles in memory (no file I/O) and
+    returns the same stats dict as score_file.
+    """
+    rng = np.random.default_rng(seed)
+    rows = 0
+    start = time.perf_counter()
+    while rows < n_rows:
+        n = min(chunk_size, n_rows - rows)
+        engine.score(rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(n, N_FEATURES), dtype=np.uint8))
+        rows += n
+    elapsed = time.perf_counter() - start
+    return {"rows": rows, "seconds": elapsed, "rows_per_sec": rows / elapsed if elapsed else 0.0}
+
+
+def _report(stats):
+    peak = f", peak traced memory {stats['peak_bytes'] / 2**20:.1f} MiB" if "peak_bytes" in stats else ""
+    workers = f" on {stats['workers']} workers" if "workers" in stats else ""
+    print(
+        f"scored {stats['rows']:,} rows in {stats['seconds']:.3f}s{workers} "
+        f"({stats['rows_per_sec']:,.0f} rows/sec{peak})",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score personality trait vectors in bulk.")
+    parser.add_argument("input", nargs="?", help="CSV or Parquet file with the 26 trait columns")
+    parser.add_argument("output", nargs="?", help="CSV or Parquet destination for the scored rows")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows scored per vectorized call")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR, help="directory holding the .pkl artifacts")
+    parser.add_argument("--lookup-table", action="store_true", help="score integer inputs through the precomputed contribution table")
+    parser.add_argument("--trace-memory", action="store_true", help="report peak heap allocations (tracemalloc) of a file run")
+    parser.add_argument("--workers", type=int, default=1, help="score a file in a pool of N processes over shared memory (0 = one per core)")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS", help="score ROWS synthetic rows in memory and report throughput")
+    args = parser.parse_args(argv)
+
+    if args.benchmark is None and (args.input is None or args.output is None):
+        parser.error("input and output are required unless --benchmark is given")
+
+    if args.workers != 1:
+        if args.benchmark is not None or args.lookup_table or args.trace_memory:
+            parser.error("--workers cannot be combined with --benchmark, --lookup-table or --trace-memory")
+        from scoring_pool import ScoringPool
+
+        with ScoringPool(args.workers or None, args.chunk_size, args.artifacts) as pool:
+            _report(pool.score_stream(args.input, args.output))
+        return 0
+
+    engine = InferenceEngine.from_directory(args.artifacts, precompute_table=args.lookup_table)
+    if args.benchmark is not None:
+        stats = benchmark(engine, args.benchmark, args.chunk_size)
+    else:
+        stats = score_file(engine, args.input, args.output, args.chunk_size, trace_memory=args.trace_memory)
+    _report(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
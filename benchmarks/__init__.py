@@ -0,0 +1,5 @@
+"""
+Benchmark scripts for the Personality Intelligence Platform.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_fused``.
+"""
@@ -0,0 +1,28 @@
+"""Shared timing helpers for the benchmark scripts."""
+
+import statistics
+import time
+
+
+def sample_call(fn, number=1000, repeat=7):
+    """Calls fn() `number` times per round for `repeat` rounds; returns the per-call seconds of each round."""
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    return rounds
+
+
+def time_call(fn, number=1000, repeat=7):
+    """
+    Calls fn() `number` times per round for `repeat` rounds and returns
+    per-call timings in microseconds (best and median across rounds).
+    """
+    rounds = [s * 1e6 for s in sample_call(fn, number, repeat)]
+    return {"best_us": min(rounds), "median_us": statistics.median(rounds)}
+
+
+def format_row(name, stats):
+    return f"{name:<36} best {stats['best_us']:>10.2f} us   median {stats['median_us']:>10.2f} us"
@@ -0,0 +1,100 @@
+"""
+Prediction audit log benchmark.
+
+Times the request-path cost of logging one prediction two ways:
+
+    synchronous   serialize the record and append it to a gzip JSONL file
+                  (one gzip member, flushed) inside the request
+    AuditLog      AuditLog.record(): enqueue only, the writer thread batches
+
+then checks that every queued record reached disk, that a burst into a small
+queue is absorbed according to each back-pressure policy, and that replaying
+the segments with the same model reproduces the logged probabilities.
+
+    python -m benchmarks.bench_audit_log
+    python -m benchmarks.bench_audit_log --predictions 20000 --format parquet
+"""
+
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from audit_log import BACKPRESSURE_POLICIES, AuditLog, _record, replay
+from ml_core import N_FEATURES, TRAIT_MAX, TRAIT_MIN, InferenceEngine
+
+
+def _percentiles(samples_ns):
+    us = np.asarray(samples_ns) / 1e3
+    return np.percentile(us, 50), np.percentile(us, 99)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare synchronous and queued audit logging on the request path.")
+    parser.add_argument("--predictions", type=int, default=5000)
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    args = parser.parse_args(argv)
+
+    engine = InferenceEngine.from_directory()
+    features = np.random.default_rng(0).integers(TRAIT_MIN, TRAIT_MAX + 1, size=(args.predictions, N_FEATURES))
+    probs = engine.predict_proba(features)
+    labels = engine.classes[probs.argmax(axis=1)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_times = []
+        with open(os.path.join(tmp, "sync.jsonl.gz"), "ab") as f:
+            for x, p, label in zip(features, probs, labels):
+                start = time.perf_counter_ns()
+                record = _record((time.time_ns(), "BENCH", engine.fingerprint, None, np.array(x), engine.classes,
+                                  np.array(p), label, 0, False))
+                f.write(gzip.compress((json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")))
+                f.flush()
+                sync_times.append(time.perf_counter_ns() - start)
+
+        directory = os.path.join(tmp, "async")
+        log = AuditLog(directory, segment_format=args.format, max_queue=args.predictions,
+                       segment_records=max(args.predictions // 4, 1))
+        async_times = []
+        for x, p, label in zip(features, probs, labels):
+            start = time.perf_counter_ns()
+            log.record(x, p, label, engine.classes, 0, engine.fingerprint, session_id="BENCH")
+            async_times.append(time.perf_counter_ns() - start)
+        drain_start = time.perf_counter()
+        log.close()
+        drain = time.perf_counter() - drain_start
+        assert log.stats["written"] == args.predictions and log.stats["dropped"] == 0, log.stats
+
+        summary, changed = replay(directory, engine)
+        assert summary["records"] == args.predictions and summary["same_model"] == args.predictions, summary
+        assert not changed and summary["max_abs_diff"] < 1e-12, summary
+        on_disk = sum(os.path.getsize(os.path.join(directory, n)) for n in os.listdir(directory))
+
+        print(f"{args.predictions:,} predictions, {args.format} segments")
+        print(f"{'request path':<14} {'p50 us':>9} {'p99 us':>9}")
+        for name, samples in (("synchronous", sync_times), ("AuditLog", async_times)):
+            p50, p99 = _percentiles(samples)
+            print(f"{name:<14} {p50:>9.1f} {p99:>9.1f}")
+        print(f"writer drained the backlog {drain * 1e3:.0f} ms after the last record; "
+              f"{summary['segments']} segments, {on_disk / args.predictions:.0f} B/record on disk")
+        print("replay with the logging model: identical predictions, max |dp| "
+              f"{summary['max_abs_diff']:.2e}: ok")
+
+        for policy in BACKPRESSURE_POLICIES:
+            burst = AuditLog(os.path.join(tmp, policy), max_queue=64, batch_size=64, flush_interval=0.01,
+                             policy=policy, block_timeout=0.001)
+            accepted = sum(burst.record(x, p, label, engine.classes, 0, engine.fingerprint)
+                           for x, p, label in zip(features, probs, labels))
+            burst.close()
+            stats = burst.stats
+            assert stats["submitted"] == args.predictions
+            assert stats["written"] + stats["dropped"] == args.predictions, stats
+            print(f"burst into a 64-event queue, {policy:<11}: accepted {accepted:>6,}  written {stats['written']:>6,}"
+                  f"  dropped {stats['dropped']:>6,}")
+
+
+if __name__ == "__main__":
+    main()
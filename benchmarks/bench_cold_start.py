@@ -0,0 +1,72 @@
+"""
+Cold-start benchmark: import + artifact load time in a fresh interpreter.
+
+Each strategy runs in its own subprocess (so no module is already imported)
+and reports its in-process import+load time and whether sklearn was pulled in.
+The interpreter startup itself is measured separately as a baseline.
+
+    python -m benchmarks.bench_cold_start --runs 7
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from ml_core import ARTIFACT_DIR
+
+_CHILD = """
+import json, sys, time, warnings
+warnings.simplefilter("ignore")
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "sklearn_imported": "sklearn" in sys.modules}}))
+"""
+
+STRATEGIES = {
+    "pickle (sklearn)": "import ml_core\nml_core.InferenceEngine.from_directory()",
+    "bundle (mmap, no sklearn)": "import model_bundle\nwith model_bundle.load_bundle() as bundle:\n    bundle.engine()",
+}
+
+
+def run_child(body):
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(body=body)],
+        cwd=ARTIFACT_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def interpreter_startup(runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare cold-start import+load time of the artifact formats.")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    print(f"interpreter startup (median): {interpreter_startup(args.runs) * 1000:.1f} ms")
+    results = {}
+    for name, body in STRATEGIES.items():
+        samples = [run_child(body) for _ in range(args.runs)]
+        seconds = [s["seconds"] for s in samples]
+        results[name] = statistics.median(seconds)
+        print(
+            f"{name:<28} median {results[name] * 1000:>8.1f} ms   best {min(seconds) * 1000:>8.1f} ms   "
+            f"sklearn imported: {samples[0]['sklearn_imported']}"
+        )
+    pickle_s, bundle_s = results["pickle (sklearn)"], results["bundle (mmap, no sklearn)"]
+    print(f"speedup: {pickle_s / bundle_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
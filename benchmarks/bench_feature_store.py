@@ -0,0 +1,80 @@
+"""
+Feature store vs CSV benchmark.
+
+Writes a synthetic respondent CSV, converts it once into a .pifs store, and
+compares, for both sources:
+
+    load   pd.read_csv of the 26 columns  vs  open_store (mmap + header)
+    scan   domain statistics over every row
+    score  full-corpus scoring through the engine
+
+Results from the store are asserted equal to the CSV path.
+
+    python -m benchmarks.bench_feature_store
+    python -m benchmarks.bench_feature_store --rows 5000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from feature_store import convert, open_store
+from ml_core import DOMAINS, N_FEATURES, TRAINING_COLUMNS, TRAIT_MAX, TRAIT_MIN, InferenceEngine
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _domain_statistics(features):
+    """Reference domain statistics over the parsed CSV matrix."""
+    scores = np.column_stack([features[:, span].mean(axis=1) for span in DOMAINS.values()])
+    return scores.mean(axis=0), scores.std(axis=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the .pifs feature store with pd.read_csv.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    engine = InferenceEngine.from_directory(precompute_table=True)
+    rng = np.random.default_rng(0)
+    data = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(args.rows, N_FEATURES))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "corpus.csv")
+        store_path = os.path.join(tmp, "corpus.pifs")
+        pd.DataFrame(data, columns=TRAINING_COLUMNS).to_csv(csv_path, index=False)
+        convert_seconds, _ = _timed(lambda: convert(csv_path, store_path))
+
+        csv_load, frame = _timed(lambda: pd.read_csv(csv_path, usecols=TRAINING_COLUMNS)[TRAINING_COLUMNS].to_numpy())
+        store_load, store = _timed(lambda: open_store(store_path))
+        np.testing.assert_array_equal(store.features, frame)
+
+        csv_scan, (csv_mean, csv_std) = _timed(lambda: _domain_statistics(frame))
+        store_scan, store_stats = _timed(lambda: store.domain_statistics())
+        np.testing.assert_allclose([m for m, _ in store_stats.values()], csv_mean, rtol=1e-12)
+        np.testing.assert_allclose([s for _, s in store_stats.values()], csv_std, rtol=1e-9)
+
+        csv_score, csv_probs = _timed(lambda: engine.predict_proba(frame))
+        store_score, store_probs = _timed(lambda: np.concatenate([engine.predict_proba(c) for c in store.iter_chunks()]))
+        np.testing.assert_array_equal(store_probs, csv_probs)
+
+        print(f"{args.rows:,} rows: CSV {os.path.getsize(csv_path) / 2**20:.1f} MiB, "
+              f"store {os.path.getsize(store_path) / 2**20:.1f} MiB, one-off conversion {convert_seconds:.2f}s")
+        print(f"{'step':>8} {'read_csv s':>11} {'store s':>9} {'speedup':>9}")
+        for step, a, b in (("load", csv_load, store_load), ("scan", csv_scan, store_scan),
+                           ("score", csv_score, store_score),
+                           ("total", csv_load + csv_scan + csv_score, store_load + store_scan + store_score)):
+            print(f"{step:>8} {a:>11.4f} {b:>9.4f} {a / b:>8.1f}x")
+        del store, frame
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Fused predictor per-row latency microbenchmark.
+
+Times the button-handler path (scaler.transform -> model.predict ->
+model.predict_proba) against FusedPredictor.predict for a single 1x26 row.
+Equivalence of the two paths is covered by tests/test_fused.py.
+
+    python -m benchmarks.bench_fused
+"""
+
+import warnings
+
+import numpy as np
+
+from benchmarks._timing import format_row, time_call
+from ml_core import N_FEATURES, InferenceEngine
+
+
+def main():
+    engine = InferenceEngine.from_directory()
+    row = np.array([[5] * N_FEATURES])
+
+    def sklearn_path():
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            scaled = engine.scaler.transform(row)
+        engine.label_encoder.inverse_transform(engine.model.predict(scaled))
+        engine.model.predict_proba(scaled)
+
+    def fused_path():
+        idx, _ = engine.fused.predict(row)
+        engine.classes[idx]
+
+    baseline = time_call(sklearn_path, number=200)
+    fused = time_call(fused_path, number=2000)
+    print(format_row("sklearn transform+predict+proba", baseline))
+    print(format_row("fused matmul+softmax", fused))
+    print(f"speedup (median): {baseline['median_us'] / fused['median_us']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Session history memory footprint benchmark.
+
+Measures (with tracemalloc) the heap cost of recording N predictions in the
+PredictionHistory ring buffer versus the naive alternative of appending one
+dict per run to a list, checks that ring-buffer eviction keeps the newest
+`capacity` runs in order, and times a single append.
+
+    python -m benchmarks.bench_history
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks._timing import format_row, time_call
+from history import DEFAULT_CAPACITY, PredictionHistory
+from ml_core import N_FEATURES, TRAIT_MAX, TRAIT_MIN, TRAIT_VECTORS
+
+N_CLASSES = 3
+CLASSES = ("Ambivert", "Extrovert", "Introvert")
+
+
+def _runs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    traits = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(n, N_FEATURES))
+    probs = rng.dirichlet(np.ones(N_CLASSES), size=n)
+    return traits, probs
+
+
+def check_eviction(capacity=64, n=200):
+    history = PredictionHistory(N_CLASSES, capacity)
+    traits, probs = _runs(n)
+    for i in range(n):
+        history.append(traits[i], probs[i], timestamp_ns=i)
+    kept_traits, kept_probs, kept_ts = history.ordered()
+    assert len(history) == capacity
+    np.testing.assert_array_equal(kept_ts, np.arange(n - capacity, n))
+    np.testing.assert_array_equal(kept_traits, traits[n - capacity:])
+    np.testing.assert_allclose(kept_probs, probs[n - capacity:], rtol=1e-6)
+
+
+def _measure(build):
+    tracemalloc.start()
+    obj = build()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def ring_buffer_bytes(n, capacity=DEFAULT_CAPACITY):
+    traits, probs = _runs(n)
+
+    def build():
+        history = PredictionHistory(N_CLASSES, capacity)
+        for i in range(n):
+            history.append(traits[i], probs[i])
+        return history
+
+    return _measure(build)
+
+
+def list_of_dicts_bytes(n):
+    traits, probs = _runs(n)
+    traits, probs = traits.tolist(), probs.tolist()
+
+    def build():
+        rows = []
+        for i in range(n):
+            row = {"timestamp": time.time_ns(), "probabilities": list(probs[i])}
+            row.update(zip(TRAIT_VECTORS, traits[i]))
+            rows.append(row)
+        return rows
+
+    return _measure(build)
+
+
+def main():
+    check_eviction()
+    print("ring-buffer eviction order: ok")
+
+    print(f"{'runs':>8} {'ring buffer':>14} {'list of dicts':>15}")
+    for n in (10, 100, 1000):
+        ring, naive = ring_buffer_bytes(n), list_of_dicts_bytes(n)
+        print(f"{n:>8} {ring / 1024:>11.1f} KiB {naive / 1024:>12.1f} KiB")
+    print(f"bytes per run (columnar): {N_FEATURES + 4 * N_CLASSES + 8}")
+
+    history = PredictionHistory(N_CLASSES)
+    traits, probs = _runs(1)
+    print(format_row("append one run", time_call(lambda: history.append(traits[0], probs[0]), number=10000)))
+    print(format_row(
+        f"export frame ({DEFAULT_CAPACITY} runs)",
+        time_call(lambda: list(history.iter_frames(CLASSES)), number=20),
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Incremental slider-delta scoring benchmark.
+
+Times a single-trait IncrementalScorer update against a full 26-feature
+rescore (table lookups and fused matmul), and checks that the running logits
+stay within floating-point noise of a fresh recompute over a long random walk
+of slider moves, and that trait indices or values off the table's grid are
+rejected.
+
+    python -m benchmarks.bench_incremental
+"""
+
+import numpy as np
+
+from benchmarks._timing import format_row, time_call
+from ml_core import N_FEATURES, TRAIT_MAX, TRAIT_MIN, IncrementalScorer, InferenceEngine
+
+WALK_STEPS = 200_000
+
+
+def check_drift(engine, steps=WALK_STEPS, seed=0):
+    """Random walk without periodic recompute; returns the final drift vs a full rescore."""
+    rng = np.random.default_rng(seed)
+    scorer = IncrementalScorer(engine.table, np.full(N_FEATURES, 5), recompute_every=steps + 1)
+    indices = rng.integers(0, N_FEATURES, steps)
+    values = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, steps)
+    for i, v in zip(indices, values):
+        scorer.update(i, v)
+    expected = engine.fused.logits(scorer.features[None, :])[0]
+    drift = scorer.recompute()
+    np.testing.assert_allclose(scorer.logits, expected, rtol=0, atol=1e-12)
+    assert drift < 1e-9, drift
+    return drift
+
+
+def check_rejects_off_grid(engine):
+    """Indices and values outside the table's grid raise ValueError and leave the state untouched."""
+    scorer = IncrementalScorer(engine.table, np.full(N_FEATURES, 5))
+    logits = scorer.logits.copy()
+    for index, value in ((N_FEATURES, 5), (-1, 5), (0, TRAIT_MAX + 1), (0, TRAIT_MIN - 1), (0, 4.5), (0, float("nan"))):
+        try:
+            scorer.update(index, value)
+        except ValueError:
+            continue
+        raise AssertionError(f"update({index}, {value}) was accepted")
+    np.testing.assert_array_equal(scorer.logits, logits)
+    assert scorer.updates == 0
+
+
+def main():
+    engine = InferenceEngine.from_directory(precompute_table=True)
+    drift = check_drift(engine)
+    print(f"drift after {WALK_STEPS:,} un-recomputed updates: {drift:.2e}")
+    check_rejects_off_grid(engine)
+    print("off-grid trait indices and values rejected: ok")
+
+    rng = np.random.default_rng(1)
+    scorer = IncrementalScorer(engine.table, np.full(N_FEATURES, 5))
+    moves = [(int(i), int(v)) for i, v in zip(rng.integers(0, N_FEATURES, 4096), rng.integers(TRAIT_MIN, TRAIT_MAX + 1, 4096))]
+    cursor = [0]
+
+    def update_only():
+        i, v = moves[cursor[0] & 4095]
+        cursor[0] += 1
+        scorer.update(i, v)
+
+    def incremental():
+        update_only()
+        scorer.predict()
+
+    row = np.full((1, N_FEATURES), 5)
+    print(format_row("incremental update (logits only)", time_call(update_only, number=5000)))
+    print(format_row("incremental update + predict", time_call(incremental, number=5000)))
+    print(format_row("full rescore: table lookups", time_call(lambda: engine.table.predict(row[0]), number=5000)))
+    print(format_row("full rescore: fused matmul", time_call(lambda: engine.fused.predict(row), number=5000)))
+    print(format_row("full rescore: sklearn path", time_call(lambda: engine.sklearn_predict_proba(row), number=500)))
+
+
+if __name__ == "__main__":
+    main()
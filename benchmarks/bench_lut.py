@@ -0,0 +1,51 @@
+"""
+Contribution lookup table benchmark.
+
+Times the sklearn path, the fused matmul and the table lookups for one row
+and for a large batch. Exactness of the table against sklearn is covered by
+tests/test_lut.py.
+
+    python -m benchmarks.bench_lut
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks._timing import format_row, time_call
+from ml_core import N_FEATURES, TRAIT_MAX, TRAIT_MIN, InferenceEngine
+
+BATCH_ROWS = 1_000_000
+
+
+def _time_batch(fn, features, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(features)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    engine = InferenceEngine.from_directory(precompute_table=True)
+    row = np.full(N_FEATURES, 5, dtype=np.uint8)
+    row_2d = row[None, :]
+    print("single row")
+    print(format_row("sklearn scaler + predict_proba", time_call(lambda: engine.sklearn_predict_proba(row_2d), number=200)))
+    print(format_row("fused matmul + softmax", time_call(lambda: engine.fused.predict(row_2d), number=2000)))
+    print(format_row("table lookups + softmax", time_call(lambda: engine.table.predict(row), number=2000)))
+
+    features = np.random.default_rng(2).integers(TRAIT_MIN, TRAIT_MAX + 1, size=(BATCH_ROWS, N_FEATURES), dtype=np.uint8)
+    print(f"\nbatch of {BATCH_ROWS:,} uint8 rows")
+    for name, fn in (
+        ("sklearn scaler + predict_proba", engine.sklearn_predict_proba),
+        ("fused matmul + softmax", engine.fused.predict),
+        ("table lookups + softmax", engine.table.predict),
+    ):
+        seconds = _time_batch(fn, features)
+        print(f"{name:<36} {seconds:>8.3f} s   {BATCH_ROWS / seconds:>14,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Metrics instrumentation overhead benchmark.
+
+Times the hot-path recording calls the dashboard makes per prediction
+against the rest of that path, and the cost of rendering a scrape. The
+endpoint itself is covered by tests/test_instrumentation.py.
+
+    python -m benchmarks.bench_metrics
+"""
+
+import numpy as np
+
+from benchmarks._timing import format_row, time_call
+from instrumentation import DashboardMetrics, parse_exposition
+from ml_core import N_FEATURES, InferenceEngine
+from telemetry import STAGES, LatencyWindow, StageTimer
+
+
+def main():
+    metrics = DashboardMetrics()
+    window = LatencyWindow()
+    timer = StageTimer()
+    timer.durations_ns = {stage: 1_000 * (i + 1) for i, stage in enumerate(STAGES)}
+    engine = InferenceEngine.from_directory()
+    features = np.full((1, N_FEATURES), 5.0)
+
+    rows = [
+        ("fused predict (1 row)", time_call(lambda: engine.fused.predict_proba(features), number=2000)),
+        ("LatencyWindow.record", time_call(lambda: window.record(timer), number=2000)),
+        ("DashboardMetrics.observe_prediction", time_call(lambda: metrics.observe_prediction(timer, False),
+                                                          number=2000)),
+        ("Counter child inc", time_call(metrics.predictions.labels("model").inc, number=20000)),
+        ("Histogram child observe", time_call(lambda: metrics.stage_seconds.labels("total").observe(1e-4),
+                                              number=20000)),
+    ]
+    for name, stats in rows:
+        print(format_row(name, stats))
+    for chart in ("radar", "gauge", "probability_bar"):
+        metrics.observe_chart_build(chart, 0.02)
+    metrics.observe_rerun("app", timer)
+    render = time_call(metrics.registry.render, number=200)
+    print(format_row(f"render ({len(parse_exposition(metrics.registry.render()))} samples)", render))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Process-pool scaling benchmark.
+
+Scores the same synthetic in-memory matrix in-process and through
+ScoringPool at increasing worker counts, checks that every pool result is
+identical to InferenceEngine.score, and reports rows/sec and speedup over
+the in-process path. Pool start-up (process creation plus each worker
+loading the artifacts, forced by a warm-up call) is timed separately and
+excluded from the throughput numbers.
+
+    python -m benchmarks.bench_pool
+    python -m benchmarks.bench_pool --rows 4000000 --chunk-size 100000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from ml_core import N_FEATURES, TRAIT_MAX, TRAIT_MIN, InferenceEngine
+from scoring_pool import ScoringPool
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Measure ScoringPool speedup across worker counts.")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows per worker task")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, cpus}))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    features = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(args.rows, N_FEATURES)).astype(np.float64)
+    engine = InferenceEngine.from_directory()
+    base_seconds, (labels, probs, confidence) = _best_of(lambda: engine.score(features), args.repeat)
+
+    print(f"{args.rows:,} rows, chunk size {args.chunk_size:,}, {cpus} CPU(s) available")
+    print(f"{'mode':>14} {'startup s':>10} {'best s':>8} {'rows/sec':>12} {'speedup':>8}")
+    print(f"{'in-process':>14} {'-':>10} {base_seconds:>8.3f} {args.rows / base_seconds:>12,.0f} {1.0:>7.2f}x")
+    for workers in args.workers:
+        start = time.perf_counter()
+        with ScoringPool(workers, args.chunk_size) as pool:
+            pool.score_array(features[:workers * args.chunk_size])
+            startup = time.perf_counter() - start
+            seconds, (pool_labels, pool_probs, pool_confidence) = _best_of(lambda: pool.score_array(features), args.repeat)
+        np.testing.assert_array_equal(pool_labels, labels)
+        np.testing.assert_array_equal(pool_probs, probs)
+        np.testing.assert_array_equal(pool_confidence, confidence)
+        print(f"{f'{workers} workers':>14} {startup:>10.2f} {seconds:>8.3f} {args.rows / seconds:>12,.0f} "
+              f"{base_seconds / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Prediction memo cache benchmark.
+
+Checks packing round-trips, LRU eviction under the entry and memory caps,
+TTL expiry and fingerprint invalidation, then times a cache hit (pack +
+lookup) against scoring the same row with the fused predictor, and reports
+the hit rate for a stream of slider profiles drawn around the default state.
+
+    python -m benchmarks.bench_prediction_cache
+"""
+
+import numpy as np
+
+from benchmarks._timing import format_row, time_call
+from ml_core import N_FEATURES, TRAIT_MAX, TRAIT_MIN, InferenceEngine
+from prediction_cache import PredictionCache, pack_traits, unpack_traits
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def check_cache(engine, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(500, N_FEATURES))
+    keys = [pack_traits(r) for r in rows]
+    assert all(len(k) == 13 for k in keys)
+    for row, key in zip(rows, keys):
+        np.testing.assert_array_equal(unpack_traits(key), row)
+    assert pack_traits(np.full(N_FEATURES, 5.5)) is None
+    assert pack_traits(np.full(N_FEATURES, 11)) is None
+    assert pack_traits(np.full(N_FEATURES, 5.0)) == pack_traits(np.full(N_FEATURES, 5))
+
+    # Cached values are exactly what the engine produced
+    cache = PredictionCache()
+    idx, probs = engine.fused.predict(rows[:1])
+    cache.put(keys[0], engine.fingerprint, idx[0], probs[0])
+    hit = cache.get(keys[0], engine.fingerprint)
+    assert hit[0] == idx[0] and np.array_equal(hit[1], probs[0])
+
+    # Entry cap: least recently used goes first
+    cache = PredictionCache(max_entries=3)
+    for key in keys[:3]:
+        cache.put(key, "a", 0, probs[0])
+    cache.get(keys[0], "a")
+    cache.put(keys[3], "a", 0, probs[0])
+    assert cache.get(keys[1], "a") is None and cache.get(keys[0], "a") is not None
+    assert cache.stats()["evictions"] == 1
+
+    # Memory cap
+    cache = PredictionCache(max_bytes=10_000)
+    for key in keys:
+        cache.put(key, "a", 0, probs[0])
+    stats = cache.stats()
+    assert stats["bytes"] <= 10_000 and stats["entries"] < len(keys)
+
+    # TTL
+    clock = _FakeClock()
+    cache = PredictionCache(ttl_seconds=10, clock=clock)
+    cache.put(keys[0], "a", 0, probs[0])
+    clock.now = 9.9
+    assert cache.get(keys[0], "a") is not None
+    clock.now = 10.0
+    assert cache.get(keys[0], "a") is None and cache.stats()["expirations"] == 1
+
+    # A different model fingerprint flushes everything
+    cache = PredictionCache()
+    cache.put(keys[0], "a", 0, probs[0])
+    assert cache.get(keys[0], "b") is None
+    stats = cache.stats()
+    assert stats["invalidations"] == 1 and stats["entries"] == 0 and stats["fingerprint"] == "b"
+
+
+def simulated_hit_rate(engine, n_requests=20_000, spread=1, seed=1):
+    """Profiles that move a few sliders by up to `spread` away from the all-5 default."""
+    rng = np.random.default_rng(seed)
+    cache = PredictionCache()
+    for _ in range(n_requests):
+        row = np.full(N_FEATURES, 5)
+        moved = rng.integers(0, N_FEATURES, rng.integers(0, 3))
+        row[moved] = np.clip(5 + rng.integers(-spread, spread + 1, moved.size), TRAIT_MIN, TRAIT_MAX)
+        key = pack_traits(row)
+        if cache.get(key, engine.fingerprint) is None:
+            idx, probs = engine.fused.predict(row[None, :])
+            cache.put(key, engine.fingerprint, idx[0], probs[0])
+    return cache.stats()
+
+
+def main():
+    engine = InferenceEngine.from_directory()
+    check_cache(engine)
+    print("packing, eviction, TTL and invalidation checks: ok")
+
+    stats = simulated_hit_rate(engine)
+    print(f"hit rate over {stats['hits'] + stats['misses']:,} near-default profiles: {stats['hit_rate'] * 100:.1f}% "
+          f"({stats['entries']:,} entries, {stats['bytes'] / 1024:.1f} KiB)")
+
+    row = np.full((1, N_FEATURES), 5)
+    cache = PredictionCache()
+    idx, probs = engine.fused.predict(row)
+    cache.put(pack_traits(row[0]), engine.fingerprint, idx[0], probs[0])
+    print(format_row("pack_traits", time_call(lambda: pack_traits(row[0]), number=5000)))
+    print(format_row("cache hit (pack + get)", time_call(lambda: cache.get(pack_traits(row[0]), engine.fingerprint), number=5000)))
+    print(format_row("fused predict (miss path)", time_call(lambda: engine.fused.predict(row), number=5000)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Feature schema / column permutation benchmark.
+
+Fits a model on the 26 columns in a shuffled order, saves it with its
+feature_schema.json and checks that
+
+    - InferenceEngine.from_directory and the exported bundle score
+      TRAIT_VECTORS-ordered input identically to sklearn on the shuffled
+      frame (the permutation is folded into the weights at load)
+    - a schema disagreeing with the scaler's recorded column order, or with
+      the declared trait range, raises SchemaError at load
+    - input rows with a missing, non-numeric or out-of-range value are
+      rejected by iter_feature_chunks with their row number
+
+and times reordering a CSV chunk whose header is shuffled: per-chunk
+reindexing by column name vs the positional gather batch_scoring compiles
+once per file, next to the per-chunk value check.
+
+    python -m benchmarks.bench_schema
+    python -m benchmarks.bench_schema --rows 1000000
+"""
+
+import argparse
+import io
+import json
+import os
+import pickle
+import tempfile
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from batch_scoring import iter_feature_chunks, validate_chunk
+from benchmarks._timing import format_row, time_call
+from ml_core import (
+    ENCODER_FILE,
+    FEATURE_SCHEMA_FILE,
+    MODEL_FILE,
+    N_FEATURES,
+    SCALER_FILE,
+    TRAINING_COLUMNS,
+    TRAIT_MAX,
+    TRAIT_MIN,
+    InferenceEngine,
+    SchemaError,
+    write_feature_schema,
+)
+from model_bundle import export_bundle, load_bundle
+
+
+def write_permuted_artifacts(directory, features, labels, order):
+    """Trains scaler + LogisticRegression on the columns in `order` and saves them with their schema."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+    columns = [TRAINING_COLUMNS[i] for i in order]
+    frame = pd.DataFrame(features[:, order], columns=columns)
+    scaler = StandardScaler().fit(frame)
+    label_encoder = LabelEncoder().fit(labels)
+    model = LogisticRegression(max_iter=2000).fit(scaler.transform(frame), label_encoder.transform(labels))
+    for name, obj in ((MODEL_FILE, model), (SCALER_FILE, scaler), (ENCODER_FILE, label_encoder)):
+        with open(os.path.join(directory, name), "wb") as f:
+            pickle.dump(obj, f)
+    write_feature_schema(directory, columns)
+    return model.predict_proba(scaler.transform(frame))
+
+
+def expect_schema_error(fn):
+    try:
+        fn()
+    except SchemaError as e:
+        return str(e)
+    raise AssertionError("schema mismatch was not detected")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check schema validation and time column reordering.")
+    parser.add_argument("--rows", type=int, default=250_000, help="rows in the timed CSV chunk")
+    args = parser.parse_args(argv)
+    warnings.simplefilter("ignore")
+
+    rng = np.random.default_rng(0)
+    deployed = InferenceEngine.from_directory()
+    features = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(5000, N_FEATURES))
+    labels = deployed.classes[deployed.predict_proba(features).argmax(axis=1)]
+    order = rng.permutation(N_FEATURES)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = write_permuted_artifacts(tmp, features, labels, order)
+        engine = InferenceEngine.from_directory(tmp)
+        np.testing.assert_array_equal(engine.permutation, order)
+        np.testing.assert_allclose(engine.predict_proba(features), reference, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(engine.sklearn_predict_proba(features), reference, rtol=1e-9, atol=1e-12)
+        bundle_path = os.path.join(tmp, "permuted.pipb")
+        export_bundle(tmp, bundle_path)
+        np.testing.assert_allclose(load_bundle(bundle_path).engine().predict_proba(features), reference,
+                                   rtol=1e-9, atol=1e-12)
+        print("shuffled-order artifacts: engine, sklearn reference and bundle agree: ok")
+
+        write_feature_schema(tmp, TRAINING_COLUMNS)
+        print("order mismatch ->", expect_schema_error(lambda: InferenceEngine.from_directory(tmp)))
+        expect_schema_error(lambda: export_bundle(tmp, bundle_path))
+        schema_path = os.path.join(tmp, FEATURE_SCHEMA_FILE)
+        schema = write_feature_schema(tmp, [TRAINING_COLUMNS[i] for i in order])
+        schema["features"][0]["max"] = 5
+        with open(schema_path, "w", encoding="utf-8") as f:
+            json.dump(schema, f)
+        print("range mismatch ->", expect_schema_error(lambda: InferenceEngine.from_directory(tmp)))
+
+    shuffled = [TRAINING_COLUMNS[i] for i in order]
+    text = io.StringIO()
+    pd.DataFrame(rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(args.rows, N_FEATURES)), columns=shuffled).to_csv(
+        text, index=False
+    )
+    text.seek(0)
+    chunk = pd.read_csv(text)
+    gather = np.array([shuffled.index(c) for c in TRAINING_COLUMNS], dtype=np.intp)
+    text.seek(0)
+    np.testing.assert_array_equal(np.concatenate(list(iter_feature_chunks(text, args.rows // 4, name="chunk.csv"))),
+                                  chunk[TRAINING_COLUMNS].to_numpy())
+    for bad in ("n/a", "", "abc", "11", "-1", "inf"):
+        lines = text.getvalue().splitlines()
+        cells = lines[3].split(",")
+        cells[shuffled.index(TRAINING_COLUMNS[4])] = bad
+        lines[3] = ",".join(cells)
+        try:
+            list(iter_feature_chunks(io.StringIO("\n".join(lines)), args.rows // 4, name="chunk.csv"))
+        except ValueError as e:
+            assert str(e).startswith("row 3:"), e
+            print(f"value {bad!r:>6} -> ValueError: {e}")
+        else:
+            raise AssertionError(f"value {bad!r} was not rejected")
+
+    by_name = time_call(lambda: chunk[TRAINING_COLUMNS].to_numpy(), number=5, repeat=5)
+    by_index = time_call(lambda: chunk.to_numpy().T[gather].T, number=5, repeat=5)
+    gathered = chunk.to_numpy().T[gather].T
+    check = time_call(lambda: validate_chunk(gathered), number=5, repeat=5)
+    print(f"reordering a {args.rows:,}-row chunk with a shuffled header:")
+    print(format_row("reindex by column name", by_name))
+    print(format_row("precompiled positional gather", by_index))
+    print(format_row("value check (validate_chunk)", check))
+    print(f"speedup (median): {by_name['median_us'] / by_index['median_us']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+ANOVA feature screening benchmark.
+
+Times the notebook's screening loop (a groupby("personality_type") and an
+f_oneway call per column, rebuilding the result DataFrame on every
+iteration) against screening.StreamingAnova over the same in-memory frame,
+both in one update and in chunks. F statistics and p-values are asserted
+equal to f_oneway's.
+
+    python -m benchmarks.bench_screening
+    python -m benchmarks.bench_screening --rows 5000000 --chunk-size 500000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ml_core import TRAINING_COLUMNS, TRAIT_MAX, TRAIT_MIN, InferenceEngine
+from screening import StreamingAnova
+
+# Columns the notebook drops before training; screened along with the 26 traits
+EXTRA_COLUMNS = ["emotional_stability", "stress_handling", "creativity"]
+
+
+def notebook_screening(df):
+    """The notebook cell, verbatim apart from the names."""
+    from scipy.stats import f_oneway
+
+    annove_result = {}
+    for col in df.columns:
+        if col == "personality_type":
+            continue
+        groups = [group[col].values for name, group in df.groupby("personality_type")]
+        f_stats, p_value = f_oneway(*groups)
+        annove_result[col] = {"f_statistics": f_stats, "P_Value": p_value}
+        annove_df = pd.DataFrame(annove_result).T
+    return annove_df
+
+
+def streaming_screening(df, columns, chunk_size=None):
+    anova = StreamingAnova(columns)
+    features, labels = df[columns].to_numpy(), df["personality_type"].to_numpy()
+    step = chunk_size or len(df)
+    for start in range(0, len(df), step):
+        anova.update(features[start:start + step], labels[start:start + step])
+    return anova.statistics()
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the notebook ANOVA loop with StreamingAnova.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    engine = InferenceEngine.from_directory()
+    rng = np.random.default_rng(0)
+    columns = TRAINING_COLUMNS + EXTRA_COLUMNS
+    data = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(args.rows, len(columns)))
+    cumulative = engine.predict_proba(data[:, :len(TRAINING_COLUMNS)]).cumsum(axis=1)
+    df = pd.DataFrame(data, columns=columns)
+    df["personality_type"] = engine.classes[(cumulative > rng.random((args.rows, 1))).argmax(axis=1)]
+
+    loop_s, reference = _timed(lambda: notebook_screening(df))
+    once_s, (f_once, p_once) = _timed(lambda: streaming_screening(df, columns))
+    chunked_s, (f_chunked, p_chunked) = _timed(lambda: streaming_screening(df, columns, args.chunk_size))
+
+    expected_f = reference.loc[columns, "f_statistics"].to_numpy(dtype=np.float64)
+    expected_p = reference.loc[columns, "P_Value"].to_numpy(dtype=np.float64)
+    for f_statistic, p_value in ((f_once, p_once), (f_chunked, p_chunked)):
+        np.testing.assert_allclose(f_statistic, expected_f, rtol=1e-9)
+        np.testing.assert_allclose(p_value, expected_p, rtol=1e-6, atol=1e-300)
+    print(f"F / p equal to scipy.stats.f_oneway for all {len(columns)} features: ok")
+
+    print(f"{args.rows:,} rows x {len(columns)} features")
+    print(f"{'method':<38} {'seconds':>9} {'speedup':>9}")
+    for name, seconds in (("notebook loop (groupby + f_oneway)", loop_s),
+                          ("StreamingAnova, one update", once_s),
+                          (f"StreamingAnova, {args.chunk_size:,}-row chunks", chunked_s)):
+        print(f"{name:<38} {seconds:>9.3f} {loop_s / seconds:>8.1f}x")
+    dropped = [c for c, p in zip(columns, p_once) if not p < 0.05]
+    print(f"not significant at p < 0.05: {', '.join(dropped) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+In-memory vs out-of-core training benchmark.
+
+Writes synthetic labelled datasets of growing size (traits drawn uniformly,
+labels sampled from the deployed model's probabilities) and trains each one
+twice, every run in a fresh subprocess so that peak RSS is its own:
+
+    in-memory   train.train with a single lbfgs / l2 / C=1 candidate, 2 folds
+                and jobs=1, so the numbers reflect loading + fitting rather
+                than the size of the search grid
+    streaming   train.train_streaming (partial_fit scaler + SGD log loss)
+
+Reports wall time, peak RSS, RSS above the post-import baseline and held-out
+accuracy. The streaming artifacts are checked to load through InferenceEngine
+with fused probabilities equal to sklearn's predict_proba.
+
+    python -m benchmarks.bench_training
+    python -m benchmarks.bench_training --rows 100000 1000000 4000000 --chunk-size 100000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from ml_core import ARTIFACT_DIR, TRAINING_COLUMNS, TRAIT_MAX, TRAIT_MIN, InferenceEngine
+
+_CHILD = """
+import json, sys, warnings
+warnings.simplefilter("ignore")
+import sklearn.linear_model, sklearn.model_selection, sklearn.preprocessing
+import train
+baseline = train._peak_rss()
+data, output, mode, chunk_size = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])
+if mode == "streaming":
+    directory, metrics = train.train_streaming(data, output, chunk_size, version=mode)
+else:
+    single = [{{"model__solver": ["lbfgs"], "model__penalty": ["l2"], "model__C": [1.0]}}]
+    directory, metrics = train.train(data, output, chunk_size, cv=2, jobs=1, version=mode, search_space=single)
+print(json.dumps({{"directory": directory, "baseline_rss": baseline, "training": metrics["training"],
+                  "accuracy": metrics["holdout"]["accuracy"]}}))
+"""
+
+
+def write_dataset(path, rows, engine, seed=0, chunk_size=500_000):
+    """Synthetic CSV with the 26 training columns and a personality_type drawn from the model."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_size):
+        n = min(chunk_size, rows - start)
+        features = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(n, len(TRAINING_COLUMNS)))
+        cumulative = engine.predict_proba(features).cumsum(axis=1)
+        labels = engine.classes[(cumulative > rng.random((n, 1))).argmax(axis=1)]
+        frame = pd.DataFrame(features, columns=TRAINING_COLUMNS)
+        frame["personality_type"] = labels
+        frame.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def run_child(data, output, mode, chunk_size):
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(), data, output, mode, str(chunk_size)],
+        cwd=ARTIFACT_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def check_artifacts(directory, seed=1):
+    engine = InferenceEngine.from_directory(directory)
+    features = np.random.default_rng(seed).integers(TRAIT_MIN, TRAIT_MAX + 1, size=(2000, len(TRAINING_COLUMNS)))
+    np.testing.assert_allclose(engine.predict_proba(features), engine.sklearn_predict_proba(features),
+                               rtol=1e-10, atol=1e-15)
+    return engine.link
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare peak RSS and wall time of in-memory and streaming training.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 400_000, 1_600_000])
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    engine = InferenceEngine.from_directory()
+    print(f"{'rows':>10} {'mode':>10} {'wall s':>8} {'peak RSS MiB':>13} {'above base MiB':>15} {'accuracy':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            data = os.path.join(tmp, f"train_{rows}.csv")
+            write_dataset(data, rows, engine)
+            results = {}
+            for mode in ("in-memory", "streaming"):
+                result = run_child(data, os.path.join(tmp, str(rows)), mode, args.chunk_size)
+                results[mode] = result
+                peak = result["training"]["peak_rss_bytes"] / 2**20
+                above = peak - result["baseline_rss"] / 2**20
+                print(f"{rows:>10,} {mode:>10} {result['training']['seconds']:>8.2f} {peak:>13.0f} {above:>15.0f} "
+                      f"{result['accuracy']:>9.4f}")
+            link = check_artifacts(results["streaming"]["directory"])
+            assert link == "ovr", link
+            assert abs(results["streaming"]["accuracy"] - results["in-memory"]["accuracy"]) < 0.02
+            os.remove(data)
+    print("streaming artifacts load through InferenceEngine (one-vs-rest link, fused == sklearn): ok")
+
+
+if __name__ == "__main__":
+    main()
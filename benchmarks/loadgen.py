@@ -0,0 +1,138 @@
+"""
+Local load generator for serve.py.
+
+Opens `concurrency` keep-alive connections, each sending /predict requests
+back to back, and reports throughput and p50/p95/p99 latency for every
+concurrency level in the sweep.
+
+    python serve.py &
+    python -m benchmarks.loadgen --concurrency 1 4 16 64 --requests 2000
+
+    # or let the load generator start and stop the service itself
+    python -m benchmarks.loadgen --spawn
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from ml_core import N_FEATURES
+
+SERVE_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "serve.py")
+
+
+async def _client(host, port, bodies, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            request = (
+                f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, concurrency, total_requests, seed=0):
+    rng = np.random.default_rng(seed)
+    per_client = max(1, total_requests // concurrency)
+    latencies = []
+    clients = [
+        _client(
+            host, port,
+            [json.dumps({"features": rng.integers(0, 11, N_FEATURES).tolist()}).encode() for _ in range(per_client)],
+            latencies,
+        )
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - start
+    lat_ms = np.asarray(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(lat_ms, [50, 95, 99])
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+    }
+
+
+async def _wait_for_port(host, port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"service on {host}:{port} did not come up")
+
+
+async def sweep(host, port, levels, total_requests):
+    await _wait_for_port(host, port)
+    # Warm up the connection path and the batcher
+    await run_level(host, port, 1, 50)
+    print(f"{'conc':>6} {'requests':>9} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    results = []
+    for level in levels:
+        r = await run_level(host, port, level, total_requests)
+        results.append(r)
+        print(
+            f"{r['concurrency']:>6} {r['requests']:>9} {r['rps']:>10.0f} "
+            f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}"
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the local prediction service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+    parser.add_argument("--spawn", action="store_true", help="start serve.py for the duration of the run")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="batcher wait window when spawning")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [sys.executable, SERVE_SCRIPT, "--host", args.host, "--port", str(args.port),
+             "--max-wait-ms", str(args.max_wait_ms)],
+            stderr=subprocess.DEVNULL,
+        )
+    try:
+        asyncio.run(sweep(args.host, args.port, args.concurrency, args.requests))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+Headless rerun profiler for app.py.
+
+Drives the dashboard with Streamlit's testing API (AppTest) through a
+scripted session: first load, slider changes, a prediction and a visit to
+every view. Each step is one full script rerun and is measured three ways:
+
+    wall clock  the AppTest run() call, plus the app's own per-section
+                breakdown (rerun_timer laps: setup, css, state, sidebar, hero,
+                view:<name>, telemetry, footer)
+    sampling    a background thread samples the script thread's Python stack
+                every --interval seconds; module-level app.py frames are
+                labelled with the section their current line belongs to, so
+                "CSS injection" and "the input view" show up as separate
+                towers. Written as collapsed stacks (stacks.folded), one line
+                per unique stack, ready for flamegraph.pl or speedscope.
+    cProfile    (--cprofile) deterministic function timings of the script
+                thread, merged into profile.pstats (snakeviz, gprof2dot) and
+                summarized per step in the report. cProfile's own overhead
+                inflates the wall-clock figures, so it runs as a separate pass.
+
+report.json keeps the per-step wall times as "results" in the format of
+benchmarks.run, so two profiles can be compared with its --compare mode to
+catch slowdowns.
+
+    python -m benchmarks.profile_app --output-dir profile_out
+    python -m benchmarks.profile_app --repeat 5 --cprofile
+    flamegraph.pl profile_out/stacks.folded > rerun.svg
+    python -m benchmarks.run --compare old/report.json profile_out/report.json
+"""
+
+import argparse
+import ast
+import cProfile
+import io
+import json
+import os
+import pstats
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timezone
+
+from benchmarks.run import _git_commit, _summary, _versions
+from ml_core import ARTIFACT_DIR, TRAIT_VECTORS
+
+APP_PATH = os.path.join(ARTIFACT_DIR, "app.py")
+SCRIPT_THREAD = "ScriptRunner.scriptThread"
+VIEWS = ("analytics", "importance", "diagnostics", "export", "batch", "input")
+RUN_TIMEOUT = 120
+
+
+# =========================================================================================
+# 1. SCRIPTED SESSION
+# =========================================================================================
+def _set_traits(values):
+    def action(at):
+        for trait, value in values.items():
+            at.slider(key=f"s_{trait}").set_value(value)
+    return action
+
+
+def _click_predict(at):
+    next(b for b in at.button if "SYNTHESIZE" in b.label).click()
+
+
+def _switch_view(view):
+    def action(at):
+        at.radio(key="active_view").set_value(view)
+    return action
+
+
+def scenario():
+    """(step name, view after the step, action applied before the rerun) tuples."""
+    steps = [
+        ("initial", "input", None),
+        ("slider", "input", _set_traits({TRAIT_VECTORS[0]: 9})),
+        ("sliders_x5", "input", _set_traits({t: (i * 3) % 11 for i, t in enumerate(TRAIT_VECTORS[1:6])})),
+        ("predict", "input", _click_predict),
+    ]
+    steps += [(f"view:{view}", view, _switch_view(view)) for view in VIEWS]
+    return steps
+
+
+# =========================================================================================
+# 2. STACK SAMPLING
+# =========================================================================================
+def section_lines(path=APP_PATH):
+    """
+    (line numbers, section names) of app.py's top-level rerun_timer.lap calls.
+    Module-level code up to a lap belongs to that lap's section; a computed
+    name (the "view:" + active_view lap) is reported as "view".
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    lines, names = [], []
+    for node in tree.body:
+        call = node.value if isinstance(node, ast.Expr) else None
+        if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) and call.func.attr == "lap"
+                and isinstance(call.func.value, ast.Name) and call.func.value.id == "rerun_timer"):
+            try:
+                name = ast.literal_eval(call.args[0])
+            except ValueError:
+                name = "view"
+            lines.append(node.end_lineno)
+            names.append(name)
+    return lines, names
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the script thread's stack every interval seconds from a daemon
+    thread and counts collapsed stacks. The GIL switch interval is lowered
+    while sampling, otherwise the sampler could only observe the script
+    thread every 5 ms.
+    """
+
+    def __init__(self, interval=0.001, app_path=APP_PATH):
+        self.interval = interval
+        self.app_path = os.path.abspath(app_path)
+        self._lines, self._names = section_lines(app_path)
+        self._active_view = "input"
+        self._stop = threading.Event()
+        self._thread = None
+        self._switch_interval = None
+        self.stacks = Counter()
+
+    def _section(self, lineno):
+        index = bisect_left(self._lines, lineno)
+        name = self._names[min(index, len(self._names) - 1)]
+        return f"view:{self._active_view}" if name == "view" else name
+
+    def collapse(self, frame):
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+        for i, f in enumerate(frames):
+            if f.f_code.co_name == "<module>" and os.path.abspath(f.f_code.co_filename) == self.app_path:
+                labels = [f"app.py [{self._section(f.f_lineno)}]"] + [_frame_label(x.f_code) for x in frames[i + 1:]]
+                return ";".join(labels)
+        return ";".join(["[streamlit runtime]"] + [_frame_label(x.f_code) for x in frames])
+
+    def _run(self, prefix, stacks):
+        while not self._stop.is_set():
+            target = next((t.ident for t in threading.enumerate() if t.name == SCRIPT_THREAD), None)
+            frame = sys._current_frames().get(target) if target is not None else None
+            if frame is not None:
+                stacks[f"{prefix};{self.collapse(frame)}"] += 1
+            del frame
+            time.sleep(self.interval)
+
+    def start(self, prefix, active_view):
+        self._active_view = active_view
+        self._stop.clear()
+        self._step_stacks = Counter()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(max(self.interval / 2, 1e-5))
+        self._thread = threading.Thread(target=self._run, args=(prefix, self._step_stacks), name="stack-sampler",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops sampling and returns this step's sample count."""
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        self.stacks.update(self._step_stacks)
+        return sum(self._step_stacks.values())
+
+
+def _wait_for_script_thread(timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while any(t.name == SCRIPT_THREAD for t in threading.enumerate()) and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def _profile_script_thread(profiler):
+    """Enables profiler inside the next script thread (cProfile only sees the thread it was enabled in)."""
+    def bootstrap(frame, event, arg):
+        sys.setprofile(None)
+        if threading.current_thread().name == SCRIPT_THREAD:
+            profiler.enable()
+    threading.setprofile(bootstrap)
+
+
+def _top_functions(stats, limit):
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": f"{name} ({os.path.basename(filename)}:{line})", "ncalls": ncalls,
+                     "tottime": tottime, "cumtime": cumtime})
+    return sorted(rows, key=lambda r: r["cumtime"], reverse=True)[:limit]
+
+
+# =========================================================================================
+# 3. DRIVER
+# =========================================================================================
+def run_session(sampler=None, profilers=None, app_path=APP_PATH):
+    """
+    Runs the scenario once in a fresh AppTest session. Returns
+    {step: {"wall": seconds, "sections": {section: ms}, "samples": n}};
+    with profilers (a dict), one cProfile.Profile per step is stored in it.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=RUN_TIMEOUT)
+    measured = {}
+    for step, view, action in scenario():
+        if action is not None:
+            action(at)
+        if sampler is not None:
+            sampler.start(step, view)
+        if profilers is not None:
+            profilers[step] = cProfile.Profile()
+            _profile_script_thread(profilers[step])
+        start = time.perf_counter()
+        at.run()
+        wall = time.perf_counter() - start
+        _wait_for_script_thread()
+        if profilers is not None:
+            threading.setprofile(None)
+        samples = sampler.stop() if sampler is not None else 0
+        if at.exception:
+            raise RuntimeError(f"app raised during step '{step}': {at.exception[0].message}")
+        sections = dict(at.session_state["rerun_breakdown"]) if "rerun_breakdown" in at.session_state else {}
+        measured[step] = {"wall": wall, "sections": sections, "samples": samples}
+    return measured
+
+
+def profile(repeat=3, warmup=1, interval=0.001, use_cprofile=False, top=15, output_dir=None, progress=None):
+    """Runs warmup + repeat sampled sessions (and one cProfile session) and writes the outputs."""
+    warnings.simplefilter("ignore")
+    for _ in range(warmup):
+        run_session()
+    sampler = StackSampler(interval)
+    sessions = []
+    for i in range(repeat):
+        sessions.append(run_session(sampler))
+        if progress is not None:
+            progress(i + 1, sessions[-1])
+
+    steps = {}
+    results = {}
+    for step in sessions[0]:
+        walls = [s[step]["wall"] for s in sessions]
+        sections = {}
+        for name in sessions[0][step]["sections"]:
+            sections[name] = statistics.median(s[step]["sections"].get(name, 0.0) for s in sessions)
+        steps[step] = {"wall_ms": statistics.median(walls) * 1e3, "script_ms": sections.get("total"),
+                       "sections_ms": sections, "samples": sum(s[step]["samples"] for s in sessions)}
+        results[f"rerun.{step}"] = _summary("rerun", walls, 1)
+
+    merged = None
+    if use_cprofile:
+        profilers = {}
+        run_session(profilers=profilers)
+        for step, profiler in profilers.items():
+            stats = pstats.Stats(profiler, stream=io.StringIO())
+            steps[step]["top_functions"] = _top_functions(stats, top)
+            merged = stats if merged is None else merged.add(stats)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "versions": _versions(),
+        "settings": {"repeat": repeat, "warmup": warmup, "interval": interval, "cprofile": use_cprofile},
+        "results": results,
+        "steps": steps,
+    }
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, "report.json"), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        with open(os.path.join(output_dir, "stacks.folded"), "w", encoding="utf-8") as f:
+            for stack, count in sorted(sampler.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        if merged is not None:
+            merged.dump_stats(os.path.join(output_dir, "profile.pstats"))
+    return report, sampler.stacks
+
+
+def _print_report(report, stacks):
+    print(f"{'step':<18} {'wall ms':>9} {'script ms':>10}   top sections (ms)")
+    for step, info in report["steps"].items():
+        sections = {k: v for k, v in info["sections_ms"].items() if k != "total"}
+        top = sorted(sections.items(), key=lambda kv: kv[1], reverse=True)[:3]
+        script = info["script_ms"]
+        print(f"{step:<18} {info['wall_ms']:>9.1f} {script if script is not None else float('nan'):>10.1f}   "
+              + ", ".join(f"{k} {v:.1f}" for k, v in top))
+    by_section = Counter()
+    for stack, count in stacks.items():
+        by_section[stack.split(";")[1]] += count
+    total = sum(by_section.values())
+    if total:
+        print(f"\nsampled stacks by root ({total:,} samples):")
+        for root, count in by_section.most_common(10):
+            print(f"  {root:<40} {count / total:>6.1%}")
+    for step, info in report["steps"].items():
+        if "top_functions" in info:
+            print(f"\ncProfile, {step} (top 5 by cumulative time):")
+            for row in info["top_functions"][:5]:
+                print(f"  {row['cumtime'] * 1e3:>9.1f} ms  {row['ncalls']:>7}  {row['function']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile app.py reruns headlessly through Streamlit's AppTest.")
+    parser.add_argument("--output-dir", default="profile_out", help="where report.json / stacks.folded are written")
+    parser.add_argument("--repeat", type=int, default=3, help="sampled sessions (medians are reported)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed sessions first (imports, model load)")
+    parser.add_argument("--interval", type=float, default=0.001, help="stack sampling interval in seconds")
+    parser.add_argument("--cprofile", action="store_true", help="add a cProfile pass and write profile.pstats")
+    parser.add_argument("--top", type=int, default=15, help="functions kept per step in the cProfile summary")
+    args = parser.parse_args(argv)
+
+    # Keep profiling runs from writing audit segments into the repo or binding the metrics port
+    os.environ.setdefault("PIP_AUDIT_DIR", tempfile.mkdtemp(prefix="pip-profile-audit-"))
+    os.environ.setdefault("PIP_METRICS_PORT", "")
+
+    report, stacks = profile(args.repeat, args.warmup, args.interval, args.cprofile, args.top, args.output_dir,
+                             progress=lambda i, _: print(f"session {i}/{args.repeat} done", file=sys.stderr))
+    _print_report(report, stacks)
+    print(f"\nwrote {args.output_dir}/report.json, stacks.folded"
+          + (", profile.pstats" if args.cprofile else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Benchmark suite: startup, interactive, batch, figure and export paths in one run.
+
+Every case is timed in rounds (see _timing.sample_call) and the per-call
+seconds of each round are summarized as best / median / mean / stdev. The
+results are written as JSON along with the library versions, the git commit
+and the model fingerprint, so two runs can be compared later:
+
+    startup      load_artifacts / bundle engine in a fresh interpreter (cold)
+                 and again in-process with modules and page cache warm; these
+                 are what the dashboard's load_ml_infrastructure /
+                 load_inference_engine do on a cache miss
+    interactive  one row through the sklearn reference path
+                 (scaler.transform + predict_proba) and the fused predictor
+    batch        InferenceEngine.predict_proba over 1k / 100k / 10M rows
+                 (10M as ten passes over one 1M-row uint8 block, so memory
+                 stays bounded), plus the sklearn path up to 100k rows
+    figures      every Plotly builder behind the analytics, importance and
+                 diagnostics views, uncached
+    export       the export view's JSON payload and profile record in each
+                 available format, and a full 1,000-run history export
+
+Comparing flags a case as a regression when both its median and its best
+round are more than --threshold slower than in the baseline (so one noisy
+round does not trip it) and exits with status 1 if any case regressed.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --quick --only batch figures --output quick.json
+    python -m benchmarks.run --compare baseline.json bench.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks._timing import sample_call
+from ml_core import ARTIFACT_DIR, DOMAINS, N_FEATURES, TRAIT_MAX, TRAIT_MIN, TRAIT_VECTORS, InferenceEngine
+
+GROUPS = ("startup", "interactive", "batch", "figures", "export")
+DEFAULT_BATCH_ROWS = (1_000, 100_000, 10_000_000)
+DEFAULT_THRESHOLD = 0.10
+SKLEARN_BATCH_LIMIT = 100_000
+BATCH_BLOCK_ROWS = 1_000_000
+
+_COLD_CHILD = """
+import json, time, warnings
+warnings.simplefilter("ignore")
+start = time.perf_counter()
+{body}
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+_COLD_BODIES = {
+    "pickle": "import ml_core\nml_core.load_artifacts()",
+    "bundle": "import model_bundle\nwith model_bundle.load_bundle() as bundle:\n    bundle.engine(precompute_table=True)",
+}
+
+
+def _summary(group, rounds, number, rows=None):
+    result = {
+        "group": group,
+        "unit": "s",
+        "rounds": len(rounds),
+        "number": number,
+        "best": min(rounds),
+        "median": statistics.median(rounds),
+        "mean": statistics.fmean(rounds),
+        "stdev": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+    }
+    if rows is not None:
+        result["rows"] = rows
+        result["rows_per_s"] = rows / result["median"]
+    return result
+
+
+def _cold_start(body):
+    out = subprocess.run([sys.executable, "-c", _COLD_CHILD.format(body=body)], cwd=ARTIFACT_DIR,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])["seconds"]
+
+
+# =========================================================================================
+# 1. CASES
+# =========================================================================================
+def startup_cases(scale):
+    from ml_core import load_artifacts
+    from model_bundle import load_bundle
+
+    for name, body in _COLD_BODIES.items():
+        rounds = [_cold_start(body) for _ in range(scale["cold_runs"])]
+        yield f"startup.cold_{name}", _summary("startup", rounds, 1)
+    load_artifacts()
+    yield "startup.warm_pickle", _summary("startup", sample_call(load_artifacts, 3, scale["repeat"]), 3)
+
+    def load():
+        with load_bundle() as bundle:
+            return bundle.engine(precompute_table=True)
+
+    yield "startup.warm_bundle", _summary("startup", sample_call(load, 10, scale["repeat"]), 10)
+
+
+def interactive_cases(engine, scale):
+    row = np.full((1, N_FEATURES), 5.0)
+    yield "interactive.sklearn_single_row", _summary(
+        "interactive", sample_call(lambda: engine.sklearn_predict_proba(row), 200, scale["repeat"]), 200)
+    yield "interactive.fused_single_row", _summary(
+        "interactive", sample_call(lambda: engine.fused.predict_proba(row), 2000, scale["repeat"]), 2000)
+
+
+def batch_cases(engine, scale):
+    rng = np.random.default_rng(0)
+    block = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(min(max(scale["batch_rows"]), BATCH_BLOCK_ROWS), N_FEATURES),
+                         dtype=np.uint8)
+    for rows in scale["batch_rows"]:
+        def score(rows=rows):
+            for start in range(0, rows, len(block)):
+                engine.predict_proba(block[:min(len(block), rows - start)])
+
+        number = max(1, 100_000 // rows)
+        repeat = scale["repeat"] if rows <= BATCH_BLOCK_ROWS else scale["large_repeat"]
+        yield f"batch.fused_{rows}", _summary("batch", sample_call(score, number, repeat), number, rows)
+        if rows <= SKLEARN_BATCH_LIMIT:
+            features = block[:rows].astype(np.float64)
+            rounds = sample_call(lambda: engine.sklearn_predict_proba(features), number, scale["repeat"])
+            yield f"batch.sklearn_{rows}", _summary("batch", rounds, number, rows)
+
+
+def figure_cases(engine, scale):
+    import figures
+    from correlation import StreamingCorrelation
+    from history import PredictionHistory
+
+    rng = np.random.default_rng(1)
+    features = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=N_FEATURES)
+    probs = engine.predict_proba(features[None])[0]
+    domains = [float(features[span].mean()) for span in DOMAINS.values()]
+    history = PredictionHistory(len(engine.classes))
+    runs = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(50, N_FEATURES))
+    for run, p in zip(runs, engine.predict_proba(runs)):
+        history.append(run, p)
+    hist_traits, hist_probs, _ = history.ordered()
+    class_index = int(np.argmax(probs))
+    top_idx, top_vals = engine.top_coefficients(class_index, k=15)
+    local_idx, local_vals = engine.top_contributions(features, class_index, k=15)
+    correlation = StreamingCorrelation()
+    correlation.update_batch(rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(10_000, N_FEATURES)))
+    corr = correlation.correlation()
+
+    builders = {
+        "analytics_radar": lambda: figures.build_radar(domains),
+        "analytics_probability_bar": lambda: figures.build_probability_bar(engine.classes, probs),
+        "analytics_gauges": lambda: [figures.build_gauge(v, name, "#8b5cf6") for v, name in zip(domains, DOMAINS)],
+        "analytics_history_trajectory": lambda: figures.build_history_trajectory(history.run_numbers(), hist_probs,
+                                                                                 engine.classes),
+        "analytics_trait_delta": lambda: figures.build_trait_delta(TRAIT_VECTORS, hist_traits[-1], hist_traits[-2]),
+        "importance_coefficient_bar": lambda: figures.build_coefficient_bar(
+            [TRAIT_VECTORS[i] for i in top_idx[::-1]], top_vals[::-1].tolist()),
+        "importance_contribution_bar": lambda: figures.build_contribution_bar(
+            [TRAIT_VECTORS[i] for i in local_idx[::-1]], local_vals[::-1].tolist()),
+        "diagnostics_correlation_heatmap": lambda: figures.build_correlation_heatmap(corr, TRAIT_VECTORS),
+    }
+    for name, build in builders.items():
+        build()  # first call pays the plotly import
+        yield f"figures.{name}", _summary("figures", sample_call(build, scale["figure_number"], scale["repeat"]),
+                                          scale["figure_number"])
+
+
+def export_cases(engine, scale):
+    import pandas as pd
+
+    import exporters
+    from history import DEFAULT_CAPACITY, PredictionHistory
+
+    rng = np.random.default_rng(2)
+    features = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=N_FEATURES)
+    probs = engine.predict_proba(features[None])[0]
+    prediction, confidence = str(engine.classes[probs.argmax()]), round(float(probs.max()) * 100, 2)
+    payload = {
+        "metadata": {"session_id": "BENCH001", "timestamp": "2026-01-01 00:00:00 UTC",
+                     "model_architecture": "LogisticRegression_OvR", "confidence_score": confidence},
+        "classification": prediction,
+        "cognitive_vectors": {t: int(v) for t, v in zip(TRAIT_VECTORS, features)},
+    }
+    record = {"session_id": "BENCH001", "timestamp": payload["metadata"]["timestamp"], "prediction": prediction,
+              "confidence": confidence}
+    record.update({f"prob_{c}": float(p) for c, p in zip(engine.classes, probs)})
+    record.update(payload["cognitive_vectors"])
+    history = PredictionHistory(len(engine.classes))
+    runs = rng.integers(TRAIT_MIN, TRAIT_MAX + 1, size=(DEFAULT_CAPACITY, N_FEATURES))
+    for run, p in zip(runs, engine.predict_proba(runs)):
+        history.append(run, p)
+    classes = list(engine.classes)
+
+    yield "export.payload_json", _summary(
+        "export", sample_call(lambda: json.dumps(payload, indent=4), 1000, scale["repeat"]), 1000)
+    for fmt in exporters.available_formats():
+        # Parquet compresses its columns itself; the text formats are gzip-wrapped
+        compression = "none" if fmt == "parquet" else "gzip"
+        suffix = fmt if fmt == "parquet" else f"{fmt}_gzip"
+        record_bytes = lambda: exporters.export_bytes(iter([pd.DataFrame([record])]), fmt, compression)
+        history_bytes = lambda: exporters.export_bytes(history.iter_frames(classes), fmt, compression)
+        record_bytes(), history_bytes()
+        yield f"export.record_{suffix}", _summary("export", sample_call(record_bytes, 20, scale["repeat"]), 20)
+        yield f"export.history_{suffix}", _summary(
+            "export", sample_call(history_bytes, 5, scale["repeat"]), 5, DEFAULT_CAPACITY)
+
+
+# =========================================================================================
+# 2. RUN / COMPARE
+# =========================================================================================
+def _versions():
+    versions = {"python": platform.python_version(), "numpy": np.__version__}
+    for module in ("sklearn", "pandas", "plotly", "pyarrow"):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return versions
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ARTIFACT_DIR, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(groups=GROUPS, batch_rows=DEFAULT_BATCH_ROWS, quick=False, progress=None):
+    """Runs the selected groups and returns the results document."""
+    warnings.simplefilter("ignore")
+    scale = {
+        "repeat": 3 if quick else 7,
+        "large_repeat": 1 if quick else 3,
+        "cold_runs": 2 if quick else 5,
+        "figure_number": 2 if quick else 10,
+        "batch_rows": tuple(batch_rows),
+    }
+    engine = InferenceEngine.from_directory()
+    factories = {
+        "startup": lambda: startup_cases(scale),
+        "interactive": lambda: interactive_cases(engine, scale),
+        "batch": lambda: batch_cases(engine, scale),
+        "figures": lambda: figure_cases(engine, scale),
+        "export": lambda: export_cases(engine, scale),
+    }
+    started = time.perf_counter()
+    results = {}
+    for group in groups:
+        for name, result in factories[group]():
+            results[name] = result
+            if progress is not None:
+                progress(name, result)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "model_fingerprint": engine.fingerprint,
+        "platform": {"system": platform.platform(), "machine": platform.machine(), "cpu_count": os.cpu_count()},
+        "versions": _versions(),
+        "settings": {**scale, "quick": quick, "groups": list(groups)},
+        "suite_seconds": time.perf_counter() - started,
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Per-case comparison of two results documents. status is "regression"
+    when median and best both slowed by more than threshold, "improvement"
+    when both sped up by more than threshold, "ok" otherwise, and "added" /
+    "removed" for cases present in only one run.
+    """
+    rows = []
+    base, new = baseline["results"], current["results"]
+    for name in list(base) + [n for n in new if n not in base]:
+        if name not in new or name not in base:
+            rows.append({"case": name, "status": "removed" if name not in new else "added"})
+            continue
+        median_ratio = new[name]["median"] / base[name]["median"]
+        best_ratio = new[name]["best"] / base[name]["best"]
+        if median_ratio > 1 + threshold and best_ratio > 1 + threshold:
+            status = "regression"
+        elif median_ratio < 1 / (1 + threshold) and best_ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"case": name, "status": status, "baseline_median": base[name]["median"],
+                     "median": new[name]["median"], "median_ratio": median_ratio, "best_ratio": best_ratio})
+    return rows
+
+
+def _format_seconds(seconds):
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1 or unit == "us":
+            return f"{seconds * factor:.3f} {unit}" if unit != "us" else f"{seconds * factor:.2f} {unit}"
+
+
+def _print_result(name, result):
+    line = f"{name:<44} median {_format_seconds(result['median']):>12}   best {_format_seconds(result['best']):>12}"
+    if "rows_per_s" in result:
+        line += f"   {result['rows_per_s']:>14,.0f} rows/s"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite or compare two result files.")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, help="run only these groups")
+    parser.add_argument("--batch-rows", type=int, nargs="+", default=list(DEFAULT_BATCH_ROWS))
+    parser.add_argument("--quick", action="store_true", help="fewer rounds and no 10M-row batch (smoke run)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown flagged as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        documents = []
+        for path in args.compare:
+            with open(path, encoding="utf-8") as f:
+                documents.append(json.load(f))
+        rows = compare(*documents, threshold=args.threshold)
+        for row in rows:
+            if "median_ratio" in row:
+                print(f"{row['case']:<44} {_format_seconds(row['baseline_median']):>12} -> "
+                      f"{_format_seconds(row['median']):>12}  x{row['median_ratio']:.2f}  {row['status']}")
+            else:
+                print(f"{row['case']:<44} {row['status']}")
+        regressions = [r["case"] for r in rows if r["status"] == "regression"]
+        print(f"{len(regressions)} regression(s) at a {args.threshold:.0%} threshold"
+              + (": " + ", ".join(regressions) if regressions else ""))
+        return 1 if regressions else 0
+
+    batch_rows = [r for r in args.batch_rows if not args.quick or r <= SKLEARN_BATCH_LIMIT]
+    document = run_suite(args.only or GROUPS, batch_rows, args.quick, progress=_print_result)
+    print(f"{len(document['results'])} cases in {document['suite_seconds']:.1f}s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        print(f"wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Streaming feature correlation engine.
+
+Maintains running means and co-moments of the 26 trait columns so that the
+correlation matrix can be refreshed after every scored profile or uploaded
+chunk without rescanning history. Single rows use Welford's update
+(O(26^2) per row); chunks are merged with the pairwise formula of Chan et al.
+"""
+
+import threading
+
+import numpy as np
+
+from ml_core import N_FEATURES
+
+
+class StreamingCorrelation:
+    """
+    Thread-safe running mean / co-moment accumulator.
+
+    `version` increments on every update so that callers can cache anything
+    derived from the statistics (e.g. the rendered heatmap) until it changes.
+    """
+
+    def __init__(self, n_features=N_FEATURES):
+        self.n_features = n_features
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.mean = np.zeros(self.n_features)
+            self.comoment = np.zeros((self.n_features, self.n_features))
+            self.version = getattr(self, "version", 0) + 1
+
+    def update(self, row):
+        """Welford update with a single observation."""
+        row = np.asarray(row, dtype=np.float64)
+        with self._lock:
+            self.count += 1
+            delta = row - self.mean
+            self.mean += delta / self.count
+            self.comoment += np.outer(delta, row - self.mean)
+            self.version += 1
+
+    def update_batch(self, rows):
+        """Merges the statistics of a (n_rows, n_features) chunk in one pass over the chunk."""
+        rows = np.asarray(rows, dtype=np.float64)
+        n_b = rows.shape[0]
+        if n_b == 0:
+            return
+        mean_b = rows.mean(axis=0)
+        centered = rows - mean_b
+        comoment_b = centered.T @ centered
+        with self._lock:
+            n_a = self.count
+            n = n_a + n_b
+            delta = mean_b - self.mean
+            self.mean += delta * (n_b / n)
+            self.comoment += comoment_b + np.outer(delta, delta) * (n_a * n_b / n)
+            self.count = n
+            self.version += 1
+
+    def snapshot(self):
+        with self._lock:
+            return self.count, self.mean.copy(), self.comoment.copy(), self.version
+
+    def covariance(self):
+        count, _, comoment, _ = self.snapshot()
+        if count < 2:
+            return None
+        return comoment / (count - 1)
+
+    def correlation(self):
+        """
+        Pearson correlation matrix, or None with fewer than two observations.
+        Constant features have undefined correlation and are reported as NaN.
+        """
+        count, _, comoment, _ = self.snapshot()
+        if count < 2:
+            return None
+        std = np.sqrt(np.diag(comoment))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = comoment / np.outer(std, std)
+        corr[~np.isfinite(corr)] = np.nan
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return corr
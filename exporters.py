@@ -0,0 +1,218 @@
+"""
+On-demand export of tabular results (profile records, session histories,
+batch results) as JSONL, CSV or Parquet with optional gzip / zstd compression.
+
+Exports consume an iterable of DataFrame chunks and encode them one chunk at a
+time into a binary sink, so nothing is serialized until a download is actually
+requested and no more than one chunk is materialized in text form. The
+dashboard passes export_file / export_table_file as deferred
+st.download_button callables. They return an open file: the stored batch
+result itself when it is already in the requested encoding, otherwise a
+temporary file the export was encoded into. Streamlit reads that file into
+memory to serve it, so a download still costs its full encoded size in RAM
+once; the encoders themselves never hold more than one chunk.
+
+Parquet uses its own column codecs (pyarrow); JSONL and CSV are wrapped in a
+gzip or zstd stream. zstd wrapping needs the optional `zstandard` package,
+Parquet needs `pyarrow`; available_formats / available_compressions report
+what is usable.
+"""
+
+import gzip
+import io
+import os
+import tempfile
+
+FORMATS = ("jsonl", "csv", "parquet")
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+_EXTENSIONS = {"jsonl": ".jsonl", "csv": ".csv", "parquet": ".parquet"}
+_MIME_TYPES = {"jsonl": "application/x-ndjson", "csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+_COMPRESSED_MIME_TYPES = {"gzip": "application/gzip", "zstd": "application/zstd"}
+
+
+def _importable(module):
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats():
+    return [f for f in FORMATS if f != "parquet" or _importable("pyarrow")]
+
+
+def available_compressions(fmt=None):
+    """
+    Compressions usable for fmt. Parquet column codecs come with pyarrow;
+    wrapping JSONL / CSV in zstd needs the separate `zstandard` package.
+    """
+    if fmt == "parquet":
+        import pyarrow as pa
+
+        return [c for c in COMPRESSIONS if c == "none" or pa.Codec.is_available(c)]
+    return [c for c in COMPRESSIONS if c != "zstd" or _importable("zstandard")]
+
+
+def _check(fmt, compression):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Expected one of {', '.join(FORMATS)}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'. Expected one of {', '.join(COMPRESSIONS)}")
+
+
+def file_name(stem, fmt, compression="none"):
+    """e.g. file_name("history", "csv", "gzip") -> "history.csv.gz"."""
+    _check(fmt, compression)
+    name = stem + _EXTENSIONS[fmt]
+    if fmt != "parquet" and compression != "none":
+        name += ".gz" if compression == "gzip" else ".zst"
+    return name
+
+
+def mime_type(fmt, compression="none"):
+    _check(fmt, compression)
+    if fmt != "parquet" and compression != "none":
+        return _COMPRESSED_MIME_TYPES[compression]
+    return _MIME_TYPES[fmt]
+
+
+# =========================================================================================
+# 1. STREAMING ENCODERS
+# =========================================================================================
+class _CompressedText:
+    """Context manager yielding a binary stream that compresses into sink; sink stays open."""
+
+    def __init__(self, sink, compression):
+        self.sink = sink
+        self.compression = compression
+        self._stream = None
+
+    def __enter__(self):
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self.sink, mode="wb", mtime=0)
+        elif self.compression == "zstd":
+            import zstandard
+
+            self._stream = zstandard.ZstdCompressor().stream_writer(self.sink, closefd=False)
+        else:
+            return self.sink
+        return self._stream
+
+    def __exit__(self, *exc):
+        if self._stream is not None:
+            self._stream.close()
+
+
+def write_export(chunks, sink, fmt, compression="none"):
+    """
+    Encodes an iterable of DataFrames into the binary file object sink.
+    Returns the number of rows written.
+    """
+    _check(fmt, compression)
+    rows = 0
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for frame in chunks:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    codec = "none" if compression == "none" else compression
+                    writer = pq.ParquetWriter(sink, table.schema, compression=codec)
+                writer.write_table(table)
+                rows += len(frame)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    with _CompressedText(sink, compression) as out:
+        header = True
+        for frame in chunks:
+            if fmt == "csv":
+                text = frame.to_csv(index=False, header=header, lineterminator="\n")
+            else:
+                text = frame.to_json(orient="records", lines=True)
+                if text and not text.endswith("\n"):
+                    text += "\n"
+            out.write(text.encode("utf-8"))
+            header = False
+            rows += len(frame)
+    return rows
+
+
+def export_bytes(chunks, fmt, compression="none"):
+    """Encodes the chunks into an in-memory buffer and returns its bytes (small payloads, benchmarks)."""
+    sink = io.BytesIO()
+    write_export(chunks, sink, fmt, compression)
+    return sink.getvalue()
+
+
+def export_file(chunks, fmt, compression="none"):
+    """
+    Encodes the chunks into an anonymous temporary file and returns it open
+    for reading at offset 0. The file is deleted when the handle is closed
+    or garbage-collected. Encoding peaks at one chunk; whoever reads the
+    handle (st.download_button reads it whole) pays for the full output.
+    """
+    with tempfile.TemporaryFile() as sink:
+        write_export(chunks, sink, fmt, compression)
+        sink.flush()
+        # A plain read-only handle (st.download_button accepts BufferedReader, not BufferedRandom)
+        # on a duplicate descriptor keeps the unlinked file alive after the writer closes
+        reader = os.fdopen(os.dup(sink.fileno()), "rb")
+    reader.seek(0)
+    return reader
+
+
+# =========================================================================================
+# 2. CHUNK SOURCES
+# =========================================================================================
+_PARQUET_CODECS = {"UNCOMPRESSED": "none", "GZIP": "gzip", "ZSTD": "zstd"}
+
+
+def stored_encoding(path):
+    """
+    (format, compression) of a file written by batch_scoring.ResultWriter, in
+    the terms of file_name / write_export. CSV results are uncompressed;
+    Parquet reports its column codec (e.g. "snappy", which no export uses).
+    """
+    if os.path.splitext(path)[1].lower() not in (".parquet", ".pq"):
+        return "csv", "none"
+    import pyarrow.parquet as pq
+
+    metadata = pq.ParquetFile(path).metadata
+    if metadata.num_row_groups == 0 or metadata.num_columns == 0:
+        return "parquet", None
+    codec = metadata.row_group(0).column(0).compression
+    return "parquet", _PARQUET_CODECS.get(codec, codec.lower())
+
+
+def export_table_file(path, fmt, compression="none"):
+    """
+    Opens a stored result table for download as fmt / compression: the file
+    at path itself when it is already encoded that way (no encoding and no
+    temporary copy), otherwise a re-encoding of its chunks into a temporary
+    file (export_file).
+    """
+    _check(fmt, compression)
+    if stored_encoding(path) == (fmt, compression):
+        return open(path, "rb")
+    return export_file(iter_table_chunks(path), fmt, compression)
+
+
+def iter_table_chunks(path, chunk_size=100_000):
+    """Yields DataFrame chunks of a CSV or Parquet file written by batch_scoring.ResultWriter."""
+    import pandas as pd
+
+    if os.path.splitext(path)[1].lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
@@ -0,0 +1,223 @@
+"""
+Memory-mapped columnar feature store for respondent corpora.
+
+A CSV or Parquet corpus is converted once into a .pifs file holding the 26
+trait columns as a row-major uint8 matrix, so later rescoring, domain
+statistics and correlation jobs open it in microseconds and scan it
+zero-copy instead of re-parsing text.
+
+Layout (little-endian):
+
+    offset 0   magic        4s   b"PIFS"
+    offset 4   version      u16  STORE_FORMAT_VERSION
+    offset 6   reserved     u16
+    offset 8   header_len   u32
+    offset 12  header       JSON (utf-8): feature_names (= TRAIT_VECTORS),
+                            n_rows, dtype, data_offset, source
+    ...        zero padding up to DATA_OFFSET
+    data       n_rows x 26 uint8, C order
+
+The header region has a fixed size so that conversion can stream rows to disk
+and fill in n_rows at the end.
+
+Usage:
+    python feature_store.py convert personality_synthetic_dataset.csv corpus.pifs
+    python feature_store.py info corpus.pifs
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from ml_core import DOMAINS, N_FEATURES, TRAIT_VECTORS
+
+STORE_MAGIC = b"PIFS"
+STORE_FORMAT_VERSION = 1
+DATA_OFFSET = 4096
+_PREAMBLE = struct.Struct("<4sHHI")
+
+
+class FeatureStoreError(ValueError):
+    """Raised when a store file is malformed or does not match TRAIT_VECTORS."""
+
+
+def _pack_header(header):
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    preamble = _PREAMBLE.pack(STORE_MAGIC, STORE_FORMAT_VERSION, 0, len(header_bytes))
+    if len(preamble) + len(header_bytes) > DATA_OFFSET:
+        raise FeatureStoreError("store header does not fit in the reserved header region")
+    return (preamble + header_bytes).ljust(DATA_OFFSET, b"\0")
+
+
+# =========================================================================================
+# 1. CONVERSION
+# =========================================================================================
+def convert(source, path, chunk_size=250_000, name=None):
+    """
+    Streams a CSV / Parquet source (see batch_scoring.iter_feature_chunks)
+    into a store file at path. Every value must be an integer in
+    [TRAIT_MIN, TRAIT_MAX]; the range is checked by iter_feature_chunks.
+    Returns the written header.
+    """
+    from batch_scoring import iter_feature_chunks
+
+    n_rows = 0
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(b"\0" * DATA_OFFSET)
+            for chunk in iter_feature_chunks(source, chunk_size, name=name):
+                if chunk.dtype.kind == "f" and not np.array_equal(chunk, np.rint(chunk)):
+                    raise FeatureStoreError(f"non-integer trait values near row {n_rows:,}")
+                f.write(np.ascontiguousarray(chunk, dtype=np.uint8).tobytes())
+                n_rows += len(chunk)
+            header = {
+                "format_version": STORE_FORMAT_VERSION,
+                "feature_names": list(TRAIT_VECTORS),
+                "n_rows": n_rows,
+                "dtype": "|u1",
+                "data_offset": DATA_OFFSET,
+                "source": os.path.basename(str(name or getattr(source, "name", source))),
+            }
+            f.seek(0)
+            f.write(_pack_header(header))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return header
+
+
+# =========================================================================================
+# 2. READ ACCESS
+# =========================================================================================
+class FeatureStore:
+    """
+    Read-only view of a store. `features` is an (n_rows, 26) uint8 array
+    backed directly by the mapped file (or the given buffer).
+    """
+
+    def __init__(self, buffer, origin="<buffer>"):
+        if len(buffer) < _PREAMBLE.size:
+            raise FeatureStoreError(f"{origin}: truncated preamble")
+        magic, version, _, header_len = _PREAMBLE.unpack_from(buffer, 0)
+        if magic != STORE_MAGIC:
+            raise FeatureStoreError(f"{origin}: not a feature store (bad magic {magic!r})")
+        if version != STORE_FORMAT_VERSION:
+            raise FeatureStoreError(f"{origin}: unsupported store format version {version}")
+        if _PREAMBLE.size + header_len > len(buffer):
+            raise FeatureStoreError(f"{origin}: truncated header")
+        try:
+            header = json.loads(bytes(buffer[_PREAMBLE.size:_PREAMBLE.size + header_len]))
+        except ValueError as e:
+            raise FeatureStoreError(f"{origin}: unreadable header ({e})")
+
+        # Missing keys and mistyped values are a malformed header like any other corruption,
+        # so callers only ever see FeatureStoreError (a ValueError)
+        try:
+            if not isinstance(header, dict):
+                raise TypeError("header is not a JSON object")
+            feature_names, n_rows, offset, dtype = (
+                header["feature_names"], header["n_rows"], header["data_offset"], header["dtype"]
+            )
+            if not isinstance(n_rows, int) or n_rows < 0:
+                raise ValueError(f"invalid n_rows {n_rows!r}")
+            if not isinstance(offset, int) or offset < _PREAMBLE.size + header_len:
+                raise ValueError(f"invalid data_offset {offset!r}")
+            if dtype != "|u1":
+                raise ValueError(f"unsupported dtype {dtype!r}")
+        except (KeyError, TypeError, ValueError) as e:
+            raise FeatureStoreError(f"{origin}: malformed header ({type(e).__name__}: {e})") from None
+        if feature_names != list(TRAIT_VECTORS):
+            raise FeatureStoreError(f"{origin}: feature columns do not match TRAIT_VECTORS")
+        if offset + n_rows * N_FEATURES > len(buffer):
+            raise FeatureStoreError(f"{origin}: truncated data section")
+
+        self.header = header
+        self.n_rows = n_rows
+        self._buffer = buffer
+        self.features = np.frombuffer(buffer, dtype=np.uint8, count=n_rows * N_FEATURES, offset=offset).reshape(
+            n_rows, N_FEATURES
+        )
+
+    def __len__(self):
+        return self.n_rows
+
+    def iter_chunks(self, chunk_size=250_000):
+        """Zero-copy row slices of at most chunk_size rows."""
+        for start in range(0, self.n_rows, chunk_size):
+            yield self.features[start:start + chunk_size]
+
+    def domain_statistics(self, chunk_size=250_000):
+        """
+        Mean and standard deviation of each respondent's domain average (the
+        radar's three domains) over the whole corpus. Per-row domain sums come
+        from one float32 matmul against a 0/1 membership matrix, which is exact
+        for integer traits; the moments are accumulated in float64.
+        """
+        membership = np.zeros((N_FEATURES, len(DOMAINS)), dtype=np.float32)
+        sizes = np.empty(len(DOMAINS))
+        for j, span in enumerate(DOMAINS.values()):
+            membership[span, j] = 1.0
+            sizes[j] = span.stop - span.start
+        total = np.zeros(len(DOMAINS))
+        total_sq = np.zeros(len(DOMAINS))
+        for chunk in self.iter_chunks(chunk_size):
+            scores = (chunk.astype(np.float32) @ membership) / sizes
+            total += scores.sum(axis=0)
+            total_sq += np.square(scores).sum(axis=0)
+        n = max(self.n_rows, 1)
+        mean = total / n
+        std = np.sqrt(np.maximum(total_sq / n - np.square(mean), 0.0))
+        return {name: (float(mean[i]), float(std[i])) for i, name in enumerate(DOMAINS)}
+
+
+def open_store(source):
+    """Opens a store from a path (memory-mapped) or a binary file object (read into memory)."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # mmap refuses empty files
+                raise FeatureStoreError(f"{os.fspath(source)}: truncated preamble") from None
+        try:
+            return FeatureStore(buffer, os.fspath(source))
+        except BaseException:
+            buffer.close()
+            raise
+    buffer = source.getbuffer() if hasattr(source, "getbuffer") else source.read()
+    return FeatureStore(buffer, getattr(source, "name", "<upload>"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert respondent corpora into memory-mapped feature stores.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    conv = sub.add_parser("convert", help="CSV / Parquet -> .pifs")
+    conv.add_argument("input")
+    conv.add_argument("output")
+    conv.add_argument("--chunk-size", type=int, default=250_000)
+    info = sub.add_parser("info", help="print a store's header and domain statistics")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        start = time.perf_counter()
+        header = convert(args.input, args.output, args.chunk_size)
+        print(f"wrote {header['n_rows']:,} rows to {args.output} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    else:
+        store = open_store(args.path)
+        print(json.dumps(store.header, indent=2, sort_keys=True))
+        for domain, (mean, std) in store.domain_statistics().items():
+            print(f"{domain:<22} mean {mean:.3f}  std {std:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
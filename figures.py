@@ -0,0 +1,259 @@
+"""
+Plotly figure factory for the dashboard tabs.
+
+Each build_* function constructs one chart from plain inputs. FigureCache
+memoizes the built figures under a key derived from those inputs, so a
+Streamlit rerun triggered by an unrelated widget reuses the previous figure
+instead of reconstructing (and re-validating) it.
+
+Plotly is imported inside the builders: it is only paid for on the first
+cache miss, not on the cold start of every view.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+# =========================================================================================
+# 1. FIGURE CACHE
+# =========================================================================================
+class FigureCache:
+    """
+    Thread-safe LRU cache of built figures shared by every session.
+
+    Cached go.Figure objects are handed straight to st.plotly_chart; passing a
+    serialized dict instead would make Streamlit re-validate the whole spec,
+    which costs more than building the figure in the first place.
+    """
+
+    def __init__(self, maxsize=256, on_build=None):
+        self.maxsize = maxsize
+        # Optional on_build(kind, seconds) callback for every cache-miss build
+        self.on_build = on_build
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.build_seconds = 0.0
+        self.saved_seconds = 0.0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, kind, key, builder, *args):
+        """Returns the cached figure for (kind, key), calling builder(*args) on a miss."""
+        cache_key = (kind, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                self.saved_seconds += entry[1]
+                return entry[0]
+        start = time.perf_counter()
+        fig = builder(*args)
+        elapsed = time.perf_counter() - start
+        if self.on_build is not None:
+            self.on_build(kind, elapsed)
+        with self._lock:
+            self.misses += 1
+            self.build_seconds += elapsed
+            self._entries[cache_key] = (fig, elapsed)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return fig
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "build_seconds": self.build_seconds,
+                "saved_seconds": self.saved_seconds,
+            }
+
+
+def float_key(values, decimals=6):
+    """Stable hashable key for a small float vector."""
+    return tuple(np.round(np.asarray(values, dtype=np.float64), decimals).tolist())
+
+
+# =========================================================================================
+# 2. TAB 2 - MACRO RADAR & ANALYTICS
+# =========================================================================================
+RADAR_CATEGORIES = ['Social Dynamics', 'Cognitive Processing', 'Action & Lifestyle']
+
+
+def build_radar(radar_values):
+    import plotly.graph_objects as go
+
+    # Close polygon
+    r_closed = list(radar_values) + [radar_values[0]]
+    theta_closed = RADAR_CATEGORIES + [RADAR_CATEGORIES[0]]
+
+    fig_radar = go.Figure()
+    fig_radar.add_trace(go.Scatterpolar(
+        r=r_closed, theta=theta_closed,
+        fill='toself', fillcolor='rgba(236, 72, 153, 0.25)',
+        line=dict(color='#ec4899', width=4), name='User Profile'
+    ))
+    # Baseline trace for comparison
+    fig_radar.add_trace(go.Scatterpolar(
+        r=[6.0, 6.0, 6.0, 6.0], theta=theta_closed,
+        mode='lines', line=dict(color='rgba(96, 165, 250, 0.5)', width=2, dash='dash'), name='Global Average'
+    ))
+
+    fig_radar.update_layout(
+        polar=dict(
+            bgcolor="rgba(0,0,0,0)",
+            radialaxis=dict(visible=True, range=[0, 10], gridcolor="rgba(236,72,153,0.15)"),
+            angularaxis=dict(gridcolor="rgba(236,72,153,0.15)", color="#f8fafc")
+        ),
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Space Grotesk", size=14),
+        height=500, margin=dict(l=50, r=50, t=50, b=50),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5, font=dict(color="#f8fafc"))
+    )
+    return fig_radar
+
+
+def build_probability_bar(labels, probs):
+    import plotly.express as px
+
+    fig_prob = px.bar(
+        x=labels, y=probs * 100, color=labels,
+        color_discrete_sequence=px.colors.sequential.Plasma,
+        labels={"x": "Classified Type", "y": "Confidence (%)"}
+    )
+    fig_prob.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(139, 92, 246, 0.05)",
+        font=dict(family="Inter", color="#f8fafc"),
+        xaxis=dict(gridcolor="rgba(255,255,255,0.05)", title=""),
+        yaxis=dict(gridcolor="rgba(255,255,255,0.1)"),
+        showlegend=False, height=500, margin=dict(l=20, r=20, t=20, b=20)
+    )
+    return fig_prob
+
+
+def build_gauge(val, title, color):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number", value=val, title={'text': title, 'font': {'size': 16, 'color': '#f8fafc', 'family':'Space Grotesk'}},
+        number={'font':{'color':color, 'size':40, 'family':'Space Grotesk'}},
+        gauge={
+            'axis': {'range': [0, 10], 'tickwidth': 1, 'tickcolor': "rgba(255,255,255,0.2)"},
+            'bar': {'color': color},
+            'bgcolor': "rgba(0,0,0,0)",
+            'borderwidth': 2, 'bordercolor': "rgba(255,255,255,0.1)",
+        }
+    ))
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", font={'color': "#f8fafc", 'family': "Inter"}, height=300)
+    return fig
+
+
+HISTORY_COLORS = ['#8b5cf6', '#3b82f6', '#ec4899', '#10b981', '#f59e0b']
+
+
+def build_history_trajectory(runs, probs, classes):
+    import plotly.graph_objects as go
+
+    fig_hist = go.Figure()
+    for i, name in enumerate(classes):
+        fig_hist.add_trace(go.Scatter(
+            x=runs, y=probs[:, i] * 100, mode='lines+markers', name=str(name),
+            line=dict(color=HISTORY_COLORS[i % len(HISTORY_COLORS)], width=3), marker=dict(size=6)
+        ))
+    fig_hist.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(139, 92, 246, 0.05)",
+        font=dict(family="Inter", color="#f8fafc"),
+        xaxis=dict(title="Run #", gridcolor="rgba(255,255,255,0.05)"),
+        yaxis=dict(title="Confidence (%)", range=[0, 100], gridcolor="rgba(255,255,255,0.1)"),
+        height=420, margin=dict(l=20, r=20, t=20, b=20),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig_hist
+
+
+def build_trait_delta(trait_names, latest, previous):
+    import plotly.graph_objects as go
+
+    delta = np.asarray(latest, dtype=np.int16) - np.asarray(previous, dtype=np.int16)
+    changed = np.flatnonzero(delta)
+    colors = ['#ec4899' if d > 0 else '#3b82f6' for d in delta[changed]]
+    fig_delta = go.Figure(go.Bar(
+        x=delta[changed], y=[trait_names[i] for i in changed], orientation='h',
+        marker=dict(color=colors, line=dict(color='rgba(255,255,255,0.2)', width=1))
+    ))
+    fig_delta.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Inter", color="#f8fafc", size=13),
+        xaxis=dict(title="Slider Change vs Previous Run", gridcolor="rgba(255,255,255,0.05)", zeroline=True, zerolinecolor="rgba(255,255,255,0.3)"),
+        yaxis=dict(title="", gridcolor="rgba(255,255,255,0.05)"),
+        height=420, margin=dict(l=20, r=20, t=20, b=20)
+    )
+    return fig_delta
+
+
+# =========================================================================================
+# 3. TAB 3 - FEATURE IMPORTANCE
+# =========================================================================================
+def build_coefficient_bar(labels_coef, values_coef):
+    import plotly.graph_objects as go
+
+    fig_coef = go.Figure(go.Bar(
+        x=values_coef, y=labels_coef, orientation='h',
+        marker=dict(color=values_coef, colorscale='Sunsetdark', line=dict(color='rgba(255,255,255,0.2)', width=1))
+    ))
+    fig_coef.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Inter", color="#f8fafc", size=13),
+        xaxis=dict(title="Absolute Theta (θ) Magnitude", gridcolor="rgba(255,255,255,0.05)"),
+        yaxis=dict(title="", gridcolor="rgba(255,255,255,0.05)"),
+        height=600, margin=dict(l=20, r=20, t=20, b=20)
+    )
+    return fig_coef
+
+
+def build_contribution_bar(labels_contrib, values_contrib):
+    import plotly.graph_objects as go
+
+    colors = ['#ec4899' if v >= 0 else '#3b82f6' for v in values_contrib]
+    fig_contrib = go.Figure(go.Bar(
+        x=values_contrib, y=labels_contrib, orientation='h',
+        marker=dict(color=colors, line=dict(color='rgba(255,255,255,0.2)', width=1))
+    ))
+    fig_contrib.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Inter", color="#f8fafc", size=13),
+        xaxis=dict(title="Signed Logit Contribution (θ · z)", gridcolor="rgba(255,255,255,0.05)", zeroline=True, zerolinecolor="rgba(255,255,255,0.3)"),
+        yaxis=dict(title="", gridcolor="rgba(255,255,255,0.05)"),
+        height=600, margin=dict(l=20, r=20, t=20, b=20)
+    )
+    return fig_contrib
+
+
+# =========================================================================================
+# 4. TAB 4 - SYSTEM DIAGNOSTICS
+# =========================================================================================
+def build_correlation_heatmap(corr, trait_names):
+    import plotly.graph_objects as go
+
+    fig_corr = go.Figure(data=go.Heatmap(
+        z=corr, x=trait_names, y=trait_names,
+        colorscale='Magma', hoverongaps=False
+    ))
+    fig_corr.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Inter", color="#f8fafc", size=10),
+        xaxis=dict(tickangle=45), height=800, margin=dict(l=50, r=50, t=50, b=100)
+    )
+    return fig_corr
@@ -0,0 +1,93 @@
+"""
+Bounded per-session prediction history.
+
+Each scored profile is stored as one row of three preallocated columns:
+
+    traits      uint8   (capacity, 26)         slider values 0-10
+    probs       float32 (capacity, n_classes)  class probabilities
+    timestamps  int64   (capacity,)            time.time_ns() of the prediction
+
+That is 26 + 4 * n_classes + 8 bytes per run (46 bytes with three classes,
+about 45 KiB for the default 1,000 runs) regardless of how many runs have
+been recorded. Once the buffer is full the oldest run is overwritten.
+"""
+
+import time
+
+import numpy as np
+
+from ml_core import N_FEATURES, TRAIT_VECTORS
+
+DEFAULT_CAPACITY = 1000
+
+
+class PredictionHistory:
+    """
+    Ring buffer of (traits, probabilities, timestamp) rows. Accessors return
+    rows oldest first. `total` counts every run ever appended and is never
+    reset (not even by clear), so it doubles as a cache key for anything
+    derived from the history.
+    """
+
+    def __init__(self, n_classes, capacity=DEFAULT_CAPACITY, n_features=N_FEATURES):
+        self.capacity = capacity
+        self.traits = np.zeros((capacity, n_features), dtype=np.uint8)
+        self.probs = np.zeros((capacity, n_classes), dtype=np.float32)
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.total = 0
+        self._cleared_at = 0
+
+    def __len__(self):
+        return min(self.total - self._cleared_at, self.capacity)
+
+    @property
+    def nbytes(self):
+        return self.traits.nbytes + self.probs.nbytes + self.timestamps.nbytes
+
+    def append(self, features, probs, timestamp_ns=None):
+        slot = self.total % self.capacity
+        self.traits[slot] = features
+        self.probs[slot] = probs
+        self.timestamps[slot] = time.time_ns() if timestamp_ns is None else timestamp_ns
+        self.total += 1
+
+    def clear(self):
+        self._cleared_at = self.total
+
+    def _order(self):
+        return np.arange(self.total - len(self), self.total) % self.capacity
+
+    def ordered(self):
+        """(traits, probs, timestamps) copies, oldest run first."""
+        order = self._order()
+        return self.traits[order], self.probs[order], self.timestamps[order]
+
+    def run_numbers(self):
+        """1-based sequence number of each retained run, oldest first."""
+        return np.arange(self.total - len(self), self.total) + 1
+
+    def iter_frames(self, classes, chunk_size=10_000):
+        """
+        Yields the history as DataFrame chunks (run, timestamp, prediction,
+        confidence, one prob_<class> column per class and the 26 traits) for
+        exporters.write_export.
+        """
+        import pandas as pd
+
+        order = self._order()
+        runs = self.run_numbers()
+        classes = np.asarray(classes)
+        for start in range(0, len(order), chunk_size):
+            idx = order[start:start + chunk_size]
+            probs = self.probs[idx]
+            frame = pd.DataFrame({
+                "run": runs[start:start + chunk_size],
+                "timestamp": pd.to_datetime(self.timestamps[idx], unit="ns", utc=True),
+                "prediction": classes[probs.argmax(axis=1)],
+                "confidence": probs.max(axis=1),
+            })
+            for i, name in enumerate(classes):
+                frame[f"prob_{name}"] = probs[:, i]
+            for i, trait in enumerate(TRAIT_VECTORS):
+                frame[trait] = self.traits[idx, i]
+            yield frame
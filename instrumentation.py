@@ -0,0 +1,304 @@
+"""
+Prometheus-style runtime metrics for the dashboard process.
+
+Counter and Histogram are plain in-process instruments: recording one value
+on a resolved child costs a bisect over the bucket bounds and a short lock,
+so they can sit on the prediction path. CallbackGauge reads an
+existing stats() source (prediction cache, figure cache, audit log) only when
+the endpoint is scraped. MetricsRegistry.render() produces the Prometheus
+text exposition format (version 0.0.4), and serve_metrics() publishes it on a
+local /metrics endpoint from a daemon thread (standard library only).
+
+The dashboard's instruments are grouped in DashboardMetrics:
+
+    pip_predictions_total{source}               predictions, source = model | cache
+    pip_prediction_stage_seconds{stage}         per-stage latency (telemetry.STAGES + total)
+    pip_rerun_seconds{scope}                    script duration, scope = app | fragment
+    pip_chart_build_seconds{chart}              Plotly figure builds (FigureCache misses)
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telemetry import STAGES
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_PORT = 9464
+
+# Upper bounds in seconds: prediction stages sit in the microseconds, reruns and
+# chart builds in the tens to hundreds of milliseconds
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + [f'{n}="{v}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# =========================================================================================
+# 1. INSTRUMENTS
+# =========================================================================================
+class _Metric:
+    """Shared label handling: labels(*values) returns a cached child per label-value tuple."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values):
+        values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} is labelled by {self.labelnames}; call labels() first")
+        return self.labels()
+
+    def collect(self):
+        """(label values, child) pairs sorted by label values."""
+        with self._lock:
+            return sorted(self._children.items())
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        self._unlabelled().inc(amount)
+
+    def samples(self):
+        for values, child in self.collect():
+            yield self.name, _format_labels(self.labelnames, values), child.value
+
+
+class _HistogramChild:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=LATENCY_BUCKETS):
+        self.bounds = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value):
+        self._unlabelled().observe(value)
+
+    def samples(self):
+        for values, child in self.collect():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, [("le", _format_value(bound))])
+                yield self.name + "_bucket", labels, cumulative
+            plain = _format_labels(self.labelnames, values)
+            yield self.name + "_sum", plain, total
+            yield self.name + "_count", plain, cumulative
+
+
+class CallbackGauge(_Metric):
+    """
+    Gauge whose value is read from callback() at scrape time: a number, or a
+    {label values tuple: number} dict for a labelled gauge. kind="counter"
+    exposes a monotonically increasing stats() field as a counter instead.
+    """
+
+    def __init__(self, name, documentation, callback, labelnames=(), registry=None, kind="gauge"):
+        self.callback = callback
+        self.kind = kind
+        super().__init__(name, documentation, labelnames, registry)
+
+    def samples(self):
+        value = self.callback()
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        for values, v in sorted(items):
+            if v is not None:
+                yield self.name, _format_labels(self.labelnames, values if isinstance(values, tuple) else (values,)), v
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """Adds metric; one registered under the same name (e.g. by a reloaded source) is replaced."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        """All registered metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            try:
+                for name, labels, value in metric.samples():
+                    lines.append(f"{name}{labels} {_format_value(value)}")
+            except Exception as e:
+                # A failing stats source must not take the other metrics down
+                lines.append(f"# {metric.name} unavailable: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+
+
+# =========================================================================================
+# 2. DASHBOARD INSTRUMENTS
+# =========================================================================================
+class DashboardMetrics:
+    """
+    The dashboard's instruments on one registry. Children for the fixed label
+    values are resolved once here, so the hot-path calls do no label lookups.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.predictions = Counter("pip_predictions_total", "Interactive predictions served.", ("source",),
+                                   self.registry)
+        self.stage_seconds = Histogram("pip_prediction_stage_seconds",
+                                       "Latency of each interactive prediction stage.", ("stage",), self.registry)
+        self.rerun_seconds = Histogram("pip_rerun_seconds", "Streamlit script run duration.", ("scope",),
+                                       self.registry)
+        self.chart_build_seconds = Histogram("pip_chart_build_seconds", "Plotly figure build time on cache misses.",
+                                             ("chart",), self.registry)
+        self._by_source = {False: self.predictions.labels("model"), True: self.predictions.labels("cache")}
+        self._stages = {stage: self.stage_seconds.labels(stage) for stage in STAGES + ("total",)}
+
+    def observe_prediction(self, timer, cache_hit):
+        """Records one telemetry.StageTimer from the prediction path."""
+        self._by_source[bool(cache_hit)].inc()
+        for stage, ns in timer.durations_ns.items():
+            child = self._stages.get(stage) or self.stage_seconds.labels(stage)
+            child.observe(ns / 1e9)
+        self._stages["total"].observe(timer.total_ns / 1e9)
+
+    def observe_rerun(self, scope, timer):
+        self.rerun_seconds.labels(scope).observe(timer.total_ns / 1e9)
+
+    def observe_chart_build(self, chart, seconds):
+        self.chart_build_seconds.labels(chart).observe(seconds)
+
+    def add_stats_source(self, prefix, stats, counters=(), gauges=(), description=None):
+        """
+        Exposes fields of a stats() dict (e.g. PredictionCache.stats) read at
+        scrape time: counters as <prefix>_<field>_total, gauges as <prefix>_<field>.
+        """
+        description = description or prefix
+        for field in counters:
+            CallbackGauge(f"{prefix}_{field}_total", f"{description}: {field}.", lambda f=field: stats()[f],
+                          registry=self.registry, kind="counter")
+        for field in gauges:
+            CallbackGauge(f"{prefix}_{field}", f"{description}: {field}.", lambda f=field: stats()[f],
+                          registry=self.registry)
+
+
+# =========================================================================================
+# 3. EXPOSITION ENDPOINT
+# =========================================================================================
+def _handler(registry):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def serve_metrics(registry, host="127.0.0.1", port=DEFAULT_PORT):
+    """
+    Serves registry on http://host:port/metrics from a daemon thread and
+    returns the server (server.server_address has the bound port when port=0;
+    server.shutdown() stops it). Raises OSError when the port is taken.
+    """
+    server = ThreadingHTTPServer((host, port), _handler(registry))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    return server
+
+
+def parse_exposition(text):
+    """{(sample name, label string): value} of a text exposition, for tests and tooling."""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        series, value = line.rsplit(" ", 1)
+        name, _, labels = series.partition("{")
+        samples[(name, "{" + labels if labels else "")] = float(value)
+    return samples
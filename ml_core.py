@@ -0,0 +1,558 @@
+"""
+Streamlit-free machine learning core for the Personality Intelligence Platform.
+
+Owns the canonical 26-trait feature ordering, the artifact ingestion shared by
+the dashboard (app.py) and the offline tooling, and the vectorized scoring
+engine that wraps the pickled StandardScaler / LogisticRegression / LabelEncoder
+stack.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import warnings
+
+import numpy as np
+
+# =========================================================================================
+# 1. ARTIFACT LOCATIONS
+# =========================================================================================
+ARTIFACT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_FILE = "personality_model.pkl"
+SCALER_FILE = "scalar.pkl"
+ENCODER_FILE = "encoder.pkl"
+METRICS_FILE = "metrics.json"
+FEATURE_SCHEMA_FILE = "feature_schema.json"
+
+# =========================================================================================
+# 2. FEATURE CONTRACT
+# =========================================================================================
+# Explicitly defining the 26 feature vectors expected by the model architecture
+TRAIT_VECTORS = [
+    "Social Energy", "Alone Time Preference", "Talkativeness",
+    "Deep Reflection", "Group Comfort", "Party Liking",
+    "Listening Skill", "Empathy", "Organization",
+    "Leadership", "Risk Taking", "Public Speaking Comfort",
+    "Curiosity", "Routine Preference", "Excitement Seeking",
+    "Friendliness", "Planning", "Spontaneity",
+    "Adventurousness", "Reading Habit", "Sports Interest",
+    "Online Social Usage", "Travel Desire", "Gadget Usage",
+    "Collaborative Work Style", "Decision Speed"
+]
+
+# Column names used by the training dataset, aligned index-for-index with TRAIT_VECTORS
+TRAINING_COLUMNS = [
+    "social_energy", "alone_time_preference", "talkativeness",
+    "deep_reflection", "group_comfort", "party_liking",
+    "listening_skill", "empathy", "organization",
+    "leadership", "risk_taking", "public_speaking_comfort",
+    "curiosity", "routine_preference", "excitement_seeking",
+    "friendliness", "planning", "spontaneity",
+    "adventurousness", "reading_habit", "sports_interest",
+    "online_social_usage", "travel_desire", "gadget_usage",
+    "work_style_collaborative", "decision_speed"
+]
+
+N_FEATURES = len(TRAIT_VECTORS)
+TRAIT_INDEX = {name: i for i, name in enumerate(TRAIT_VECTORS)}
+
+# Every slider is an integer on this closed range
+TRAIT_MIN, TRAIT_MAX = 0, 10
+N_LEVELS = TRAIT_MAX - TRAIT_MIN + 1
+
+# Version of the feature_schema.json manifest layout (see feature_schema)
+SCHEMA_FORMAT_VERSION = 1
+TRAIT_DTYPE = "integer"
+
+# Macro-psychological domains shown on the analytics radar: contiguous TRAIT_VECTORS ranges
+DOMAINS = {
+    "Social Dynamics": slice(0, 9),
+    "Cognitive Processing": slice(9, 18),
+    "Action & Lifestyle": slice(18, 26),
+}
+
+
+def resolve_feature_columns(columns):
+    """
+    Maps an input table's header onto TRAIT_VECTORS order. Each trait may be
+    supplied either under its display name or its training column name.
+    Returns the source column names in model order; raises ValueError listing
+    every trait that could not be found.
+    """
+    available = set(columns)
+    resolved, missing = [], []
+    for display_name, training_name in zip(TRAIT_VECTORS, TRAINING_COLUMNS):
+        if display_name in available:
+            resolved.append(display_name)
+        elif training_name in available:
+            resolved.append(training_name)
+        else:
+            missing.append(display_name)
+    if missing:
+        raise ValueError(f"Input is missing {len(missing)} trait column(s): {', '.join(missing)}")
+    return resolved
+
+
+class SchemaError(ValueError):
+    """Raised when the artifacts' feature schema does not match the TRAIT_VECTORS contract."""
+
+
+def feature_schema(feature_names=TRAINING_COLUMNS):
+    """
+    Manifest saved next to the artifacts: the model's input columns in the
+    order its weights expect, each with its TRAIT_VECTORS display name, dtype
+    and valid range.
+    """
+    display_names = dict(zip(TRAINING_COLUMNS, TRAIT_VECTORS))
+    unknown = [str(n) for n in feature_names if n not in display_names]
+    if unknown:
+        raise SchemaError(f"unknown feature column(s): {', '.join(unknown)}")
+    return {
+        "format_version": SCHEMA_FORMAT_VERSION,
+        "features": [
+            {"name": str(n), "display_name": display_names[n], "dtype": TRAIT_DTYPE, "min": TRAIT_MIN, "max": TRAIT_MAX}
+            for n in feature_names
+        ],
+    }
+
+
+def compile_permutation(schema, feature_names=None):
+    """
+    Validates a schema manifest against the feature contract and returns the
+    column permutation: an intp array perm with model column j reading
+    TRAIT_VECTORS column perm[j], i.e. features[:, perm] is in model order.
+    feature_names, the order recorded by the artifacts themselves (the
+    scaler's feature_names_in_ or the bundle header), must agree with it.
+    Raises SchemaError listing every problem found.
+    """
+    problems = []
+    if schema.get("format_version") != SCHEMA_FORMAT_VERSION:
+        problems.append(f"unsupported schema format version {schema.get('format_version')!r}")
+    entries = schema.get("features") or []
+    names = [entry.get("name") for entry in entries]
+    position = {name: i for i, name in enumerate(TRAINING_COLUMNS)}
+    for entry in entries:
+        name = entry.get("name")
+        if name not in position:
+            problems.append(f"unknown feature '{name}'")
+            continue
+        if entry.get("display_name") != TRAIT_VECTORS[position[name]]:
+            problems.append(f"'{name}' is labelled '{entry.get('display_name')}', expected '{TRAIT_VECTORS[position[name]]}'")
+        if (entry.get("dtype"), entry.get("min"), entry.get("max")) != (TRAIT_DTYPE, TRAIT_MIN, TRAIT_MAX):
+            problems.append(f"'{name}' is declared {entry.get('dtype')} in [{entry.get('min')}, {entry.get('max')}], "
+                            f"expected {TRAIT_DTYPE} in [{TRAIT_MIN}, {TRAIT_MAX}]")
+    duplicates = sorted({str(n) for n in names if names.count(n) > 1})
+    if duplicates:
+        problems.append(f"duplicate feature(s): {', '.join(duplicates)}")
+    missing = [n for n in TRAINING_COLUMNS if n not in names]
+    if missing:
+        problems.append(f"missing feature(s): {', '.join(missing)}")
+    if feature_names is not None and [str(n) for n in feature_names] != names:
+        recorded = [str(n) for n in feature_names]
+        first = next((i for i, (a, b) in enumerate(zip(recorded, names)) if a != b), min(len(recorded), len(names)))
+        problems.append(f"artifacts record a different column order than the schema (first difference at column "
+                        f"{first}: {recorded[first] if first < len(recorded) else None!r} vs "
+                        f"{names[first] if first < len(names) else None!r})")
+    if problems:
+        raise SchemaError("feature schema mismatch: " + "; ".join(problems))
+    return np.array([position[name] for name in names], dtype=np.intp)
+
+
+def _permutation(schema, feature_names):
+    """
+    compile_permutation for an engine being loaded. Artifacts without a
+    manifest are checked against the order they record themselves, and
+    legacy artifacts recording none are taken to be in TRAINING_COLUMNS order.
+    """
+    if feature_names is not None:
+        feature_names = [str(n) for n in feature_names]
+    if schema is None:
+        schema = feature_schema(feature_names if feature_names is not None else TRAINING_COLUMNS)
+    return compile_permutation(schema, feature_names)
+
+
+# =========================================================================================
+# 3. ARTIFACT INGESTION
+# =========================================================================================
+def load_artifacts(artifact_dir=ARTIFACT_DIR):
+    """
+    Unpickles the Logistic Regression model, StandardScaler and LabelEncoder
+    from artifact_dir. Errors propagate to the caller.
+    """
+    with open(os.path.join(artifact_dir, MODEL_FILE), "rb") as f:
+        model = pickle.load(f)
+    with open(os.path.join(artifact_dir, SCALER_FILE), "rb") as f:
+        scaler = pickle.load(f)
+    with open(os.path.join(artifact_dir, ENCODER_FILE), "rb") as f:
+        label_encoder = pickle.load(f)
+    return model, scaler, label_encoder
+
+
+def load_feature_schema(artifact_dir=ARTIFACT_DIR):
+    """
+    Reads feature_schema.json from artifact_dir, or returns None when it is
+    absent (artifacts from before the manifest existed). An unreadable file
+    raises SchemaError.
+    """
+    path = os.path.join(artifact_dir, FEATURE_SCHEMA_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        raise SchemaError(f"{path}: unreadable feature schema ({e})")
+
+
+def write_feature_schema(artifact_dir, feature_names=TRAINING_COLUMNS):
+    schema = feature_schema(feature_names)
+    with open(os.path.join(artifact_dir, FEATURE_SCHEMA_FILE), "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2)
+        f.write("\n")
+    return schema
+
+
+def load_metrics(artifact_dir=ARTIFACT_DIR):
+    """
+    Reads the evaluation report written by train.py next to the artifacts.
+    Returns None when it is missing or unreadable, so callers can show n/a
+    rather than fail.
+    """
+    try:
+        with open(os.path.join(artifact_dir, METRICS_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# =========================================================================================
+# 4. FUSED SINGLE-PASS PREDICTOR
+# =========================================================================================
+def _link_function(model):
+    """
+    Mirrors LogisticRegression.predict_proba: one-vs-rest models normalize
+    per-class sigmoids, multinomial models apply a softmax. SGDClassifier
+    with log loss is always one-vs-rest for more than two classes.
+    """
+    multi_class = getattr(model, "multi_class", "auto")
+    n_classes = len(model.classes_)
+    if getattr(model, "loss", None) == "log_loss":
+        return "ovr" if n_classes > 2 else "softmax"
+    if multi_class == "ovr":
+        return "ovr"
+    if multi_class in ("auto", "deprecated", "warn") and n_classes > 2 and getattr(model, "solver", None) == "liblinear":
+        return "ovr"
+    return "softmax"
+
+
+def linear_parameters(model, scaler):
+    """
+    Extracts (coef, intercept, mean, scale, link) with one coef row per
+    predict_proba column. Binary models store a single logit z; it is expanded
+    to [0, z] so that a softmax reproduces sigmoid(z).
+    """
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    intercept = np.asarray(model.intercept_, dtype=np.float64)
+    n_features = coef.shape[1]
+    mean = scaler.mean_ if getattr(scaler, "with_mean", True) else np.zeros(n_features)
+    scale = scaler.scale_ if getattr(scaler, "with_std", True) else np.ones(n_features)
+    if coef.shape[0] == 1:
+        coef = np.vstack([np.zeros_like(coef), coef])
+        intercept = np.concatenate([[0.0], intercept])
+        return coef, intercept, mean, scale, "softmax"
+    return coef, intercept, mean, scale, _link_function(model)
+
+
+def _probabilities(link, logits):
+    if link == "ovr":
+        probs = 1.0 / (1.0 + np.exp(-logits))
+    else:
+        probs = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    probs /= probs.sum(axis=-1, keepdims=True)
+    return probs
+
+
+class FusedPredictor:
+    """
+    Folds StandardScaler into the logistic weights so that a single matmul
+    yields the class logits for raw 0-10 trait values:
+
+        z = ((x - mean) / scale) @ coef.T + intercept
+          = x @ (coef / scale).T + (intercept - coef @ (mean / scale))
+
+    Both the argmax label index and the probabilities come from that one pass.
+    """
+
+    def __init__(self, weights, bias, link="softmax"):
+        # weights: (n_features, n_classes), contiguous for the row-major matmul
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.bias = np.ascontiguousarray(bias, dtype=np.float64)
+        self.link = link
+
+    @classmethod
+    def from_estimators(cls, model, scaler):
+        return cls.from_parameters(*linear_parameters(model, scaler))
+
+    @classmethod
+    def from_parameters(cls, coef, intercept, mean, scale, link="softmax"):
+        folded = coef / scale
+        return cls(folded.T, intercept - folded @ mean, link)
+
+    def logits(self, features):
+        return np.asarray(features, dtype=np.float64) @ self.weights + self.bias
+
+    def probabilities_from_logits(self, logits):
+        return _probabilities(self.link, logits)
+
+    def predict_proba(self, features):
+        return self.probabilities_from_logits(self.logits(features))
+
+    def predict(self, features):
+        """Returns (class_indices, probabilities) from a single pass."""
+        probs = self.predict_proba(features)
+        return probs.argmax(axis=-1), probs
+
+
+# =========================================================================================
+# 5. DISCRETE CONTRIBUTION LOOKUP TABLE
+# =========================================================================================
+class ContributionTable:
+    """
+    Precomputed per-trait, per-class logit contributions for the discrete 0-10
+    slider space: table[i, v, c] = coef[c, i] * (v - mean[i]) / scale[i].
+    For integer inputs the class logits are intercept + 26 table lookups,
+    with no scaler call or float matmul.
+    """
+
+    def __init__(self, table, intercept, link="softmax"):
+        self.table = np.ascontiguousarray(table, dtype=np.float64)
+        self.intercept = np.ascontiguousarray(intercept, dtype=np.float64)
+        self.link = link
+        n_features, n_levels, n_classes = self.table.shape
+        # Flattened (n_features * n_levels, n_classes) view + per-feature row offsets for single rows
+        self._flat = self.table.reshape(n_features * n_levels, n_classes)
+        self._offsets = np.arange(n_features, dtype=np.intp) * n_levels
+        # Class-major (n_classes, n_features, n_levels) copy: batch lookups gather one
+        # contiguous 11-entry row per (class, trait) and accumulate in place
+        self._class_major = np.ascontiguousarray(self.table.transpose(2, 0, 1))
+
+    @classmethod
+    def from_estimators(cls, model, scaler):
+        return cls.from_parameters(*linear_parameters(model, scaler))
+
+    @classmethod
+    def from_parameters(cls, coef, intercept, mean, scale, link="softmax"):
+        levels = np.arange(TRAIT_MIN, TRAIT_MAX + 1, dtype=np.float64)
+        scaled_levels = (levels[None, :] - mean[:, None]) / scale[:, None]  # (n_features, n_levels)
+        return cls(scaled_levels[:, :, None] * coef.T[:, None, :], intercept, link)
+
+    def logits(self, features):
+        """
+        features: integer array (n_rows, 26) or (26,) with values in [0, 10].
+        Values index the table directly (TRAIT_MIN is 0); uint8 input is fine.
+        """
+        features = np.asarray(features)
+        if features.ndim == 1:
+            return self._flat[features + self._offsets].sum(axis=0) + self.intercept
+        # Feature-major copy so that each per-trait gather streams one contiguous column
+        columns = np.ascontiguousarray(features.T)
+        n_classes, n_features, _ = self._class_major.shape
+        out = np.empty((features.shape[0], n_classes))
+        for c in range(n_classes):
+            acc = np.full(features.shape[0], self.intercept[c])
+            for i in range(n_features):
+                acc += self._class_major[c, i].take(columns[i])
+            out[:, c] = acc
+        return out
+
+    def probabilities_from_logits(self, logits):
+        return _probabilities(self.link, logits)
+
+    def predict_proba(self, features):
+        return self.probabilities_from_logits(self.logits(features))
+
+    def predict(self, features):
+        probs = self.predict_proba(features)
+        return probs.argmax(axis=-1), probs
+
+
+class IncrementalScorer:
+    """
+    Keeps the class logits for one live trait vector and applies O(n_classes)
+    delta updates when a single trait changes:
+
+        logits += table[i, new] - table[i, old]
+
+    Every `recompute_every` updates the logits are rebuilt from scratch and the
+    accumulated floating-point drift is recorded in `max_drift`. Trait indices
+    and values index the table directly, so anything off its grid raises
+    ValueError instead of reading a neighbouring entry.
+    """
+
+    def __init__(self, table, features, recompute_every=256):
+        self.table = table
+        self.n_features, self.n_levels = table.table.shape[:2]
+        features = np.asarray(features)
+        if features.shape != (self.n_features,):
+            raise ValueError(f"expected {self.n_features} trait values, got shape {features.shape}")
+        if not np.all((features >= TRAIT_MIN) & (features < TRAIT_MIN + self.n_levels) & (features == np.rint(features))):
+            raise ValueError(f"trait values must be integers in [{TRAIT_MIN}, {TRAIT_MIN + self.n_levels - 1}]")
+        self.features = features.astype(np.intp)
+        self.recompute_every = recompute_every
+        self.updates = 0
+        self.max_drift = 0.0
+        self._since_recompute = 0
+        self.logits = table.logits(self.features)
+
+    def update(self, index, value):
+        if not 0 <= index < self.n_features or index != int(index):
+            raise ValueError(f"trait index {index!r} is outside [0, {self.n_features})")
+        if not TRAIT_MIN <= value < TRAIT_MIN + self.n_levels or value != int(value):
+            raise ValueError(f"trait value {value!r} must be an integer in [{TRAIT_MIN}, {TRAIT_MIN + self.n_levels - 1}]")
+        index, value = int(index), int(value)
+        old = self.features[index]
+        if old == value:
+            return
+        self.logits += self.table.table[index, value] - self.table.table[index, old]
+        self.features[index] = value
+        self.updates += 1
+        self._since_recompute += 1
+        if self._since_recompute >= self.recompute_every:
+            self.recompute()
+
+    def recompute(self):
+        """Full rescore; returns the drift between the running and fresh logits."""
+        fresh = self.table.logits(self.features)
+        drift = float(np.abs(fresh - self.logits).max())
+        self.max_drift = max(self.max_drift, drift)
+        self.logits = fresh
+        self._since_recompute = 0
+        return drift
+
+    def predict(self):
+        """Returns (class_index, probabilities) for the current vector."""
+        probs = self.table.probabilities_from_logits(self.logits)
+        return int(probs.argmax()), probs
+
+
+# =========================================================================================
+# 6. VECTORIZED INFERENCE ENGINE
+# =========================================================================================
+class InferenceEngine:
+    """
+    Batch-oriented wrapper around the scaler -> model -> encoder stack.
+    Accepts any (n_rows, 26) array in TRAIT_VECTORS order and scores all rows
+    with one fused matmul + softmax (see FusedPredictor). With
+    precompute_table=True the ContributionTable is built at load time and
+    integer inputs are scored through table lookups instead.
+
+    At load the artifacts' column order is validated against the feature
+    schema (compile_permutation; a mismatch raises SchemaError) and the
+    resulting permutation is folded into the weights, so the parameters are
+    held in TRAIT_VECTORS order whatever order the model was trained in.
+    """
+
+    def __init__(self, model, scaler, label_encoder, precompute_table=False, schema=None):
+        self.model = model
+        self.scaler = scaler
+        self.label_encoder = label_encoder
+        # Display labels aligned with the columns of predict_proba
+        classes = label_encoder.inverse_transform(model.classes_)
+        feature_names = getattr(scaler, "feature_names_in_", None)
+        self._init_parameters(*linear_parameters(model, scaler), classes, precompute_table,
+                              _permutation(schema, feature_names))
+
+    @classmethod
+    def from_parameters(cls, coef, intercept, mean, scale, link, classes, precompute_table=False,
+                        feature_names=None, schema=None):
+        """Builds an engine from raw arrays (e.g. a model bundle) without any sklearn objects."""
+        engine = cls.__new__(cls)
+        engine.model = engine.scaler = engine.label_encoder = None
+        engine._init_parameters(
+            np.asarray(coef, dtype=np.float64), np.asarray(intercept, dtype=np.float64),
+            np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64),
+            link, classes, precompute_table, _permutation(schema, feature_names),
+        )
+        return engine
+
+    def _init_parameters(self, coef, intercept, mean, scale, link, classes, precompute_table, permutation):
+        # Fold the column permutation into the parameters once: afterwards every scoring
+        # path takes TRAIT_VECTORS-ordered input as is, with no per-call reordering
+        self.permutation = permutation
+        if not np.array_equal(permutation, np.arange(len(permutation))):
+            inverse = np.argsort(permutation)
+            coef, mean, scale = coef[:, inverse], mean[inverse], scale[inverse]
+        self.classes = np.asarray(classes)
+        self.class_index = {label: i for i, label in enumerate(self.classes)}
+        self.coef, self.intercept, self.scaler_mean, self.scaler_scale, self.link = coef, intercept, mean, scale, link
+        self.fused = FusedPredictor.from_parameters(coef, intercept, mean, scale, link)
+        self.table = ContributionTable.from_parameters(coef, intercept, mean, scale, link) if precompute_table else None
+
+        # Model-only feature rankings: trait indices ordered by descending |coef| per class
+        self.coefficient_ranking = np.argsort(-np.abs(coef), axis=1, kind="stable")
+
+        # SHA-256 of everything the predictions depend on; identical for the pickles and the
+        # bundle exported from them, different as soon as any parameter changes
+        digest = hashlib.sha256(link.encode("utf-8"))
+        digest.update("\0".join(str(c) for c in self.classes).encode("utf-8"))
+        for array in (coef, intercept, mean, scale):
+            digest.update(np.ascontiguousarray(array, dtype="<f8").tobytes())
+        self.fingerprint = digest.hexdigest()
+
+    @classmethod
+    def from_directory(cls, artifact_dir=ARTIFACT_DIR, precompute_table=False):
+        return cls(*load_artifacts(artifact_dir), precompute_table=precompute_table,
+                   schema=load_feature_schema(artifact_dir))
+
+    def _predictor_for(self, features):
+        if self.table is not None and np.issubdtype(features.dtype, np.integer):
+            if features.size and (features.min() < TRAIT_MIN or features.max() > TRAIT_MAX):
+                raise ValueError(f"integer trait values must lie in [{TRAIT_MIN}, {TRAIT_MAX}]")
+            return self.table
+        return self.fused
+
+    def predict_proba(self, features):
+        features = np.asarray(features)
+        return self._predictor_for(features).predict_proba(features)
+
+    def sklearn_predict_proba(self, features):
+        """Reference path through scaler.transform and model.predict_proba."""
+        if self.model is None:
+            raise RuntimeError("engine was built from raw parameters; no sklearn estimators attached")
+        features = np.asarray(features, dtype=np.float64)[..., self.permutation]
+        with warnings.catch_warnings():
+            # The scaler was fitted on a DataFrame; the gather above puts positional arrays in model order
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            scaled = self.scaler.transform(features)
+        return self.model.predict_proba(scaled)
+
+    def top_coefficients(self, class_index, k=15):
+        """Returns (trait_indices, |coef| values) of the k largest-magnitude weights for a class."""
+        top = self.coefficient_ranking[class_index, :k]
+        return top, np.abs(self.coef[class_index, top])
+
+    def contributions(self, features):
+        """
+        Signed per-class logit contributions coef * scaled_value, computed for
+        all classes in one broadcast: (n_classes, 26) for one vector or
+        (n_rows, n_classes, 26) for a batch.
+        """
+        scaled = (np.asarray(features, dtype=np.float64) - self.scaler_mean) / self.scaler_scale
+        return scaled[..., None, :] * self.coef
+
+    def top_contributions(self, features, class_index, k=15):
+        """Returns (trait_indices, signed contributions) of the k largest |contribution| for one vector."""
+        contrib = self.contributions(features)[class_index]
+        top = np.argpartition(-np.abs(contrib), k - 1)[:k] if k < contrib.size else np.arange(contrib.size)
+        top = top[np.argsort(-np.abs(contrib[top]), kind="stable")]
+        return top, contrib[top]
+
+    def score(self, features):
+        """
+        Returns (labels, probabilities, confidence) for every row, where labels
+        are decoded class names and confidence is the max class probability.
+        """
+        features = np.asarray(features)
+        best, probs = self._predictor_for(features).predict(features)
+        return self.classes[best], probs, probs[np.arange(len(best)), best]
@@ -0,0 +1,322 @@
+"""
+Single-file model bundle: a pickle-free, mmap-friendly artifact format.
+
+Layout (little-endian):
+
+    offset 0   magic        4s   b"PIPB"
+    offset 4   version      u16  BUNDLE_FORMAT_VERSION
+    offset 6   reserved     u16
+    offset 8   header_len   u32
+    offset 12  header       JSON (utf-8), header_len bytes
+    ...        zero padding up to the next 64-byte boundary
+    data       raw arrays, each 64-byte aligned; offsets in the header are
+               relative to the start of this section
+
+The header records the class names, feature names, link function, the dtype /
+shape / offset of every array, the SHA-256 of the data section, the
+SHA-256 of the pickles the bundle was exported from and the feature schema.
+Loading uses numpy and mmap only, so the inference path never imports sklearn.
+
+Usage:
+    python model_bundle.py export            # pickles -> personality_model.pipb
+    python model_bundle.py info personality_model.pipb
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from ml_core import (
+    ARTIFACT_DIR,
+    ENCODER_FILE,
+    FEATURE_SCHEMA_FILE,
+    METRICS_FILE,
+    MODEL_FILE,
+    SCALER_FILE,
+    TRAINING_COLUMNS,
+    InferenceEngine,
+    compile_permutation,
+    feature_schema,
+    linear_parameters,
+    load_artifacts,
+    load_feature_schema,
+)
+
+BUNDLE_FILE = "personality_model.pipb"
+BUNDLE_MAGIC = b"PIPB"
+BUNDLE_FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<4sHHI")
+_ARRAY_NAMES = ("coef", "intercept", "mean", "scale")
+
+
+class BundleError(ValueError):
+    """Raised when a bundle file is malformed, corrupted or of an unsupported version."""
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_checksums(artifact_dir=ARTIFACT_DIR):
+    """SHA-256 of each pickle artifact present in artifact_dir."""
+    checksums = {}
+    for name in (MODEL_FILE, SCALER_FILE, ENCODER_FILE):
+        path = os.path.join(artifact_dir, name)
+        if os.path.exists(path):
+            checksums[name] = file_sha256(path)
+    return checksums
+
+
+def artifact_signature(artifact_dir=ARTIFACT_DIR):
+    """
+    (file name, size, mtime_ns) of every deployed artifact. Cheap enough to
+    poll on each dashboard rerun, so a redeploy is picked up without a restart.
+    """
+    signature = []
+    for name in (BUNDLE_FILE, MODEL_FILE, SCALER_FILE, ENCODER_FILE, FEATURE_SCHEMA_FILE, METRICS_FILE):
+        try:
+            stat = os.stat(os.path.join(artifact_dir, name))
+        except FileNotFoundError:
+            continue
+        signature.append((name, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+# =========================================================================================
+# 1. EXPORT
+# =========================================================================================
+def write_bundle(path, coef, intercept, mean, scale, link, classes, feature_names, extra=None):
+    """Writes the raw linear-model arrays and metadata to a bundle file."""
+    arrays = {
+        "coef": np.ascontiguousarray(coef, dtype="<f8"),
+        "intercept": np.ascontiguousarray(intercept, dtype="<f8"),
+        "mean": np.ascontiguousarray(mean, dtype="<f8"),
+        "scale": np.ascontiguousarray(scale, dtype="<f8"),
+    }
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    data = bytearray(offset)
+    for name, array in arrays.items():
+        start = layout[name]["offset"]
+        data[start:start + array.nbytes] = array.tobytes()
+
+    header = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "classes": [str(c) for c in classes],
+        "feature_names": list(feature_names),
+        "link": link,
+        "arrays": layout,
+        "data_nbytes": len(data),
+        "data_sha256": hashlib.sha256(data).hexdigest(),
+    }
+    header.update(extra or {})
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, 0, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (data_start - _PREAMBLE.size - len(header_bytes)))
+        f.write(data)
+    os.replace(tmp_path, path)
+    return header
+
+
+def export_bundle(artifact_dir=ARTIFACT_DIR, path=None):
+    """
+    Converts the pickled model/scaler/encoder in artifact_dir into a bundle
+    file. The feature schema (feature_schema.json, or one derived from the
+    scaler's column order) is validated and embedded in the header.
+    """
+    path = path or os.path.join(artifact_dir, BUNDLE_FILE)
+    model, scaler, label_encoder = load_artifacts(artifact_dir)
+    coef, intercept, mean, scale, link = linear_parameters(model, scaler)
+    feature_names = [str(n) for n in getattr(scaler, "feature_names_in_", TRAINING_COLUMNS)]
+    schema = load_feature_schema(artifact_dir) or feature_schema(feature_names)
+    compile_permutation(schema, feature_names)
+    return write_bundle(
+        path, coef, intercept, mean, scale, link,
+        label_encoder.inverse_transform(model.classes_), feature_names,
+        extra={"source_checksums": source_checksums(artifact_dir), "feature_schema": schema},
+    )
+
+
+# =========================================================================================
+# 2. LOAD
+# =========================================================================================
+class ModelBundle:
+    """
+    Parsed bundle; arrays are read-only views over the memory-mapped file.
+    close() (or using the bundle as a context manager) unmaps the file; the
+    engines it built keep working, since engine() copies the parameters.
+    """
+
+    def __init__(self, header, arrays, buf=None):
+        self.header = header
+        self.arrays = arrays
+        self.classes = np.asarray(header["classes"])
+        self.feature_names = header["feature_names"]
+        self.link = header["link"]
+        self._buf = buf
+
+    def engine(self, precompute_table=False, schema=None):
+        """
+        Builds an InferenceEngine. The column order in the header is checked
+        against schema (e.g. the deployed feature_schema.json), falling back
+        to the schema embedded at export; a mismatch raises SchemaError.
+        """
+        if self._buf is not None and self._buf.closed:
+            raise BundleError("bundle is closed")
+        # A few hundred bytes; copying keeps the engine from pinning the mapping open
+        arrays = {name: np.array(self.arrays[name]) for name in _ARRAY_NAMES}
+        return InferenceEngine.from_parameters(
+            arrays["coef"], arrays["intercept"], arrays["mean"], arrays["scale"],
+            self.link, self.classes, precompute_table=precompute_table,
+            feature_names=self.feature_names, schema=schema or self.header.get("feature_schema"),
+        )
+
+    def is_current(self, artifact_dir=ARTIFACT_DIR):
+        """
+        True when the bundle was exported from the pickles currently in
+        artifact_dir (or when no pickles are deployed alongside it).
+        """
+        current = source_checksums(artifact_dir)
+        return not current or current == self.header.get("source_checksums")
+
+    def close(self):
+        """Drops the array views and unmaps the file; views still held elsewhere raise BufferError."""
+        self.arrays = {}
+        if self._buf is not None:
+            self._buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _parse(path, buf, verify):
+    """Validates the preamble, header and array layout of a mapped bundle; returns (header, arrays)."""
+    if len(buf) < _PREAMBLE.size:
+        raise BundleError(f"{path}: truncated preamble")
+    magic, version, _, header_len = _PREAMBLE.unpack_from(buf, 0)
+    if magic != BUNDLE_MAGIC:
+        raise BundleError(f"{path}: not a model bundle (bad magic {magic!r})")
+    if version != BUNDLE_FORMAT_VERSION:
+        raise BundleError(f"{path}: unsupported bundle format version {version}")
+    if _PREAMBLE.size + header_len > len(buf):
+        raise BundleError(f"{path}: truncated header")
+    try:
+        header = json.loads(bytes(buf[_PREAMBLE.size:_PREAMBLE.size + header_len]))
+    except ValueError as e:
+        raise BundleError(f"{path}: unreadable header ({e})")
+
+    # Every field is checked before any array view is created: a missing key or a value of the
+    # wrong type is a malformed header, reported as BundleError like any other corruption
+    try:
+        if not isinstance(header, dict):
+            raise TypeError("header is not a JSON object")
+        data_nbytes = header["data_nbytes"]
+        if not isinstance(data_nbytes, int) or data_nbytes < 0:
+            raise ValueError(f"invalid data_nbytes {data_nbytes!r}")
+        classes, feature_names, link = header["classes"], header["feature_names"], header["link"]
+        if not isinstance(classes, list) or not isinstance(feature_names, list) or not isinstance(link, str):
+            raise TypeError("classes and feature_names must be lists and link a string")
+        specs = {}
+        for name in _ARRAY_NAMES:
+            spec = header["arrays"][name]
+            dtype, shape, offset = np.dtype(spec["dtype"]), [int(n) for n in spec["shape"]], spec["offset"]
+            if dtype.kind != "f" or not isinstance(offset, int) or offset < 0 or min(shape, default=0) < 0:
+                raise ValueError(f"invalid layout for array '{name}'")
+            specs[name] = dtype, shape, offset
+        expected_sha256 = str(header["data_sha256"])
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise BundleError(f"{path}: malformed header ({type(e).__name__}: {e})") from None
+
+    data_start = _align(_PREAMBLE.size + header_len)
+    data_end = data_start + data_nbytes
+    if data_end > len(buf):
+        raise BundleError(f"{path}: truncated data section")
+    if verify and hashlib.sha256(buf[data_start:data_end]).hexdigest() != expected_sha256:
+        raise BundleError(f"{path}: checksum mismatch")
+    for name, (dtype, shape, offset) in specs.items():
+        if offset + int(np.prod(shape)) * dtype.itemsize > data_nbytes:
+            raise BundleError(f"{path}: array '{name}' exceeds the data section")
+
+    coef_shape = specs["coef"][1]
+    if len(coef_shape) != 2:
+        raise BundleError(f"{path}: coef must be two-dimensional")
+    n_classes, n_features = coef_shape
+    if (len(classes) != n_classes or len(feature_names) != n_features or specs["intercept"][1] != [n_classes]
+            or specs["mean"][1] != [n_features] or specs["scale"][1] != [n_features]):
+        raise BundleError(f"{path}: header does not match array shapes")
+
+    arrays = {}
+    for name, (dtype, shape, offset) in specs.items():
+        arrays[name] = np.frombuffer(buf, dtype=dtype, count=int(np.prod(shape)), offset=data_start + offset).reshape(shape)
+    return header, arrays
+
+
+def load_bundle(path=None, verify=True):
+    """
+    Memory-maps and validates a bundle file. Raises BundleError on any
+    inconsistency, including a truncated file or a header with missing or
+    mistyped fields. The returned bundle owns the mapping; close it, or use it
+    in a with block, once its engine is built.
+    """
+    path = path or os.path.join(ARTIFACT_DIR, BUNDLE_FILE)
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # mmap refuses empty files
+            raise BundleError(f"{path}: truncated preamble") from None
+    try:
+        header, arrays = _parse(path, buf, verify)
+    except BaseException:
+        buf.close()
+        raise
+    return ModelBundle(header, arrays, buf)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or inspect the single-file model bundle.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="convert the .pkl artifacts into a bundle")
+    export.add_argument("--artifacts", default=ARTIFACT_DIR, help="directory holding the .pkl artifacts")
+    export.add_argument("--output", help=f"bundle path (default: <artifacts>/{BUNDLE_FILE})")
+    info = sub.add_parser("info", help="validate a bundle and print its header")
+    info.add_argument("path", nargs="?", default=os.path.join(ARTIFACT_DIR, BUNDLE_FILE))
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        header = export_bundle(args.artifacts, args.output)
+        print(f"wrote bundle: {len(header['classes'])} classes x {len(header['feature_names'])} features, "
+              f"sha256 {header['data_sha256'][:12]}", file=sys.stderr)
+    else:
+        with load_bundle(args.path) as bundle:
+            print(json.dumps(bundle.header, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
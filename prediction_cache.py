@@ -0,0 +1,146 @@
+"""
+Process-wide memoization of interactive predictions.
+
+Every trait is an integer 0-10, so a full 26-trait profile packs losslessly
+into 13 bytes (two 4-bit values per byte). PredictionCache maps those packed
+keys to the predicted class index and probability vector, shared by every
+session of the server process.
+
+Entries expire after a TTL and are evicted least-recently-used first once
+either the entry count or the approximate memory cap is exceeded. Every
+lookup carries the engine's model fingerprint (InferenceEngine.fingerprint);
+when it differs from the one the cache was filled under, the whole cache is
+dropped, so a redeployed model never serves stale predictions.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from ml_core import N_FEATURES, TRAIT_MAX, TRAIT_MIN
+
+KEY_BYTES = (N_FEATURES + 1) // 2
+
+# Approximate per-entry bookkeeping on top of the key and probability array:
+# OrderedDict node and slot, the value tuple and its int/float members.
+_ENTRY_OVERHEAD = 200
+
+
+def pack_traits(features):
+    """
+    Packs a 26-trait vector into a 13-byte key, or returns None when a value
+    is not an integer in [TRAIT_MIN, TRAIT_MAX] (such inputs are not cached).
+
+    The integer and grid checks use NumPy; the range check and the nibble
+    packing run on a Python list, which is cheaper than array ops for only
+    26 values.
+    """
+    values = np.asarray(features)
+    if values.size != N_FEATURES:
+        raise ValueError(f"expected {N_FEATURES} trait values, got {values.size}")
+    if values.dtype.kind == "f":
+        rounded = np.rint(values)
+        if not np.array_equal(rounded, values):
+            return None
+        values = rounded.astype(np.int64)
+    elif values.dtype.kind not in "iu":
+        return None
+    nibbles = values.reshape(-1).tolist()
+    if min(nibbles) < TRAIT_MIN or max(nibbles) > TRAIT_MAX:
+        return None
+    nibbles.extend([0] * (2 * KEY_BYTES - N_FEATURES))
+    return bytes([nibbles[i] << 4 | nibbles[i + 1] for i in range(0, 2 * KEY_BYTES, 2)])
+
+
+def unpack_traits(key):
+    packed = np.frombuffer(key, dtype=np.uint8)
+    nibbles = np.empty(KEY_BYTES * 2, dtype=np.uint8)
+    nibbles[0::2] = packed >> 4
+    nibbles[1::2] = packed & 0x0F
+    return nibbles[:N_FEATURES]
+
+
+class PredictionCache:
+    """Thread-safe LRU + TTL cache of (class index, probabilities) keyed by pack_traits."""
+
+    def __init__(self, max_entries=100_000, max_bytes=16 * 2**20, ttl_seconds=3600.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.fingerprint = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._clock = clock
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bind(self, fingerprint):
+        # Caller holds the lock
+        if fingerprint != self.fingerprint:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self.fingerprint = fingerprint
+
+    def get(self, key, fingerprint):
+        """Returns (class_index, probs) for key, or None on a miss or expired entry."""
+        with self._lock:
+            self._bind(fingerprint)
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= self._clock():
+                del self._entries[key]
+                self._bytes -= entry[3]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, key, fingerprint, class_index, probs):
+        probs = np.array(probs, dtype=np.float64)
+        probs.flags.writeable = False
+        cost = sys.getsizeof(key) + sys.getsizeof(probs) + _ENTRY_OVERHEAD
+        with self._lock:
+            self._bind(fingerprint)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[3]
+            self._entries[key] = (int(class_index), probs, self._clock() + self.ttl_seconds, cost)
+            self._bytes += cost
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "fingerprint": self.fingerprint,
+            }
@@ -0,0 +1,203 @@
+"""
+Multi-process batch scoring over shared memory.
+
+ScoringPool starts `workers` processes that each load the model artifacts
+once (in the pool initializer) and attach to two preallocated shared-memory
+blocks. Each block holds an input matrix of `workers * chunk_size` rows and
+the matching output buffers (class probabilities, predicted class index and
+confidence). The parent copies rows into a block and hands each worker only
+a (block, start, stop) triple; workers read their slice in place and write
+results straight into the output buffers, so no feature or result array is
+ever pickled.
+
+The two blocks are used alternately: while the workers score block k, the
+parent reads the next input chunk and writes out the results of block k-1.
+
+    from scoring_pool import ScoringPool
+
+    with ScoringPool(workers=4) as pool:
+        stats = pool.score_stream("respondents.csv", "scored.parquet")
+"""
+
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ml_core import ARTIFACT_DIR, N_FEATURES, InferenceEngine
+
+N_BLOCKS = 2
+
+# Worker-process globals, populated by _init_worker
+_engine = None
+_views = None
+
+
+# =========================================================================================
+# 1. SHARED BLOCKS
+# =========================================================================================
+def _block_layout(capacity, n_features, n_classes):
+    """(name, dtype, shape) of every array in one block, in memory order."""
+    return (
+        ("features", np.float64, (capacity, n_features)),
+        ("probs", np.float64, (capacity, n_classes)),
+        ("confidence", np.float64, (capacity,)),
+        ("pred", np.int16, (capacity,)),
+    )
+
+
+def _block_views(buf, layout):
+    views, offset = {}, 0
+    for name, dtype, shape in layout:
+        array = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+        views[name] = array
+        offset += array.nbytes
+    return views
+
+
+def _block_nbytes(layout):
+    return sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in layout)
+
+
+# =========================================================================================
+# 2. WORKER SIDE
+# =========================================================================================
+def _init_worker(artifact_dir, block_names, layout):
+    global _engine, _views
+    _engine = InferenceEngine.from_directory(artifact_dir)
+    _views = []
+    for name in block_names:
+        # Pool workers share the parent's resource tracker (fork and spawn alike), so
+        # attaching here does not add an owner; the parent alone unlinks the segments.
+        shm = shared_memory.SharedMemory(name=name)
+        _views.append((shm, _block_views(shm.buf, layout)))
+
+
+def _score_slice(task):
+    block, start, stop = task
+    views = _views[block][1]
+    probs = _engine.fused.predict_proba(views["features"][start:stop])
+    views["probs"][start:stop] = probs
+    views["pred"][start:stop] = probs.argmax(axis=1)
+    views["confidence"][start:stop] = probs.max(axis=1)
+    return stop - start
+
+
+# =========================================================================================
+# 3. PARENT SIDE
+# =========================================================================================
+class ScoringPool:
+    """Process pool scoring fixed-size slices of shared-memory blocks."""
+
+    def __init__(self, workers=None, chunk_size=None, artifact_dir=ARTIFACT_DIR, n_features=N_FEATURES,
+                 mp_context=None):
+        from batch_scoring import DEFAULT_CHUNK_SIZE
+
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        self.block_rows = self.workers * self.chunk_size
+        # The parent only needs the class names; the workers load their own engine
+        self.classes = InferenceEngine.from_directory(artifact_dir).classes
+        self._layout = _block_layout(self.block_rows, n_features, len(self.classes))
+
+        self._segments = []
+        self._blocks = []
+        self._pool = None
+        try:
+            for _ in range(N_BLOCKS):
+                shm = shared_memory.SharedMemory(create=True, size=_block_nbytes(self._layout))
+                self._segments.append(shm)
+                self._blocks.append(_block_views(shm.buf, self._layout))
+            ctx = mp_context or multiprocessing.get_context()
+            self._pool = ctx.Pool(
+                self.workers, initializer=_init_worker,
+                initargs=(artifact_dir, [shm.name for shm in self._segments], self._layout),
+            )
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._blocks = []
+        for shm in self._segments:
+            shm.close()
+            shm.unlink()
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _dispatch(self, block, features):
+        n = len(features)
+        self._blocks[block]["features"][:n] = features
+        tasks = [(block, start, min(start + self.chunk_size, n)) for start in range(0, n, self.chunk_size)]
+        return self._pool.map_async(_score_slice, tasks)
+
+    def _iter_scored(self, chunks):
+        """
+        Scores an iterable of (n_rows, n_features) arrays of at most block_rows
+        rows. Yields (block views, n_rows) once each chunk is done; the views
+        are only valid until the next item is requested.
+        """
+        pending = None
+        for i, features in enumerate(chunks):
+            block = i % N_BLOCKS
+            result = self._dispatch(block, features)
+            if pending is not None:
+                pending[2].get()
+                yield self._blocks[pending[0]], pending[1]
+            pending = (block, len(features), result)
+        if pending is not None:
+            pending[2].get()
+            yield self._blocks[pending[0]], pending[1]
+
+    def score_array(self, features):
+        """In-memory scoring; returns (labels, probs, confidence) like InferenceEngine.score."""
+        features = np.asarray(features)
+        probs = np.empty((len(features), len(self.classes)))
+        pred = np.empty(len(features), dtype=np.int16)
+        confidence = np.empty(len(features))
+        chunks = (features[i:i + self.block_rows] for i in range(0, len(features), self.block_rows))
+        offset = 0
+        for views, n in self._iter_scored(chunks):
+            probs[offset:offset + n] = views["probs"][:n]
+            pred[offset:offset + n] = views["pred"][:n]
+            confidence[offset:offset + n] = views["confidence"][:n]
+            offset += n
+        return self.classes[pred], probs, confidence
+
+    def score_stream(self, source, output_path, name=None, progress=None):
+        """
+        Like batch_scoring.score_stream, with the scoring spread over the
+        workers. Returns a stats dict with rows, seconds, rows_per_sec and
+        workers.
+        """
+        from batch_scoring import ResultWriter, iter_feature_chunks, remove_partial, results_frame
+
+        rows = 0
+        start = time.perf_counter()
+        try:
+            with ResultWriter(output_path) as writer:
+                chunks = iter_feature_chunks(source, self.block_rows, name=name)
+                for views, n in self._iter_scored(chunks):
+                    writer.write(results_frame(
+                        self.classes, self.classes[views["pred"][:n]], views["probs"][:n], views["confidence"][:n]
+                    ))
+                    rows += n
+                    if progress is not None:
+                        progress(rows)
+        except BaseException:
+            remove_partial(output_path)
+            raise
+        elapsed = time.perf_counter() - start
+        return {"rows": rows, "seconds": elapsed, "rows_per_sec": rows / elapsed if elapsed else 0.0,
+                "workers": self.workers}
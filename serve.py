@@ -0,0 +1,316 @@
+"""
+Standalone async HTTP prediction service for the Personality Intelligence Platform.
+
+Wraps the same artifacts as the dashboard's load_ml_infrastructure and serves
+them over plain HTTP/1.1 (stdlib asyncio, keep-alive supported):
+
+    GET  /health          liveness + micro-batcher statistics
+    POST /predict         {"features": [26 values]} or {"traits": {"Social Energy": 7, ...}}
+    POST /predict/batch   {"instances": [[26 values], ...]}
+
+Concurrent /predict calls are coalesced by a MicroBatcher into a single
+vectorized predict_proba call within a configurable wait window.
+/predict/batch bodies are parsed, scored and encoded in a worker thread so a
+large batch does not stall the event loop.
+
+Usage:
+    python serve.py --port 8765 --max-batch-size 256 --max-wait-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+import numpy as np
+
+from ml_core import ARTIFACT_DIR, N_FEATURES, TRAINING_COLUMNS, TRAIT_VECTORS, InferenceEngine
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+logger = logging.getLogger(__name__)
+
+
+class RequestError(Exception):
+    """Client-side error carrying the HTTP status to respond with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# =========================================================================================
+# 1. PAYLOAD VALIDATION
+# =========================================================================================
+def parse_vector(obj):
+    """
+    Accepts a list of 26 numbers in TRAIT_VECTORS order, or a mapping keyed by
+    display or training trait names. Returns a float64 array of shape (26,).
+    """
+    if isinstance(obj, dict):
+        values = []
+        for display_name, training_name in zip(TRAIT_VECTORS, TRAINING_COLUMNS):
+            if display_name in obj:
+                values.append(obj[display_name])
+            elif training_name in obj:
+                values.append(obj[training_name])
+            else:
+                raise RequestError(400, f"missing trait '{display_name}'")
+        obj = values
+    try:
+        vector = np.asarray(obj, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise RequestError(400, "trait values must be numeric")
+    if vector.shape != (N_FEATURES,):
+        raise RequestError(400, f"expected {N_FEATURES} trait values, got shape {vector.shape}")
+    if not np.all((vector >= 0) & (vector <= 10)):
+        raise RequestError(400, "trait values must lie in [0, 10]")
+    return vector
+
+
+def format_result(classes, label, probs, confidence):
+    return {
+        "prediction": str(label),
+        "probabilities": {str(name): float(p) for name, p in zip(classes, probs)},
+        "confidence": float(confidence),
+    }
+
+
+def _json_object(body):
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise RequestError(400, "body must be JSON")
+    if not isinstance(payload, dict):
+        raise RequestError(400, "body must be a JSON object")
+    return payload
+
+
+# =========================================================================================
+# 2. DYNAMIC MICRO-BATCHER
+# =========================================================================================
+class MicroBatcher:
+    """
+    Collects single-row requests from concurrent callers and scores them
+    together. A batch is flushed when it reaches max_batch_size or when
+    max_wait_ms has elapsed since its first request arrived.
+    """
+
+    def __init__(self, engine, max_batch_size=256, max_wait_ms=2.0):
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.items = 0
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, vector):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((vector, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            features = np.stack([vector for vector, _ in batch])
+            try:
+                labels, probs, confidence = self.engine.score(features)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for i, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result(format_result(self.engine.classes, labels[i], probs[i], confidence[i]))
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+
+# =========================================================================================
+# 3. HTTP SERVICE
+# =========================================================================================
+class PredictionService:
+    """Minimal HTTP/1.1 front end dispatching to the micro-batcher or the batch path."""
+
+    def __init__(self, engine, max_batch_size=256, max_wait_ms=2.0):
+        self.engine = engine
+        self.batcher = MicroBatcher(engine, max_batch_size, max_wait_ms)
+
+    async def dispatch(self, method, path, body):
+        if path == "/health":
+            if method != "GET":
+                raise RequestError(405, "use GET")
+            return {"status": "ok", "classes": [str(c) for c in self.engine.classes], "batcher": self.batcher.stats()}
+        if path not in ("/predict", "/predict/batch"):
+            raise RequestError(404, f"unknown path '{path}'")
+        if method != "POST":
+            raise RequestError(405, "use POST")
+
+        if path == "/predict/batch":
+            # A body of up to MAX_BODY_BYTES takes seconds to parse, score and encode; doing that on
+            # the event loop would stall the micro-batcher and every /predict caller behind it
+            return await asyncio.get_running_loop().run_in_executor(None, self.predict_batch, body)
+
+        payload = _json_object(body)
+        if "features" in payload:
+            vector = parse_vector(payload["features"])
+        elif "traits" in payload:
+            vector = parse_vector(payload["traits"])
+        else:
+            raise RequestError(400, "expected 'features' or 'traits'")
+        return await self.batcher.submit(vector)
+
+    def predict_batch(self, body):
+        """Scores a /predict/batch body synchronously; returns the encoded JSON response."""
+        instances = _json_object(body).get("instances")
+        if not isinstance(instances, list) or not instances:
+            raise RequestError(400, "expected a non-empty 'instances' list")
+        features = np.stack([parse_vector(row) for row in instances])
+        labels, probs, confidence = self.engine.score(features)
+        return json.dumps({
+            "predictions": [
+                format_result(self.engine.classes, labels[i], probs[i], confidence[i]) for i in range(len(labels))
+            ]
+        }).encode()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                # A body that is not read leaves the stream unframed: answer and close (body is None)
+                body = None
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, payload = 400, {"error": "invalid Content-Length"}
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "request body too large"}
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = 200, await self.dispatch(method, target.split("?", 1)[0], body)
+                    except RequestError as e:
+                        status, payload = e.status, {"error": str(e)}
+                    except Exception:
+                        logger.exception("Unhandled error serving %s %s", method, target)
+                        status, payload = 500, {"error": "internal server error"}
+
+                keep_alive = (
+                    body is not None
+                    and version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                # /predict/batch responses arrive already encoded (see predict_batch)
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the personality classifier over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=256, help="largest coalesced /predict batch")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="how long a batch waits for more requests")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR, help="directory holding the .pkl artifacts")
+    args = parser.parse_args(argv)
+
+    service = PredictionService(InferenceEngine.from_directory(args.artifacts), args.max_batch_size, args.max_wait_ms)
+
+    def ready(server):
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"serving on {addresses}", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
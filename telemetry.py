@@ -0,0 +1,76 @@
+"""
+Latency telemetry for the prediction path.
+
+StageTimer records a high-resolution per-stage breakdown of a single
+prediction; LatencyWindow keeps a bounded rolling sample of those breakdowns
+and reports p50/p95/p99. The dashboard keeps one window per session and one
+per process.
+"""
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Stages of one interactive prediction. The scaler is folded into the logistic
+# weights (see ml_core.FusedPredictor), so "logits" covers scale + linear layer.
+# A prediction-cache hit skips "logits" and "softmax".
+STAGES = ("gather", "cache", "logits", "softmax", "decode")
+PERCENTILES = (50, 95, 99)
+
+
+class StageTimer:
+    """
+    Lap timer: each lap(stage) call attributes the time since the previous lap
+    (or construction) to that stage, using perf_counter_ns.
+    """
+
+    def __init__(self):
+        self.durations_ns = {}
+        self._last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        now = time.perf_counter_ns()
+        self.durations_ns[stage] = self.durations_ns.get(stage, 0) + (now - self._last)
+        self._last = now
+
+    @property
+    def total_ns(self):
+        return sum(self.durations_ns.values())
+
+    def as_ms(self):
+        breakdown = {stage: ns / 1e6 for stage, ns in self.durations_ns.items()}
+        breakdown["total"] = self.total_ns / 1e6
+        return breakdown
+
+
+class LatencyWindow:
+    """Thread-safe rolling window of the most recent `maxlen` stage breakdowns."""
+
+    def __init__(self, maxlen=1000):
+        self.maxlen = maxlen
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, timer):
+        with self._lock:
+            for stage, ms in timer.as_ms().items():
+                self._samples.setdefault(stage, deque(maxlen=self.maxlen)).append(ms)
+
+    def stages(self):
+        """Stage names in first-recorded order."""
+        with self._lock:
+            return list(self._samples)
+
+    def count(self, stage="total"):
+        with self._lock:
+            return len(self._samples.get(stage, ()))
+
+    def percentiles(self, stage="total", qs=PERCENTILES):
+        """Returns {q: milliseconds} for the stage, or None when nothing was recorded."""
+        with self._lock:
+            samples = np.fromiter(self._samples.get(stage, ()), dtype=np.float64)
+        if samples.size == 0:
+            return None
+        return dict(zip(qs, np.percentile(samples, qs)))
@@ -0,0 +1,35 @@
+"""Shared fixtures; puts the repository root on sys.path so tests import the flat top-level modules."""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """InferenceEngine over the deployed pickles, with the contribution lookup table precomputed."""
+    from ml_core import InferenceEngine
+
+    with warnings.catch_warnings():
+        # The shipped pickles may come from an older scikit-learn release
+        warnings.simplefilter("ignore")
+        return InferenceEngine.from_directory(precompute_table=True)
+
+
+@pytest.fixture(scope="session")
+def sklearn_reference(engine):
+    """reference(X) -> (labels, probabilities) of model.predict_proba(scaler.transform(X)) for TRAIT_VECTORS-ordered X."""
+
+    def reference(features):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            scaled = engine.scaler.transform(np.asarray(features, dtype=np.float64)[..., engine.permutation])
+        probs = engine.model.predict_proba(scaled)
+        return engine.model.classes_[probs.argmax(axis=1)], probs
+
+    return reference
@@ -0,0 +1,41 @@
+"""Flush and close give up instead of hanging when the writer cannot drain the queue."""
+
+import atexit
+import time
+
+import pytest
+
+import audit_log
+from audit_log import AuditLog
+
+
+@pytest.fixture
+def stalled_log(tmp_path):
+    # Stop the writer thread behind the log's back, then fill the one-slot queue
+    log = AuditLog(str(tmp_path), max_queue=1, policy="drop_oldest")
+    log._queue.put(audit_log._STOP)
+    log._thread.join(5)
+    assert not log._thread.is_alive()
+    log._queue.put(("event",))
+    yield log
+    atexit.unregister(log.close)
+
+
+def test_flush_returns_when_writer_is_gone(stalled_log):
+    started = time.monotonic()
+    assert stalled_log.flush() is False
+    assert time.monotonic() - started < 1.0
+
+
+def test_close_returns_when_writer_is_gone(stalled_log):
+    started = time.monotonic()
+    stalled_log.close(timeout=None)
+    assert time.monotonic() - started < 1.0
+
+
+def test_marker_requeue_does_not_block_when_full(stalled_log):
+    stalled_log._queue.get_nowait()
+    stalled_log._queue.put(object())
+    started = time.monotonic()
+    assert stalled_log._offer(("event",)) is False
+    assert time.monotonic() - started < 1.0
@@ -0,0 +1,58 @@
+"""Malformed .pifs files are rejected with FeatureStoreError, never a raw KeyError/TypeError."""
+
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store import DATA_OFFSET, STORE_FORMAT_VERSION, STORE_MAGIC, _PREAMBLE, FeatureStoreError, convert, open_store
+from ml_core import TRAINING_COLUMNS
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("store")
+    source = directory / "corpus.csv"
+    pd.DataFrame(np.random.default_rng(0).integers(0, 11, (100, 26)), columns=TRAINING_COLUMNS).to_csv(source, index=False)
+    path = directory / "corpus.pifs"
+    header = convert(str(source), str(path))
+    return path, header
+
+
+def _with_header(store, header):
+    path, _ = store
+    header_bytes = json.dumps(header).encode("utf-8")
+    preamble = _PREAMBLE.pack(STORE_MAGIC, STORE_FORMAT_VERSION, 0, len(header_bytes))
+    return (preamble + header_bytes).ljust(DATA_OFFSET, b"\0") + path.read_bytes()[DATA_OFFSET:]
+
+
+def test_round_trip(store):
+    path, header = store
+    assert len(open_store(str(path))) == header["n_rows"] == 100
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda h: [h],
+    lambda h: {k: v for k, v in h.items() if k != "n_rows"},
+    lambda h: {k: v for k, v in h.items() if k != "data_offset"},
+    lambda h: {**h, "n_rows": "100"},
+    lambda h: {**h, "data_offset": 0},
+    lambda h: {**h, "dtype": "<f8"},
+    lambda h: {**h, "feature_names": None},
+], ids=["not-an-object", "no-n_rows", "no-data_offset", "n_rows-string", "offset-in-header", "dtype", "no-names"])
+def test_malformed_header(store, mutate):
+    blob = _with_header(store, mutate(dict(store[1])))
+    with pytest.raises(FeatureStoreError):
+        open_store(io.BytesIO(blob))
+
+
+def test_truncated_files(store, tmp_path):
+    path, _ = store
+    raw = path.read_bytes()
+    for blob in (b"", raw[:_PREAMBLE.size], raw[:DATA_OFFSET + 10]):
+        truncated = tmp_path / "truncated.pifs"
+        truncated.write_bytes(blob)
+        with pytest.raises(FeatureStoreError):
+            open_store(str(truncated))
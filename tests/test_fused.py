@@ -0,0 +1,34 @@
+"""FusedPredictor must reproduce the scaler -> model path it replaces."""
+
+import numpy as np
+import pytest
+
+from ml_core import N_FEATURES, TRAIT_MAX, TRAIT_MIN, FusedPredictor
+
+
+@pytest.mark.parametrize("dtype", [np.int64, np.float64])
+def test_matches_sklearn_on_random_vectors(engine, sklearn_reference, dtype):
+    features = np.random.default_rng(0).integers(TRAIT_MIN, TRAIT_MAX + 1, size=(20_000, N_FEATURES)).astype(dtype)
+    expected_labels, expected_probs = sklearn_reference(features)
+
+    index, probs = engine.fused.predict(features)
+    np.testing.assert_array_equal(engine.model.classes_[index], expected_labels)
+    np.testing.assert_allclose(probs, expected_probs, rtol=0, atol=1e-12)
+
+
+def test_matches_sklearn_on_fractional_vectors(engine, sklearn_reference):
+    features = np.random.default_rng(1).uniform(TRAIT_MIN, TRAIT_MAX, size=(2_000, N_FEATURES))
+    np.testing.assert_allclose(engine.fused.predict_proba(features), sklearn_reference(features)[1],
+                               rtol=0, atol=1e-12)
+
+
+def test_single_row(engine, sklearn_reference):
+    row = np.full((1, N_FEATURES), 5)
+    np.testing.assert_allclose(engine.fused.predict_proba(row), sklearn_reference(row)[1], rtol=0, atol=1e-12)
+
+
+def test_from_estimators_matches_engine(engine):
+    fused = FusedPredictor.from_estimators(engine.model, engine.scaler)
+    features = np.random.default_rng(2).integers(TRAIT_MIN, TRAIT_MAX + 1, size=(500, N_FEATURES))
+    np.testing.assert_allclose(fused.predict_proba(features[:, engine.permutation]),
+                               engine.fused.predict_proba(features), rtol=0, atol=1e-12)
@@ -0,0 +1,79 @@
+"""The metrics endpoint serves the dashboard's instruments in the Prometheus text format."""
+
+from urllib.request import urlopen
+
+import pytest
+
+from instrumentation import CONTENT_TYPE, DashboardMetrics, parse_exposition, serve_metrics
+from telemetry import StageTimer
+
+
+def _timer(durations_ns):
+    timer = StageTimer()
+    timer.durations_ns = durations_ns
+    return timer
+
+
+@pytest.fixture
+def metrics():
+    metrics = DashboardMetrics()
+    stats = {"entries": 3, "hits": 2}
+    metrics.add_stats_source("pip_test_cache", lambda: stats, counters=["hits"], gauges=["entries"],
+                             description="Test cache")
+    for cache_hit in (False, False, True):
+        stages = {"gather": 2_000, "cache": 1_000}
+        if not cache_hit:
+            stages.update(logits=5_000, softmax=3_000, decode=1_000)
+        metrics.observe_prediction(_timer(stages), cache_hit)
+    metrics.observe_rerun("app", _timer({"setup": 40_000_000}))
+    metrics.observe_chart_build("radar", 0.03)
+    return metrics
+
+
+@pytest.fixture
+def scrape(metrics):
+    server = serve_metrics(metrics.registry, port=0)
+    host, port = server.server_address[:2]
+    try:
+        with urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            yield response.status, response.headers["Content-Type"], response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_endpoint_serves_text_exposition(scrape):
+    status, content_type, text = scrape
+    assert status == 200
+    assert content_type == CONTENT_TYPE
+    assert "# TYPE pip_prediction_stage_seconds histogram" in text
+    assert "# TYPE pip_predictions_total counter" in text
+
+
+def test_scraped_samples(scrape):
+    samples = parse_exposition(scrape[2])
+    assert samples[("pip_predictions_total", '{source="model"}')] == 2
+    assert samples[("pip_predictions_total", '{source="cache"}')] == 1
+    assert samples[("pip_prediction_stage_seconds_count", '{stage="total"}')] == 3
+    assert samples[("pip_prediction_stage_seconds_count", '{stage="logits"}')] == 2
+    assert samples[("pip_prediction_stage_seconds_bucket", '{stage="total",le="+Inf"}')] == 3
+    assert samples[("pip_prediction_stage_seconds_bucket", '{stage="total",le="1e-05"}')] == 1
+    assert samples[("pip_prediction_stage_seconds_sum", '{stage="total"}')] == pytest.approx(27e-6, abs=1e-12)
+    assert samples[("pip_rerun_seconds_bucket", '{scope="app",le="0.05"}')] == 1
+    assert samples[("pip_chart_build_seconds_count", '{chart="radar"}')] == 1
+    assert samples[("pip_test_cache_hits_total", "")] == 2
+    assert samples[("pip_test_cache_entries", "")] == 3
+
+
+def test_unknown_path_is_404(metrics):
+    from urllib.error import HTTPError
+
+    server = serve_metrics(metrics.registry, port=0)
+    host, port = server.server_address[:2]
+    try:
+        with pytest.raises(HTTPError) as info:
+            urlopen(f"http://{host}:{port}/other", timeout=5)
+        assert info.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
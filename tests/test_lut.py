@@ -0,0 +1,37 @@
+"""ContributionTable must give sklearn's labels and probabilities on the integer slider grid."""
+
+import numpy as np
+import pytest
+
+from ml_core import N_FEATURES, TRAIT_MAX, TRAIT_MIN, ContributionTable
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.int64])
+def test_batch_matches_sklearn(engine, sklearn_reference, dtype):
+    features = np.random.default_rng(1).integers(TRAIT_MIN, TRAIT_MAX + 1, size=(20_000, N_FEATURES)).astype(dtype)
+    expected_labels, expected_probs = sklearn_reference(features)
+
+    index, probs = engine.table.predict(features)
+    np.testing.assert_array_equal(engine.model.classes_[index], expected_labels)
+    np.testing.assert_allclose(probs, expected_probs, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(engine.table.predict_proba(features), expected_probs, rtol=0, atol=1e-12)
+
+
+def test_single_rows_match_sklearn(engine, sklearn_reference):
+    # 1-D input takes the flattened-table path
+    features = np.random.default_rng(2).integers(TRAIT_MIN, TRAIT_MAX + 1, size=(500, N_FEATURES), dtype=np.uint8)
+    _, expected = sklearn_reference(features)
+    for row, want in zip(features, expected):
+        np.testing.assert_allclose(engine.table.predict_proba(row), want, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("level", [TRAIT_MIN, TRAIT_MAX])
+def test_grid_edges(engine, sklearn_reference, level):
+    row = np.full(N_FEATURES, level)
+    np.testing.assert_allclose(engine.table.predict_proba(row), sklearn_reference(row[None, :])[1][0], rtol=0, atol=1e-12)
+
+
+def test_engine_routes_integers_through_table(engine, sklearn_reference):
+    features = np.random.default_rng(3).integers(TRAIT_MIN, TRAIT_MAX + 1, size=(100, N_FEATURES))
+    assert isinstance(engine._predictor_for(features), ContributionTable)
+    np.testing.assert_allclose(engine.predict_proba(features), sklearn_reference(features)[1], rtol=0, atol=1e-12)
@@ -0,0 +1,595 @@
+"""
+Reproducible training pipeline for the Personality Intelligence Platform.
+
+Replaces the fit at the end of `logistic Que.ipynb` with a scriptable run:
+
+    1. stream the dataset (CSV or Parquet) in chunks, keeping only the 26
+       trait columns and the target
+    2. hold out a stratified test split (random_state=42, test_size=0.2, as
+       in the notebook)
+    3. record a one-way ANOVA of the 26 traits on the training rows
+       (screening.StreamingAnova) in metrics.json; this is a diagnostic only,
+       the schema itself comes from the notebook's screening of the raw
+       columns (rerun it with `python screening.py <dataset>`)
+    4. cross-validate a StandardScaler -> LogisticRegression pipeline over
+       solver, C and penalty, with the candidates x folds fits spread over all
+       cores by joblib
+    5. refit the best candidate on the training split, evaluate it on the
+       held-out split and write a versioned artifact directory:
+
+           artifacts/<version>/personality_model.pkl, scalar.pkl, encoder.pkl,
+                               feature_schema.json, personality_model.pipb,
+                               metrics.json
+
+`--promote` copies that directory's files into the app directory, where the
+dashboard picks them up on its next rerun (see artifact_signature) and shows
+the held-out metrics in its sidebar.
+
+`--streaming` trains out of core instead (see train_streaming): scaler
+statistics from StandardScaler.partial_fit and an SGD log-loss classifier
+fitted chunk by chunk, so memory stays bounded by --chunk-size rows.
+
+Usage:
+    python train.py personality_synthetic_dataset.csv
+    python train.py personality_synthetic_dataset.csv --jobs 8 --cv 5 --promote
+    python train.py huge_corpus.parquet --streaming --epochs 5 --chunk-size 100000
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from ml_core import (
+    ARTIFACT_DIR,
+    ENCODER_FILE,
+    FEATURE_SCHEMA_FILE,
+    METRICS_FILE,
+    MODEL_FILE,
+    SCALER_FILE,
+    TRAINING_COLUMNS,
+    linear_parameters,
+    resolve_feature_columns,
+    write_feature_schema,
+)
+from screening import SIGNIFICANCE_LEVEL, StreamingAnova
+
+TARGET_COLUMN = "personality_type"
+DEFAULT_OUTPUT_DIR = os.path.join(ARTIFACT_DIR, "artifacts")
+DEFAULT_CHUNK_SIZE = 250_000
+RANDOM_STATE = 42
+TEST_SIZE = 0.2
+SCORING = "f1_macro"
+
+C_GRID = [0.01, 0.1, 1.0, 10.0, 100.0]
+
+# Only solver/penalty pairs that fit a multinomial LogisticRegression (liblinear is
+# one-vs-rest only for multiclass targets and deprecated there)
+SEARCH_SPACE = [
+    {"model__solver": ["lbfgs", "newton-cg"], "model__penalty": ["l2"], "model__C": C_GRID},
+    {"model__solver": ["saga"], "model__penalty": ["l1", "l2"], "model__C": C_GRID},
+]
+
+
+# =========================================================================================
+# 1. CHUNKED DATASET READER
+# =========================================================================================
+def iter_training_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, target=TARGET_COLUMN):
+    """
+    Yields (features, labels) per chunk of at most chunk_size rows: a float64
+    (n_rows, 26) array in TRAINING_COLUMNS order and an object array of the
+    raw target labels. Only the trait and target columns are parsed.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        names = parquet_file.schema_arrow.names
+        columns = resolve_feature_columns(names)
+        if target not in names:
+            raise ValueError(f"Dataset has no '{target}' target column")
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns + [target]):
+            frame = batch.to_pandas()
+            yield frame[columns].to_numpy(dtype=np.float64), frame[target].to_numpy(dtype=object)
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        columns = resolve_feature_columns(header)
+        if target not in header:
+            raise ValueError(f"Dataset has no '{target}' target column")
+        for frame in pd.read_csv(path, usecols=columns + [target], chunksize=chunk_size):
+            yield frame[columns].to_numpy(dtype=np.float64), frame[target].to_numpy(dtype=object)
+
+
+def read_dataset(path, chunk_size=DEFAULT_CHUNK_SIZE, target=TARGET_COLUMN):
+    """
+    Assembles the chunks into one feature matrix and label vector. Rows with
+    a missing trait or label are dropped. Returns (features, labels, dropped).
+    """
+    features, labels, dropped = [], [], 0
+    for x, y in iter_training_chunks(path, chunk_size, target):
+        keep = ~np.isnan(x).any(axis=1) & ~pd.isna(y)
+        dropped += int(len(keep) - keep.sum())
+        features.append(x[keep])
+        labels.append(y[keep].astype(str))
+    if not features or not sum(len(x) for x in features):
+        raise ValueError(f"{path}: no usable rows")
+    return np.concatenate(features), np.concatenate(labels), dropped
+
+
+# =========================================================================================
+# 2. ANOVA DIAGNOSTICS AND PARALLEL HYPERPARAMETER SEARCH
+# =========================================================================================
+def anova_report(anova, alpha=SIGNIFICANCE_LEVEL):
+    """
+    metrics.json report from a StreamingAnova filled with the training rows:
+    every trait's F statistic and p-value, and the traits whose p-value is
+    not below alpha. Nothing is dropped from the fit; a trait listed as not
+    significant is a prompt to revisit the 26-column schema, which the app,
+    the bundle and the exports all depend on.
+    """
+    f_statistic, p_value = anova.statistics()
+
+    def finite(value):
+        return float(value) if np.isfinite(value) else None
+
+    return {
+        "alpha": alpha,
+        "not_significant": [name for name, p in zip(TRAINING_COLUMNS, p_value) if not p < alpha],
+        "features": {
+            name: {"f_statistic": finite(f), "p_value": finite(p)}
+            for name, f, p in zip(TRAINING_COLUMNS, f_statistic, p_value)
+        },
+    }
+
+
+def build_pipeline(max_iter=2000):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("model", LogisticRegression(max_iter=max_iter, random_state=RANDOM_STATE)),
+    ])
+
+
+def search(features, targets, cv=5, jobs=-1, search_space=SEARCH_SPACE, verbose=0, columns=TRAINING_COLUMNS):
+    """
+    Stratified k-fold grid search over search_space, scored by macro F1. The
+    fits run in joblib worker processes (jobs=-1: one per core). columns
+    names the feature columns so the fitted scaler records them.
+    """
+    import warnings
+
+    from sklearn.exceptions import ConvergenceWarning
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold
+
+    grid = GridSearchCV(
+        build_pipeline(), search_space, scoring=SCORING, n_jobs=jobs, refit=True, verbose=verbose,
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=RANDOM_STATE),
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        grid.fit(pd.DataFrame(features, columns=columns, copy=False), targets)
+    return grid
+
+
+def search_summary(grid, seconds, jobs):
+    results = grid.cv_results_
+    order = np.argsort(results["rank_test_score"], kind="stable")
+    return {
+        "scoring": SCORING,
+        "cv_folds": grid.n_splits_,
+        "candidates": len(results["params"]),
+        "jobs": jobs,
+        "seconds": round(seconds, 3),
+        "best_params": {k.split("__", 1)[1]: v for k, v in grid.best_params_.items()},
+        "best_cv_score": float(grid.best_score_),
+        "results": [
+            {
+                "params": {k.split("__", 1)[1]: v for k, v in results["params"][i].items()},
+                "mean_test_score": float(results["mean_test_score"][i]),
+                "std_test_score": float(results["std_test_score"][i]),
+                "mean_fit_time": float(results["mean_fit_time"][i]),
+            }
+            for i in order
+        ],
+    }
+
+
+# =========================================================================================
+# 3. EVALUATION
+# =========================================================================================
+def _frame(features):
+    """Wraps a TRAINING_COLUMNS-ordered matrix so the scaler sees the names it was fitted with."""
+    return pd.DataFrame(features, columns=TRAINING_COLUMNS, copy=False)
+
+
+def confusion(targets, predicted, n_classes):
+    """(n_classes, n_classes) counts, rows = true class, columns = predicted; additive over chunks."""
+    return np.bincount(targets * n_classes + predicted, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+
+def confusion_metrics(matrix, class_names):
+    """
+    Accuracy, macro precision / recall / F1 and a per-class report derived
+    from a confusion matrix, matching sklearn's precision_recall_fscore_support
+    (zero_division=0). Classes that never occur in the targets or predictions
+    are left out of the macro averages, as sklearn does.
+    """
+    matrix = np.asarray(matrix, dtype=np.int64)
+    tp = np.diag(matrix).astype(np.float64)
+    support, predicted = matrix.sum(axis=1), matrix.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    present = (support + predicted) > 0
+    total = int(matrix.sum())
+    return {
+        "rows": total,
+        "accuracy": float(tp.sum() / total) if total else 0.0,
+        "precision_macro": float(precision[present].mean()),
+        "recall_macro": float(recall[present].mean()),
+        "f1_macro": float(f1[present].mean()),
+        "per_class": {
+            str(name): {"precision": float(p), "recall": float(r), "f1": float(f), "support": int(n)}
+            for name, p, r, f, n in zip(class_names, precision, recall, f1, support)
+        },
+        "confusion_matrix": matrix.tolist(),
+    }
+
+
+def evaluate(model, scaler, features, targets, class_names):
+    """Held-out accuracy, macro precision / recall / F1, per-class report and confusion matrix."""
+    predicted = model.predict(scaler.transform(_frame(features)))
+    return confusion_metrics(confusion(targets, predicted, len(class_names)), class_names)
+
+
+def _peak_rss():
+    """
+    Peak resident set size of this process in bytes, or None where unsupported.
+    Linux reads VmHWM, because ru_maxrss survives exec and may still hold the
+    parent's peak.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# =========================================================================================
+# 4. OUT-OF-CORE TRAINING
+# =========================================================================================
+def iter_split_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields (features, labels, test_mask, dropped) per chunk. The held-out
+    rows are a per-row Bernoulli(TEST_SIZE) draw from a generator seeded with
+    RANDOM_STATE, so every pass over the file sees the same split. The draw
+    happens before rows with missing values are dropped.
+    """
+    rng = np.random.default_rng(RANDOM_STATE)
+    for x, y in iter_training_chunks(path, chunk_size):
+        test = rng.random(len(x)) < TEST_SIZE
+        keep = ~np.isnan(x).any(axis=1) & ~pd.isna(y)
+        yield x[keep], y[keep].astype(str), test[keep], int(len(keep) - keep.sum())
+
+
+def fit_streaming(path, chunk_size=DEFAULT_CHUNK_SIZE, epochs=5, alpha=1e-4, penalty="l2",
+                  anova_alpha=SIGNIFICANCE_LEVEL):
+    """
+    Fits (model, scaler, label_encoder) with memory bounded by one chunk:
+
+        pass 1     StandardScaler.partial_fit and StreamingAnova over the
+                   training rows, label set
+        epochs     SGDClassifier(loss="log_loss").partial_fit on each shuffled
+                   chunk of scaled training rows
+
+    From the second epoch on the weights are averaged over the updates
+    (average=<training rows>): averaging lands closer to the batch
+    LogisticRegression optimum than the last SGD iterate, and skipping the
+    first epoch keeps its large early steps out of the average.
+
+    Returns the fitted objects, a dict of row counts and the ANOVA report.
+    """
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+    scaler = StandardScaler()
+    anova = StreamingAnova()
+    labels = set()
+    counts = {"rows": 0, "dropped": 0, "train_rows": 0, "test_rows": 0}
+    for x, y, test, dropped in iter_split_chunks(path, chunk_size):
+        if (~test).any():
+            scaler.partial_fit(_frame(x[~test]))
+            anova.update(x[~test], y[~test])
+        labels.update(np.unique(y))
+        counts["rows"] += len(x)
+        counts["dropped"] += dropped
+        counts["test_rows"] += int(test.sum())
+    counts["train_rows"] = counts["rows"] - counts["test_rows"]
+    if not counts["train_rows"]:
+        raise ValueError(f"{path}: no usable training rows")
+
+    screening = anova_report(anova, anova_alpha)
+    label_encoder = LabelEncoder().fit(sorted(labels))
+    classes = np.arange(len(label_encoder.classes_))
+    model = SGDClassifier(loss="log_loss", penalty=penalty, alpha=alpha, average=max(counts["train_rows"], 2),
+                          random_state=RANDOM_STATE)
+    rng = np.random.default_rng(RANDOM_STATE)
+    for _ in range(epochs):
+        for x, y, test, _ in iter_split_chunks(path, chunk_size):
+            train_rows = ~test
+            if not train_rows.any():
+                continue
+            order = rng.permutation(int(train_rows.sum()))
+            model.partial_fit(
+                scaler.transform(_frame(x[train_rows]))[order],
+                label_encoder.transform(y[train_rows])[order],
+                classes=classes,
+            )
+    return model, scaler, label_encoder, counts, screening
+
+
+def evaluate_streaming(path, model, scaler, label_encoder, chunk_size=DEFAULT_CHUNK_SIZE):
+    """One more pass accumulating train and held-out confusion matrices; returns (train, holdout)."""
+    n_classes = len(label_encoder.classes_)
+    matrices = np.zeros((2, n_classes, n_classes), dtype=np.int64)
+    for x, y, test, _ in iter_split_chunks(path, chunk_size):
+        if not len(x):
+            continue
+        predicted = model.predict(scaler.transform(_frame(x)))
+        targets = label_encoder.transform(y)
+        matrices[0] += confusion(targets[~test], predicted[~test], n_classes)
+        matrices[1] += confusion(targets[test], predicted[test], n_classes)
+    return (confusion_metrics(m, label_encoder.classes_) for m in matrices)
+
+
+def train_streaming(data, output_dir=DEFAULT_OUTPUT_DIR, chunk_size=DEFAULT_CHUNK_SIZE, epochs=5, alpha=1e-4,
+                    penalty="l2", version=None, anova_alpha=SIGNIFICANCE_LEVEL):
+    """
+    Out-of-core counterpart of train(): reads the dataset epochs + 2 times
+    instead of holding it, and fits a fixed SGD log-loss model rather than
+    searching. The held-out split is a seeded per-row draw (not stratified).
+    The artifacts are the same three pickles, bundle and metrics.json.
+    """
+    started = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    model, scaler, label_encoder, counts, screening = fit_streaming(data, chunk_size, epochs, alpha, penalty,
+                                                                    anova_alpha)
+    train_report, holdout = evaluate_streaming(data, model, scaler, label_encoder, chunk_size)
+
+    metrics = _base_metrics(data, version, started, label_encoder.classes_, counts["rows"], counts["dropped"],
+                            counts["train_rows"], counts["test_rows"])
+    metrics["model"] = {
+        "estimator": type(model).__name__,
+        "solver": "sgd",
+        "loss": model.loss,
+        "penalty": model.penalty,
+        "alpha": model.alpha,
+        "average": model.average,
+        "epochs": epochs,
+        "link": linear_parameters(model, scaler)[4],
+    }
+    metrics["screening"] = screening
+    metrics["search"] = None
+    metrics["train_accuracy"] = train_report["accuracy"]
+    metrics["holdout"] = holdout
+    metrics["training"] = {
+        "mode": "streaming",
+        "chunk_size": chunk_size,
+        "passes": epochs + 2,
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_rss_bytes": _peak_rss(),
+    }
+    directory = os.path.join(output_dir, metrics["version"])
+    write_artifacts(directory, model, scaler, label_encoder, metrics)
+    return directory, metrics
+
+
+# =========================================================================================
+# 5. ARTIFACT EMISSION
+# =========================================================================================
+def _pickle(obj, path):
+    with open(path, "wb") as f:
+        pickle.dump(obj, f)
+
+
+def write_artifacts(directory, model, scaler, label_encoder, metrics):
+    """
+    Writes the three pickles, the feature schema manifest, the model bundle
+    and metrics.json into directory. The metrics record the checksums of the
+    files written here.
+    """
+    from model_bundle import BUNDLE_FILE, export_bundle, file_sha256
+
+    os.makedirs(directory, exist_ok=True)
+    _pickle(model, os.path.join(directory, MODEL_FILE))
+    _pickle(scaler, os.path.join(directory, SCALER_FILE))
+    _pickle(label_encoder, os.path.join(directory, ENCODER_FILE))
+    write_feature_schema(directory, scaler.feature_names_in_)
+    export_bundle(directory)
+    metrics["artifacts"] = {
+        name: file_sha256(os.path.join(directory, name))
+        for name in (MODEL_FILE, SCALER_FILE, ENCODER_FILE, FEATURE_SCHEMA_FILE, BUNDLE_FILE)
+    }
+    with open(os.path.join(directory, METRICS_FILE), "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def promote(directory, target_dir=ARTIFACT_DIR):
+    """
+    Copies a version directory's artifacts into target_dir. Each file is
+    staged next to its destination and renamed into place; metrics.json goes
+    last so the dashboard never shows metrics for a model it has not loaded.
+    """
+    from model_bundle import BUNDLE_FILE
+
+    for name in (MODEL_FILE, SCALER_FILE, ENCODER_FILE, FEATURE_SCHEMA_FILE, BUNDLE_FILE, METRICS_FILE):
+        destination = os.path.join(target_dir, name)
+        shutil.copy2(os.path.join(directory, name), destination + ".tmp")
+        os.replace(destination + ".tmp", destination)
+
+
+def _base_metrics(data, version, started, classes, rows, dropped, train_rows, test_rows):
+    import sklearn
+
+    from model_bundle import file_sha256
+
+    digest = file_sha256(data)
+    return {
+        "version": version or f"{started:%Y%m%d-%H%M%S}-{digest[:8]}",
+        "created_at": started.isoformat(timespec="seconds"),
+        "dataset": {
+            "file": os.path.basename(data),
+            "sha256": digest,
+            "rows": int(rows),
+            "dropped_rows": int(dropped),
+            "train_rows": int(train_rows),
+            "test_rows": int(test_rows),
+            "test_size": TEST_SIZE,
+            "random_state": RANDOM_STATE,
+        },
+        "feature_names": list(TRAINING_COLUMNS),
+        "classes": [str(c) for c in classes],
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "scikit-learn": sklearn.__version__,
+        },
+    }
+
+
+def train(data, output_dir=DEFAULT_OUTPUT_DIR, chunk_size=DEFAULT_CHUNK_SIZE, cv=5, jobs=-1, version=None,
+          search_space=SEARCH_SPACE, verbose=0, anova_alpha=SIGNIFICANCE_LEVEL):
+    """
+    Runs the full in-memory pipeline on the dataset at data and returns
+    (version directory, metrics dict).
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import LabelEncoder
+
+    started = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    features, labels, dropped = read_dataset(data, chunk_size)
+    read_seconds = time.perf_counter() - start
+
+    label_encoder = LabelEncoder()
+    targets = label_encoder.fit_transform(labels)
+    x_train, x_test, y_train, y_test = train_test_split(
+        features, targets, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=targets
+    )
+
+    anova = StreamingAnova()
+    anova.update(x_train, y_train)
+    screening = anova_report(anova, anova_alpha)
+
+    search_start = time.perf_counter()
+    grid = search(x_train, y_train, cv, jobs, search_space, verbose)
+    search_seconds = time.perf_counter() - search_start
+    scaler = grid.best_estimator_.named_steps["scaler"]
+    model = grid.best_estimator_.named_steps["model"]
+
+    metrics = _base_metrics(data, version, started, label_encoder.classes_, len(features), dropped,
+                            len(x_train), len(x_test))
+    metrics["model"] = {
+        "estimator": type(model).__name__,
+        **{k: getattr(model, k) for k in ("solver", "penalty", "C", "max_iter")},
+        "n_iter": int(np.max(model.n_iter_)),
+        "link": linear_parameters(model, scaler)[4],
+    }
+    metrics["screening"] = screening
+    metrics["search"] = search_summary(grid, search_seconds, jobs)
+    metrics["train_accuracy"] = float(model.score(scaler.transform(_frame(x_train)), y_train))
+    metrics["holdout"] = evaluate(model, scaler, x_test, y_test, label_encoder.classes_)
+    metrics["training"] = {
+        "mode": "in-memory",
+        "read_seconds": round(read_seconds, 3),
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_rss_bytes": _peak_rss(),
+    }
+    directory = os.path.join(output_dir, metrics["version"])
+    write_artifacts(directory, model, scaler, label_encoder, metrics)
+    return directory, metrics
+
+
+def _report(directory, metrics):
+    dataset, training, holdout = metrics["dataset"], metrics["training"], metrics["holdout"]
+    print(f"{dataset['rows']:,} rows ({dataset['dropped_rows']:,} dropped), {training['mode']} training "
+          f"in {training['seconds']:.1f}s", file=sys.stderr)
+    if metrics["screening"]["not_significant"]:
+        print(f"warning: ANOVA p-value not below {metrics['screening']['alpha']:g} on the training rows for "
+              f"{', '.join(metrics['screening']['not_significant'])}; they are still in the model",
+              file=sys.stderr)
+    if metrics["search"]:
+        search_info = metrics["search"]
+        params = search_info["best_params"]
+        print(f"searched {search_info['candidates']} candidates x {search_info['cv_folds']} folds in "
+              f"{search_info['seconds']:.1f}s; best: solver={params['solver']} penalty={params['penalty']} "
+              f"C={params['C']} (cv {SCORING} {search_info['best_cv_score']:.4f})", file=sys.stderr)
+    else:
+        model = metrics["model"]
+        print(f"model: {model['estimator']} loss={model['loss']} penalty={model['penalty']} alpha={model['alpha']} "
+              f"epochs={model['epochs']}", file=sys.stderr)
+    print(f"held-out: accuracy {holdout['accuracy']:.4f}  precision {holdout['precision_macro']:.4f}  "
+          f"recall {holdout['recall_macro']:.4f}  f1 {holdout['f1_macro']:.4f}", file=sys.stderr)
+    if training["peak_rss_bytes"]:
+        print(f"peak RSS {training['peak_rss_bytes'] / 2**20:.0f} MiB", file=sys.stderr)
+    print(f"wrote {directory}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train, evaluate and version the personality classifier.")
+    parser.add_argument("data", help="training dataset (.csv or .parquet) with the trait columns and personality_type")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="parent of the versioned artifact directories")
+    parser.add_argument("--version", help="version directory name (default: <UTC timestamp>-<dataset sha256 prefix>)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows read per chunk")
+    parser.add_argument("--cv", type=int, default=5, help="cross-validation folds")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel fits (-1 = one per core)")
+    parser.add_argument("--promote", action="store_true", help="copy the new artifacts into the app directory")
+    parser.add_argument("--verbose", type=int, default=0, help="GridSearchCV verbosity")
+    parser.add_argument("--anova-alpha", type=float, default=SIGNIFICANCE_LEVEL,
+                        help="significance level of the ANOVA diagnostic in metrics.json")
+    streaming = parser.add_argument_group("out-of-core training")
+    streaming.add_argument("--streaming", action="store_true",
+                           help="fit an SGD log-loss model chunk by chunk instead of loading the dataset")
+    streaming.add_argument("--epochs", type=int, default=5, help="passes of SGD over the training rows")
+    streaming.add_argument("--alpha", type=float, default=1e-4, help="SGD regularization strength")
+    streaming.add_argument("--penalty", default="l2", choices=("l2", "l1", "elasticnet"), help="SGD penalty")
+    args = parser.parse_args(argv)
+
+    if args.streaming:
+        directory, metrics = train_streaming(args.data, args.output_dir, args.chunk_size, args.epochs, args.alpha,
+                                             args.penalty, args.version, args.anova_alpha)
+    else:
+        directory, metrics = train(args.data, args.output_dir, args.chunk_size, args.cv, args.jobs, args.version,
+                                   verbose=args.verbose, anova_alpha=args.anova_alpha)
+    _report(directory, metrics)
+    if args.promote:
+        promote(directory)
+        print(f"promoted {metrics['version']} to {ARTIFACT_DIR}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())